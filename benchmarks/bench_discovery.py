@@ -0,0 +1,105 @@
+# benchmarks/bench_discovery.py
+"""
+File discovery on a large synthetic tree: the old rglob()+is_file() list vs. the
+streaming scandir walker (time to first file, total time, peak memory), the
+shard split, and how much largest-first ordering shortens a worker pool's
+makespan (simulated with cost proportional to file size).
+
+    python -m benchmarks.bench_discovery --files 200000 --share 0.2 --workers 8
+"""
+import heapq
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+import typer
+
+from valmods.detector import detect_kind
+from valmods.discovery import discover
+
+KINDS = {"xml", "json", "jsonl", "csv"}
+
+
+def build_tree(root: Path, files: int, share: float, seed: int = 0) -> None:
+    """`files` entries in a 3-level tree; `share` of them validatable, with log-normal (sparse) sizes."""
+    rng = random.Random(seed)
+    for k in range(files):
+        d = root / f"orbit_{k % 50:02d}" / f"day_{k // 50 % 40:02d}"
+        if k < 2000:
+            d.mkdir(parents=True, exist_ok=True)
+        ext = rng.choice([".xml", ".json", ".csv"]) if rng.random() < share else rng.choice([".img", ".dat", ".txt"])
+        with open(d / f"product_{k:07d}{ext}", "wb") as f:
+            f.truncate(int(rng.lognormvariate(9, 1.5)))
+
+
+def legacy(root: Path) -> List[Path]:
+    files = [p for p in root.rglob("*") if p.is_file()]
+    return [p for p in files if detect_kind(p) in KINDS]
+
+
+def run(fn: Callable[[], Iterable[Path]]) -> tuple:
+    """(seconds to first file, total seconds, files, peak traced MB), consuming lazily."""
+    t0, first, n = time.perf_counter(), None, 0
+    for _ in fn():
+        if first is None:
+            first = time.perf_counter() - t0
+        n += 1
+    total = time.perf_counter() - t0
+    tracemalloc.start()  # separate pass: tracing slows the walk several-fold
+    for _ in fn():
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first or 0.0, total, n, peak / 2**20
+
+
+def makespan(sizes: List[int], workers: int) -> int:
+    """Greedy list scheduling: each file goes to the next free worker."""
+    free = [0] * workers
+    for s in sizes:
+        heapq.heapreplace(free, free[0] + s)
+    return max(free)
+
+
+def main(
+    files: int = typer.Option(100_000, help="Entries in the synthetic tree"),
+    share: float = typer.Option(0.2, help="Share of entries with a validatable extension"),
+    workers: int = typer.Option(8, help="Pool size for the makespan simulation"),
+    threads: int = typer.Option(4, help="--scan-threads for the threaded walk"),
+    shards: int = typer.Option(4, help="Shard count for the split check"),
+) -> None:
+    with tempfile.TemporaryDirectory(prefix="aiops_discovery_") as tmp:
+        root = Path(tmp)
+        build_tree(root, files, share)
+        typer.echo(f"{files} entries, {share:.0%} validatable")
+        typer.echo(f"{'scanner':<28}{'first s':>9}{'total s':>9}{'files':>9}{'peak MB':>9}")
+        cases = [
+            ("rglob + is_file (before)", lambda: legacy(root)),
+            ("scandir, scan order", lambda: discover(str(root), kinds=KINDS)),
+            (f"scandir x{threads}, scan order", lambda: discover(str(root), kinds=KINDS, threads=threads)),
+            ("scandir, largest first", lambda: discover(str(root), kinds=KINDS, order="size")),
+        ]
+        for name, fn in cases:
+            first, total, n, peak = run(fn)
+            typer.echo(f"{name:<28}{first:>9.3f}{total:>9.3f}{n:>9}{peak:>9.1f}")
+
+        everything = {str(p) for p in discover(str(root), kinds=KINDS)}
+        parts = [{str(p) for p in discover(str(root), kinds=KINDS, shard=(i, shards))} for i in range(1, shards + 1)]
+        disjoint = sum(map(len, parts)) == len(set().union(*parts))
+        typer.echo(f"{shards} shards: sizes {[len(p) for p in parts]}, "
+                   f"cover all: {set().union(*parts) == everything}, disjoint: {disjoint}")
+
+        scan = [os.path.getsize(p) for p in discover(str(root), kinds=KINDS)]
+        ranked = sorted(scan, reverse=True)
+        a, b = makespan(scan, workers), makespan(ranked, workers)
+        ideal = sum(scan) / workers
+        typer.echo(f"makespan with {workers} workers (cost ~ bytes): scan order {a / ideal:.3f}x ideal, "
+                   f"largest first {b / ideal:.3f}x ideal")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,46 @@
+# benchmarks/bench_fail_fast.py
+"""
+Gating runs over a synthetic bundle with broken files: time until the verdict
+for a full run, a run error budget (--max-total-errors) and --fail-fast, serially
+and with a worker pool (which cancels the batches it hasn't started).
+
+    python -m benchmarks.bench_fail_fast --xml 2000 --csv 20 --workers 2
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+from benchmarks.corpus import CorpusSpec, generate
+from valmods.runner import iter_validation
+
+SCHEMAS = dict(xsd_path="schemas/minimal.xsd", schematron_path="schemas/minimal.sch",
+               json_schema_path="schemas/sample.schema.json", csv_schema_path="schemas/csv.schema.yaml")
+
+
+def main(
+    xml: int = typer.Option(2000, help="XML labels in the bundle"),
+    json_docs: int = typer.Option(500, "--json", help="JSON documents in the bundle"),
+    csv: int = typer.Option(20, help="CSV tables in the bundle"),
+    error_rate: float = typer.Option(0.05, help="Share of broken files / CSV rows"),
+    budget: int = typer.Option(10, help="--max-total-errors for the budget case"),
+    workers: int = typer.Option(2, help="Pool size for the parallel cases"),
+) -> None:
+    with tempfile.TemporaryDirectory(prefix="aiops_failfast_") as tmp:
+        generate(Path(tmp), CorpusSpec(xml=xml, json=json_docs, csv=csv, error_rate=error_rate))
+        typer.echo(f"{xml} XML, {json_docs} JSON, {csv} CSV files, {error_rate:.0%} broken")
+        typer.echo(f"{'mode':<26}{'workers':>8}{'files':>8}{'errors':>8}{'s':>8}")
+        cases = [("full run", {}), (f"--max-total-errors {budget}", {"max_total_errors": budget}),
+                 ("--fail-fast", {"max_errors": 1, "max_total_errors": 1})]
+        for n in (1, workers):
+            for name, kwargs in cases:
+                t0, files, errors = time.perf_counter(), 0, 0
+                for _, report in iter_validation(tmp, workers=n, order="path", **SCHEMAS, **kwargs):
+                    files, errors = files + 1, errors + report.error_count
+                dt = time.perf_counter() - t0
+                typer.echo(f"{name:<26}{n:>8}{files:>8}{errors:>8}{dt:>8.2f}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
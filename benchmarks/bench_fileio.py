@@ -0,0 +1,123 @@
+# benchmarks/bench_fileio.py
+"""
+Single-open, memory-mapped input loading vs. the previous per-stage file reads,
+on large XML labels and JSON documents: wall time and bytes pulled through
+read() (Linux /proc/self/io `rchar`; mapped pages are faulted in, not read).
+
+    python -m benchmarks.bench_fileio --mb 300 --repeat 3
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import typer
+from lxml import etree
+
+from valmods.json_validator import JSONValidator, _iter_array
+from valmods.xml_validator import XMLValidator, _PARSER
+
+SCH, JSON_SCHEMA = "schemas/minimal.sch", "schemas/sample.schema.json"
+# Like schemas/minimal.xsd, but the observation is split into records: a single
+# multi-hundred-MB text node is over libxml2's (non-huge_tree) limit
+RECORDS_XSD = """<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+  <xsd:element name="Product"><xsd:complexType><xsd:sequence>
+    <xsd:element name="Title" type="xsd:string"/>
+    <xsd:element name="Observation_Area"><xsd:complexType><xsd:sequence>
+      <xsd:element name="Record" type="xsd:string" maxOccurs="unbounded"/>
+    </xsd:sequence></xsd:complexType></xsd:element>
+  </xsd:sequence></xsd:complexType></xsd:element>
+</xsd:schema>
+"""
+
+
+def bytes_read() -> Optional[int]:
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("rchar:"))
+    except OSError:
+        return None
+
+
+def legacy_xml(v: XMLValidator, path: str) -> list:
+    """Before: the pre-screen opens the file, then lxml opens and reads it again."""
+    with open(path, "rb") as f:
+        issues = v.prescreen(f)
+    return issues or v.check_tree(etree.parse(path, _PARSER))
+
+
+def legacy_json(v: JSONValidator, path: str) -> list:
+    """Before: a text-mode json.load (bytes read, then decoded into a second copy)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return v._issues(v.validator, json.load(f))
+
+
+def legacy_json_stream(v: JSONValidator, path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [i for n, item in enumerate(_iter_array(f)) for i in v._issues(v.item_validator, item, prefix=(n,))]
+
+
+def make_label(path: Path, mb: int) -> Path:
+    """A Product label with ~`mb` MB of table-like text in 8 KB <Record>s."""
+    record = "<Record>" + "  1.234567E+01  2.345678E+02  3.456789E+03  4.567890E+04\n" * 140 + "</Record>\n"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<Product>\n  <Title>Synthetic {mb} MB</Title>\n  <Observation_Area>\n")
+        for _ in range(mb * 1024 * 1024 // len(record)):
+            f.write(record)
+        f.write("  </Observation_Area>\n</Product>\n")
+    return path
+
+
+def make_json(path: Path, mb: int, array: bool) -> Path:
+    """~`mb` MB of sample records (a few KB each), as one array or wrapped in an object."""
+    note = "Observed with HiRISE under nominal conditions. " * 80
+    records = [{"title": f"Mars sample {k}", "instrument": "HiRISE", "value": k * 0.5, "notes": note}
+               for k in range(mb * 1024 * 1024 // (len(note) + 80))]
+    path.write_text(json.dumps(records if array else {"title": "archive", "instrument": "HiRISE",
+                                                      "value": 1.0, "records": records}), encoding="utf-8")
+    return path
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Tuple[float, Optional[int]]:
+    best, read = float("inf"), None
+    for _ in range(repeat):
+        r0, t0 = bytes_read(), time.perf_counter()
+        fn()
+        dt, r1 = time.perf_counter() - t0, bytes_read()
+        if dt < best:
+            best, read = dt, (r1 - r0 if r0 is not None else None)
+    return best, read
+
+
+def main(
+    mb: int = typer.Option(300, help="Approximate size of each generated input in MB"),
+    repeat: int = typer.Option(3, help="Runs per case (best is reported)"),
+) -> None:
+    with tempfile.TemporaryDirectory(prefix="aiops_bench_") as tmp:
+        xml = str(make_label(Path(tmp) / "label.xml", mb))
+        xsd = Path(tmp) / "records.xsd"
+        xsd.write_text(RECORDS_XSD, encoding="utf-8")
+        doc = str(make_json(Path(tmp) / "doc.json", mb, array=False))
+        arr = str(make_json(Path(tmp) / "array.json", mb, array=True))
+        item_schema = Path(tmp) / "array.schema.json"
+        item_schema.write_text(json.dumps({"type": "array", "items": json.loads(Path(JSON_SCHEMA).read_text())}))
+
+        xv = XMLValidator(str(xsd), schematron_path=SCH)
+        jv = JSONValidator(JSON_SCHEMA)
+        sv = JSONValidator(str(item_schema), stream_threshold=0)
+        cases: List[Tuple[str, Callable[[], object], Callable[[], object]]] = [
+            ("xml label", lambda: legacy_xml(xv, xml), lambda: xv.validate(xml)),
+            ("json document", lambda: legacy_json(jv, doc), lambda: jv.validate(doc)),
+            ("json array (streamed)", lambda: legacy_json_stream(sv, arr), lambda: sv.validate(arr)),
+        ]
+        typer.echo(f"~{mb} MB inputs, warm page cache, best of {repeat}")
+        typer.echo(f"{'case':<24}{'before s':>10}{'read MB':>10}{'after s':>10}{'read MB':>10}")
+        mib = lambda n: "n/a" if n is None else f"{n / 2**20:.1f}"
+        for name, before, after in cases:
+            (t0, r0), (t1, r1) = measure(before, repeat), measure(after, repeat)
+            typer.echo(f"{name:<24}{t0:>10.2f}{mib(r0):>10}{t1:>10.2f}{mib(r1):>10}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,84 @@
+# benchmarks/bench_issues.py
+"""
+Memory and time for building a huge issue list and reading its severity counts,
+slotted ValidationIssue vs. the previous dataclass layout.
+
+    python -m benchmarks.bench_issues --n 1000000
+"""
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List, Optional
+from uuid import uuid4
+
+import typer
+
+from core.models import Suggestion, ValidationIssue, ValidationReport
+
+
+@dataclass
+class LegacyIssue:
+    issue_type: str
+    severity: str
+    path: str
+    message: str
+    rule: Optional[str] = None
+    suggestion: Optional[Suggestion] = None
+    id: str = field(default_factory=lambda: uuid4().hex[:8])
+
+
+@dataclass
+class LegacyReport:
+    file: str
+    issues: List[LegacyIssue]
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for i in self.issues if i.severity == "error")
+
+    @property
+    def warning_count(self) -> int:
+        return sum(1 for i in self.issues if i.severity == "warning")
+
+
+def _build(issue_cls, n: int) -> list:
+    # severities/types built per issue (as validators do), so interning matters
+    return [
+        issue_cls("XSD-" + "VALIDATION", "error" if k % 10 else "warn" + "ing", f"/Product/Item[{k}]", "Missing child element")
+        for k in range(n)
+    ]
+
+
+def _measure(issue_cls, report_cls, n: int, reads: int) -> tuple:
+    t0 = time.perf_counter()
+    report = report_cls(file="bench.xml", issues=_build(issue_cls, n))
+    t1 = time.perf_counter()
+    for _ in range(reads):
+        report.error_count, report.warning_count
+    t2 = time.perf_counter()
+    del report
+
+    # memory in a separate pass: tracemalloc slows allocation down a lot
+    tracemalloc.start()
+    issues = _build(issue_cls, n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del issues
+    return t1 - t0, t2 - t1, peak
+
+
+def main(
+    n: int = typer.Option(1_000_000, help="Number of issues"),
+    reads: int = typer.Option(20, help="error_count/warning_count reads (templates, summarize, CLI)"),
+) -> None:
+    typer.echo(f"{'layout':<12}{'build s':>10}{'counts s':>10}{'peak MB':>10}")
+    for name, issue_cls, report_cls in (
+        ("dataclass", LegacyIssue, LegacyReport),
+        ("slots", ValidationIssue, ValidationReport),
+    ):
+        build, counts, peak = _measure(issue_cls, report_cls, n, reads)
+        typer.echo(f"{name:<12}{build:>10.2f}{counts:>10.3f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
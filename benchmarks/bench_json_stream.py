@@ -0,0 +1,69 @@
+# benchmarks/bench_json_stream.py
+"""
+Records/s and peak Python memory for JSON Lines, streamed arrays and whole-file loads.
+
+    python -m benchmarks.bench_json_stream --records 200000
+"""
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import typer
+
+from valmods.json_validator import JSONValidator
+
+ARRAY_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "required": ["title", "instrument"],
+        "properties": {
+            "title": {"type": "string"},
+            "instrument": {"type": "string", "enum": ["IRIS", "MAG", "IMG"]},
+            "value": {"type": "number"},
+        },
+    },
+}
+
+
+def _record(k: int) -> dict:
+    rec = {"title": f"obs {k}", "instrument": ("IRIS", "MAG", "IMG", "BAD")[k % 4], "value": k * 0.5}
+    if k % 97 == 0:
+        del rec["title"]
+    return rec
+
+
+def _run(label: str, fn) -> None:
+    issues, stats = fn()  # timed run; tracemalloc would skew records/s
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rate = f"{stats['records_per_s']:>12,.0f}" if stats else f"{'-':>12}"
+    typer.echo(f"{label:<16}{rate}{len(issues):>10}{peak / 2**20:>12.1f}")
+
+
+def main(records: int = typer.Option(200_000, help="Records per generated file")) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "array.schema.json").write_text(json.dumps(ARRAY_SCHEMA))
+        (tmp / "item.schema.json").write_text(json.dumps(ARRAY_SCHEMA["items"]))
+        with open(tmp / "data.jsonl", "w") as f:
+            for k in range(records):
+                f.write(json.dumps(_record(k)) + "\n")
+        with open(tmp / "data.json", "w") as f:
+            f.write("[\n" + ",\n".join(json.dumps(_record(k)) for k in range(records)) + "\n]")
+
+        lines = JSONValidator(str(tmp / "item.schema.json"))
+        streamed = JSONValidator(str(tmp / "array.schema.json"), stream_threshold=0)
+        loaded = JSONValidator(str(tmp / "array.schema.json"), stream_threshold=1 << 62)
+
+        typer.echo(f"{'mode':<16}{'records/s':>12}{'issues':>10}{'peak MB':>12}")
+        _run("jsonl", lambda: (lines.validate_lines(str(tmp / "data.jsonl")), lines.last_stats))
+        _run("array stream", lambda: (streamed.validate(str(tmp / "data.json")), streamed.last_stats))
+        _run("array load", lambda: (loaded.validate(str(tmp / "data.json")), None))
+
+
+if __name__ == "__main__":
+    typer.run(main)
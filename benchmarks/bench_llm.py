@@ -0,0 +1,69 @@
+# benchmarks/bench_llm.py
+"""
+LLM backend throughput and cache hit rate against the local stub model.
+
+    python -m benchmarks.bench_llm --n 100000 --distinct 500 --latency 0.05
+"""
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+from core.llm import LLMBackend, LLMConfig
+from core.llm_stub import start_stub
+from core.models import ValidationIssue
+
+TEMPLATES = [
+    ("JSON-SCHEMA", "'{w}' is a required property"),
+    ("JSON-SCHEMA", "'{w}' is not one of ['IRIS', 'MAG', 'IMG']"),
+    ("XSD-VALIDATION", "Unexpected child with tag '{w}' at position {n}."),
+    ("CSV-RULE-MIN", "{w} below 0 ({n} row(s))"),
+]
+
+
+def make_issues(n: int, distinct: int, seed: int = 0):
+    """n issues over about `distinct` signatures (numbers in messages vary freely)."""
+    rng = random.Random(seed)
+    words = [f"field_{chr(97 + k % 26)}{k // 26}" for k in range(max(1, distinct // len(TEMPLATES)))]
+    out = []
+    for k in range(n):
+        issue_type, template = rng.choice(TEMPLATES)
+        msg = template.format(w=rng.choice(words), n=rng.randrange(1, 1000))
+        out.append(ValidationIssue(issue_type, "error", str(k), msg))
+    return out
+
+
+def main(
+    n: int = typer.Option(100_000, help="Issues to enrich"),
+    distinct: int = typer.Option(500, help="Approximate number of distinct signatures"),
+    latency: float = typer.Option(0.05, help="Stub model latency per request (s)"),
+    batch_size: int = typer.Option(20, "--batch-size", help="Issues per prompt"),
+    concurrency: int = typer.Option(4, help="Requests in flight"),
+) -> None:
+    stub = start_stub(latency=latency)
+    cache = Path(tempfile.mkdtemp(prefix="aiops_bench_")) / "llm.sqlite"
+    config = LLMConfig(endpoint=stub.endpoint, cache_path=str(cache), batch_size=batch_size, concurrency=concurrency)
+    try:
+        for label in ("cold", "warm (new process cache)"):
+            backend = LLMBackend(config)
+            issues = make_issues(n, distinct)
+            t0 = time.perf_counter()
+            backend.enrich(issues)
+            dt = time.perf_counter() - t0
+            st = backend.stats
+            hit_rate = st["cache_hits"] / st["signatures"] if st["signatures"] else 0.0
+            typer.echo(
+                f"{label:<26}{dt:8.2f}s {n / dt:>12,.0f} issues/s  signatures={st['signatures']} "
+                f"requests={st['requests']} cache hit rate={hit_rate:.0%}"
+            )
+            assert all(i.suggestion for i in issues)
+            backend.close()
+        typer.echo(f"one round trip per issue would take ~{n * latency:,.0f}s of model latency")
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    typer.run(main)
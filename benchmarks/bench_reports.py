@@ -0,0 +1,79 @@
+# benchmarks/bench_reports.py
+"""
+Time and peak extra memory for writing one huge report: the string renderers
+(to_markdown/to_html + write_text) vs. the streaming writers.
+
+    python -m benchmarks.bench_reports --n 1000000
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+import typer
+
+from core.models import Suggestion, ValidationIssue, ValidationReport
+from core.reporter import SarifWriter, to_html, to_markdown, write_html, write_jsonl, write_markdown
+
+
+def make_report(n: int) -> ValidationReport:
+    hint = Suggestion("Add the required field/element according to the schema.")
+    issues = [
+        ValidationIssue("JSON-SCHEMA", "error", f"{k}.instrument", "'instrument' is a required property",
+                        suggestion=hint, line=k + 1)
+        for k in range(n)
+    ]
+    return ValidationReport("big.jsonl", issues)
+
+
+def measure(fn) -> tuple:
+    fn()  # timing pass
+    t0 = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - t0
+    tracemalloc.start()  # separate pass: tracemalloc slows allocation-heavy code
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main(n: int = typer.Option(1_000_000, help="Issues in the report")) -> None:
+    report = make_report(n)
+    for i in report.issues:
+        i.id  # ids are lazy; materialize them outside the measurements
+    out = os.path.join(tempfile.mkdtemp(prefix="aiops_bench_"), "report")
+
+    def to_file(render):
+        def fn():
+            with open(out, "w", encoding="utf-8") as fh:
+                fh.write(render(report))
+        return fn
+
+    def stream(write):
+        def fn():
+            with open(out, "w", encoding="utf-8") as fh:
+                write(report, fh)
+        return fn
+
+    def sarif():
+        with open(out, "w", encoding="utf-8") as fh, SarifWriter(fh) as w:
+            w.add(report)
+
+    cases = [
+        ("to_markdown", to_file(to_markdown)),
+        ("write_markdown", stream(write_markdown)),
+        ("write_markdown --max-issues 100", stream(lambda r, fh: write_markdown(r, fh, max_issues=100))),
+        ("to_html", to_file(to_html)),
+        ("write_html", stream(write_html)),
+        ("write_jsonl", stream(write_jsonl)),
+        ("sarif", sarif),
+    ]
+    typer.echo(f"{'case':<34}{'s':>8}{'peak MB':>10}")
+    for name, fn in cases:
+        seconds, peak = measure(fn)
+        typer.echo(f"{name:<34}{seconds:>8.2f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,69 @@
+# benchmarks/bench_routing.py
+"""
+A bundle that needs several schema sets: one run per set (each re-walking the
+tree with --include, as before routing) vs. a single routed run. The XML
+labels are split across two routes that also sniff the root namespace, so
+the routed run pays for reading each label's head.
+
+    python -m benchmarks.bench_routing --xml 2000 --json 2000 --csv 10 --workers 2
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+from benchmarks.corpus import CorpusSpec, generate
+from valmods.runner import iter_validation
+
+SCHEMAS = Path("schemas").resolve()
+SETS = [  # (include glob, schema arguments, match)
+    ("*[02468].xml", {"xsd_path": "minimal.xsd", "schematron_path": "minimal.sch"}, '{glob: "*[02468].xml", namespace: ""}'),
+    ("*[13579].xml", {"xsd_path": "minimal.xsd"}, '{glob: "*[13579].xml", namespace: ""}'),
+    ("*.json", {"json_schema_path": "sample.schema.json"}, '{glob: "*.json"}'),
+    ("*.csv", {"csv_schema_path": "csv.schema.yaml"}, '{glob: "*.csv"}'),
+]
+_YAML_KEYS = {"xsd_path": "xsd", "schematron_path": "sch", "json_schema_path": "json_schema", "csv_schema_path": "csv_schema"}
+NONE = dict(xsd_path=None, json_schema_path=None)
+
+
+def write_routes(path: Path) -> str:
+    lines = ["routes:"]
+    for _, schemas, match in SETS:
+        lines.append(f"  - match: {match}")
+        lines += [f"    {_YAML_KEYS[k]}: {SCHEMAS / v}" for k, v in schemas.items()]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def run(target: str, workers: int, **kwargs):
+    files = errors = 0
+    for _, report in iter_validation(target, workers=workers, order="path", **kwargs):
+        files, errors = files + 1, errors + report.error_count
+    return files, errors
+
+
+def main(
+    xml: int = typer.Option(2000, help="XML labels in the bundle"),
+    json_docs: int = typer.Option(2000, "--json", help="JSON documents in the bundle"),
+    csv: int = typer.Option(10, help="CSV tables in the bundle"),
+    workers: int = typer.Option(2, help="Pool size for the parallel cases"),
+) -> None:
+    with tempfile.TemporaryDirectory(prefix="aiops_routing_") as tmp:
+        data = generate(Path(tmp) / "data", CorpusSpec(xml=xml, json=json_docs, csv=csv))
+        routes = write_routes(Path(tmp) / "routes.yaml")
+        typer.echo(f"{xml} XML, {json_docs} JSON, {csv} CSV files; {len(SETS)} schema sets")
+        typer.echo(f"{'mode':<26}{'workers':>8}{'files':>8}{'errors':>8}{'s':>8}")
+        for n in sorted({1, workers}):
+            t0, files, errors = time.perf_counter(), 0, 0
+            for include, schemas, _ in SETS:
+                f, e = run(str(data), n, include=[include], **{**NONE, **{k: str(SCHEMAS / v) for k, v in schemas.items()}})
+                files, errors = files + f, errors + e
+            typer.echo(f"{'one run per schema set':<26}{n:>8}{files:>8}{errors:>8}{time.perf_counter() - t0:>8.2f}")
+            t0 = time.perf_counter()
+            files, errors = run(str(data), n, routes=routes, **NONE)
+            typer.echo(f"{'one routed run':<26}{n:>8}{files:>8}{errors:>8}{time.perf_counter() - t0:>8.2f}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
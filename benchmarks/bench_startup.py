@@ -0,0 +1,74 @@
+# benchmarks/bench_startup.py
+"""
+CLI start-up: wall time of `cli.py` on one small JSON file with every schema
+configured (the pre-commit hook case), run from a scratch directory so the
+package-relative templates are exercised, plus the slowest imports.
+
+    python -m benchmarks.bench_startup --runs 15 --target-ms 150 --check
+"""
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def command(doc: Path) -> list:
+    s = ROOT / "schemas"
+    return [
+        sys.executable, str(ROOT / "cli.py"), str(doc),
+        "--xsd", str(s / "minimal.xsd"), "--sch", str(s / "minimal.sch"),
+        "--json-schema", str(s / "sample.schema.json"), "--csv-schema", str(s / "csv.schema.yaml"),
+    ]
+
+
+def wall_ms(cmd: list, cwd: str = None) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(cmd, cwd=cwd, capture_output=True)
+    return (time.perf_counter() - t0) * 1000
+
+
+def top_imports(cmd: list, cwd: str, n: int) -> list:
+    """(cumulative ms, module) of the slowest top-level imports, from -X importtime."""
+    err = subprocess.run([cmd[0], "-X", "importtime", *cmd[1:]], cwd=cwd, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if not name.startswith("  ") and cumulative.strip().isdigit():  # top level only
+                rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main(
+    runs: int = typer.Option(15, help="CLI invocations to time"),
+    target_ms: float = typer.Option(150.0, "--target-ms", help="Start-up budget for one JSON file"),
+    check: bool = typer.Option(False, "--check", help="Exit 1 when the best run is over the budget"),
+) -> None:
+    with tempfile.TemporaryDirectory(prefix="aiops_startup_") as cwd:
+        doc = Path(cwd) / "one.json"
+        doc.write_text('{"id": 1, "title": "ok"}\n', encoding="utf-8")
+        cmd = command(doc)
+        wall_ms(cmd, cwd)  # warm the OS and template caches
+        times = [wall_ms(cmd, cwd) for _ in range(runs)]
+        bare = min(wall_ms([sys.executable, "-c", "pass"]) for _ in range(5))
+        imports = top_imports(cmd, cwd, 8)
+
+    best = min(times)
+    typer.echo(f"cli.py, one JSON file: best {best:.0f} ms  median {statistics.median(times):.0f} ms"
+               f"  (bare interpreter {bare:.0f} ms, target {target_ms:.0f} ms)")
+    typer.echo("slowest top-level imports:")
+    for ms, name in imports:
+        typer.echo(f"  {ms:8.1f} ms  {name}")
+    if check and best > target_ms:
+        typer.secho(f"over budget by {best - target_ms:.0f} ms", err=True)
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
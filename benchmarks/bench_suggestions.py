@@ -0,0 +1,97 @@
+# benchmarks/bench_suggestions.py
+"""
+Suggestion enrichment at scale: the compiled rule pack vs. the previous linear
+predicate scan, with the bundled rules plus N synthetic site-specific rules.
+
+    python -m benchmarks.bench_suggestions --n 1000000 --site-rules 300
+"""
+import random
+import time
+from typing import List
+
+import typer
+
+from core.models import Suggestion, ValidationIssue
+from core.rulepack import DEFAULT_RULE_PACK, RulePack
+import yaml
+
+MESSAGES = [
+    "'instrument' is a required property",
+    "'UNKNOWN' is not one of ['IRIS', 'MAG', 'IMG']",
+    "failed validating <Element Product> with XsdGroup(model='sequence'):\n\nReason: Missing child element(s).",
+    "Unexpected child with tag 'Label' at position 1. Namespace mismatch.",
+    "'120.3' is not a valid value for attribute unit",
+    "Title must not be empty.",
+]
+
+
+def site_rules(n: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    words = ["orbit", "lidar", "spectral", "band", "radiance", "quality", "flag", "epoch", "target", "frame"]
+    return [{
+        "id": f"site-{k}",
+        "any": [f"{rng.choice(words)}_{k}", f"{rng.choice(words)}-{k}"],
+        "suggestion": {"message": f"Site rule {k}"},
+    } for k in range(n)]
+
+
+def make_issues(n: int, seed: int = 0) -> List[ValidationIssue]:
+    rng = random.Random(seed)
+    out = []
+    for k in range(n):
+        msg = rng.choice(MESSAGES)
+        if rng.random() < 0.3:  # messages that embed values differ from issue to issue
+            msg = f"{msg} (record {k})"
+        out.append(ValidationIssue("JSON-SCHEMA", "error", str(k), msg))
+    return out
+
+
+def linear_enrich(rules: List[dict], issues: List[ValidationIssue]) -> None:
+    """The old approach: one predicate per rule, tried in order, new Suggestion per hit."""
+    preds = []
+    for r in rules:
+        any_, all_ = r.get("any") or [], r.get("all") or []
+        preds.append((
+            lambda m, a=any_, b=all_: (not a or any(t in m for t in a)) and all(t in m for t in b),
+            r["suggestion"],
+        ))
+    for i in issues:
+        for pred, s in preds:
+            if pred(i.message) and i.suggestion is None:
+                i.suggestion = Suggestion(s["message"], s.get("example"))
+                break
+
+
+def main(
+    n: int = typer.Option(1_000_000, help="Issues to enrich"),
+    site: int = typer.Option(300, "--site-rules", help="Synthetic site-specific rules added before the bundled ones"),
+) -> None:
+    with open(DEFAULT_RULE_PACK, encoding="utf-8") as f:
+        rules = site_rules(site) + yaml.safe_load(f)["rules"]
+
+    t0 = time.perf_counter()
+    pack = RulePack(rules)
+    compile_s = time.perf_counter() - t0
+
+    issues = make_issues(n)
+    t0 = time.perf_counter()
+    pack.enrich(issues)
+    indexed_s = time.perf_counter() - t0
+
+    legacy = make_issues(n)
+    t0 = time.perf_counter()
+    linear_enrich(rules, legacy)
+    linear_s = time.perf_counter() - t0
+
+    same = all((a.suggestion and a.suggestion.message) == (b.suggestion and b.suggestion.message)
+               for a, b in zip(issues, legacy))
+    typer.echo(f"{len(rules)} rules, {n} issues (compile {compile_s * 1e3:.1f} ms)")
+    typer.echo(f"linear scan   {linear_s:8.2f}s  {n / linear_s:>12,.0f} issues/s")
+    typer.echo(f"rule pack     {indexed_s:8.2f}s  {n / indexed_s:>12,.0f} issues/s  ({linear_s / indexed_s:.1f}x)")
+    typer.echo(f"same suggestions: {same}")
+    for rule_id, hits in pack.hits.most_common(5):
+        typer.echo(f"  {rule_id:<20}{hits:>10}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
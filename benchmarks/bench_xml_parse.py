@@ -0,0 +1,70 @@
+# benchmarks/bench_xml_parse.py
+"""
+Per-file cost of the single-parse XML pipeline vs. the old parse-twice flow.
+
+    python -m benchmarks.bench_xml_parse --repeat 20 --sizes 1,10,50
+"""
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import typer
+from lxml import etree
+
+from valmods.xml_validator import XMLValidator
+
+EXAMPLES = ["examples/bad_label.xml", "examples/bad_schematron.xml"]
+
+
+def make_large_label(path: Path, mb: int) -> Path:
+    """A Product label whose Observation_Area carries ~`mb` MB of table-like text."""
+    row = "  1.234567E+01  2.345678E+02  3.456789E+03  4.567890E+04\n"
+    block = row * 1024
+    # comments split the text so no single node hits libxml2's 10 MB text-node limit
+    body = "<!-- record block -->".join([block] * max(1, mb * 1024 * 1024 // len(block)))
+    path.write_text(
+        f"<Product>\n  <Title>Synthetic {mb} MB</Title>\n"
+        f"  <Observation_Area>{body}</Observation_Area>\n</Product>\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def legacy_validate(v: XMLValidator, path: str) -> int:
+    """The pre-single-parse flow: lxml parse, then xmlschema re-reads the path."""
+    doc = etree.parse(path)
+    n = sum(1 for _ in v.schema.iter_errors(path))
+    if v.schematron is not None:
+        v.schematron(doc)
+    return n
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(
+    repeat: int = typer.Option(10, help="Repetitions per file (best time is reported)"),
+    sizes: str = typer.Option("1,10", help="Comma-separated synthetic label sizes in MB"),
+) -> None:
+    v = XMLValidator("schemas/minimal.xsd", schematron_path="schemas/minimal.sch")
+    with tempfile.TemporaryDirectory() as tmp:
+        files = list(EXAMPLES)
+        for mb in (int(s) for s in sizes.split(",") if s):
+            files.append(str(make_large_label(Path(tmp) / f"large_{mb}mb.xml", mb)))
+
+        typer.echo(f"{'file':<28}{'legacy ms':>12}{'single ms':>12}{'speedup':>10}")
+        for f in files:
+            old = _time(lambda: legacy_validate(v, f), repeat)
+            new = _time(lambda: v.validate(f), repeat)
+            typer.echo(f"{Path(f).name:<28}{old * 1e3:>12.2f}{new * 1e3:>12.2f}{old / new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,58 @@
+# benchmarks/bench_xml_prescreen.py
+"""
+Staged XML pipeline: time with and without the iterparse pre-screen on labels
+where a share of the files fail early (wrong root, wrong namespace, broken prologue).
+
+    python -m benchmarks.bench_xml_prescreen --files 300 --kb 64 --early-fail 0.3
+"""
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+from benchmarks.corpus import make_xml
+from valmods.xml_validator import XMLValidator
+
+XSD, SCH = "schemas/minimal.xsd", "schemas/minimal.sch"
+
+
+def early_failure(rng: random.Random, text: str) -> str:
+    kind = rng.choice(["root", "namespace", "prologue"])
+    if kind == "root":
+        return text.replace("<Product>", "<Product_Observational>").replace("</Product>", "</Product_Observational>")
+    if kind == "namespace":
+        return text.replace("<Product>", '<Product xmlns="http://pds.nasa.gov/pds4/pds/v1">', 1)
+    return "<?xml version='1.0' encoding='UTF-8'?>\n<!DOCTYPE Product [<!ELEMENT>]>\n" + text
+
+
+def main(
+    files: int = typer.Option(300, help="Number of labels"),
+    kb: int = typer.Option(64, help="Approximate KB per label"),
+    early_fail: float = typer.Option(0.3, "--early-fail", help="Share of labels with a root/namespace/prologue error"),
+    max_errors: int = typer.Option(None, "--max-errors", help="Stop XSD validation after N errors"),
+) -> None:
+    rng = random.Random(0)
+    root = Path(tempfile.mkdtemp(prefix="aiops_bench_"))
+    paths = []
+    for k in range(files):
+        text = make_xml(rng, kb, broken=False)
+        if rng.random() < early_fail:
+            text = early_failure(rng, text)
+        p = root / f"label_{k:05d}.xml"
+        p.write_text(text, encoding="utf-8")
+        paths.append(str(p))
+
+    typer.echo(f"{files} labels of ~{kb} KB, {early_fail:.0%} failing early")
+    for label, prescreen in (("full validation only", False), ("pre-screen + full", True)):
+        v = XMLValidator(XSD, schematron_path=SCH, max_errors=max_errors, prescreen=prescreen)
+        t0 = time.perf_counter()
+        issues = sum(len(v.validate(p)) for p in paths)
+        dt = time.perf_counter() - t0
+        stages = "  ".join(f"{k}={s:.2f}s" for k, s in v.stage_seconds.items())
+        typer.echo(f"{label:<22}{dt:8.2f}s  issues={issues:<6} rejected={v.rejected:<5} {stages}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
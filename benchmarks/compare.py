@@ -0,0 +1,50 @@
+# benchmarks/compare.py
+"""
+Compare two benchmarks.run result files and fail on regressions.
+
+    python -m benchmarks.compare base.json head.json --threshold 0.10
+
+A case regresses when its time grew by more than --threshold (0.10 = 10%).
+Exits 1 if any case regressed, so it can gate CI or a dependency upgrade.
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import typer
+
+
+def compare(base: Dict[str, dict], head: Dict[str, dict], threshold: float) -> List[Tuple[str, float, float, float, bool]]:
+    """(case, base s, head s, relative change, regressed) for every case in both runs."""
+    rows = []
+    for name in base:
+        if name not in head:
+            continue
+        b, h = base[name]["seconds"], head[name]["seconds"]
+        change = (h - b) / b if b > 0 else 0.0
+        rows.append((name, b, h, change, change > threshold))
+    return rows
+
+
+def main(
+    base: str = typer.Argument(..., help="Baseline results JSON"),
+    head: str = typer.Argument(..., help="New results JSON"),
+    threshold: float = typer.Option(0.10, "--threshold", help="Allowed slowdown per case (0.10 = 10%)"),
+) -> None:
+    b = json.loads(Path(base).read_text(encoding="utf-8"))
+    h = json.loads(Path(head).read_text(encoding="utf-8"))
+    typer.echo(f"{b['meta']['commit']} -> {h['meta']['commit']}  (threshold {threshold:+.0%})")
+    typer.echo(f"{'case':<26}{'base s':>10}{'head s':>10}{'change':>9}")
+    rows = compare(b["results"], h["results"], threshold)
+    for name, bs, hs, change, regressed in rows:
+        line = f"{name:<26}{bs:>10.4f}{hs:>10.4f}{change:>+9.1%}"
+        typer.secho(line + ("  REGRESSION" if regressed else ""), fg=typer.colors.RED if regressed else None)
+    missing = sorted(set(b["results"]) ^ set(h["results"]))
+    if missing:
+        typer.echo(f"Not compared (only in one run): {', '.join(missing)}")
+    if any(r[4] for r in rows):
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,105 @@
+# benchmarks/corpus.py
+"""
+Deterministic synthetic corpus for the benchmarks: XML labels (for
+schemas/minimal.xsd + minimal.sch), JSON documents (schemas/sample.schema.json)
+and CSV tables (schemas/csv.schema.yaml), with a configurable share of broken files.
+
+    python -m benchmarks.corpus /tmp/corpus --xml 500 --json 500 --csv 20 --error-rate 0.2
+"""
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+import typer
+
+INSTRUMENTS = ["IRIS", "MAG", "IMG"]
+
+
+@dataclass
+class CorpusSpec:
+    xml: int = 200
+    json: int = 200
+    csv: int = 10
+    xml_kb: int = 4          # approximate size of each label's Observation_Area text
+    csv_rows: int = 10_000
+    error_rate: float = 0.1  # share of broken files / broken CSV rows
+    seed: int = 0
+
+
+def make_xml(rng: random.Random, kb: int, broken: bool) -> str:
+    row = "  {:.6E}  {:.6E}  {:.6E}\n"
+    body = "".join(row.format(rng.random(), rng.random() * 1e3, rng.random() * 1e6) for _ in range(kb * 1024 // 48))
+    title = f"Synthetic observation {rng.randrange(10**6)}"
+    fault = rng.choice(["missing_area", "empty_title", "wrong_root"]) if broken else None
+    if fault == "wrong_root":
+        return f"<Label>\n  <Title>{title}</Title>\n</Label>\n"
+    if fault == "empty_title":
+        title = ""
+    area = "" if fault == "missing_area" else f"  <Observation_Area>{body}</Observation_Area>\n"
+    return f"<Product>\n  <Title>{title}</Title>\n{area}</Product>\n"
+
+
+def make_json(rng: random.Random, broken: bool) -> str:
+    doc = {"title": f"Mars sample {rng.randrange(10**6)}", "instrument": rng.choice(INSTRUMENTS), "value": rng.random() * 100}
+    if broken:
+        fault = rng.choice(["missing", "enum", "type"])
+        if fault == "missing":
+            del doc["instrument"]
+        elif fault == "enum":
+            doc["instrument"] = "UNKNOWN"
+        else:
+            doc["value"] = str(doc["value"])
+    return json.dumps(doc)
+
+
+def make_csv(rng: random.Random, rows: int, error_rate: float) -> str:
+    lines = ["id,name,score"]
+    for k in range(rows):
+        name, score, ident = f"target{k % 97}", f"{rng.random() * 100:.3f}", str(k)
+        if rng.random() < error_rate:
+            fault = rng.choice(["empty", "low", "high"])
+            if fault == "empty":
+                name = ""
+            elif fault == "low":
+                score = "-1"
+            else:
+                score = "150"
+        lines.append(f"{ident},{name},{score}")
+    return "\n".join(lines) + "\n"
+
+
+def generate(dest: Path, spec: CorpusSpec) -> Path:
+    """Write the corpus under `dest` (xml/, json/, csv/); same spec -> same bytes."""
+    rng = random.Random(spec.seed)
+    for sub in ("xml", "json", "csv"):
+        (dest / sub).mkdir(parents=True, exist_ok=True)
+    for k in range(spec.xml):
+        text = make_xml(rng, spec.xml_kb, rng.random() < spec.error_rate)
+        (dest / "xml" / f"label_{k:06d}.xml").write_text(text, encoding="utf-8")
+    for k in range(spec.json):
+        text = make_json(rng, rng.random() < spec.error_rate)
+        (dest / "json" / f"doc_{k:06d}.json").write_text(text, encoding="utf-8")
+    for k in range(spec.csv):
+        text = make_csv(rng, spec.csv_rows, spec.error_rate)
+        (dest / "csv" / f"table_{k:04d}.csv").write_text(text, encoding="utf-8")
+    return dest
+
+
+def main(
+    dest: str = typer.Argument(..., help="Output directory"),
+    xml: int = typer.Option(CorpusSpec.xml, help="Number of XML labels"),
+    json_docs: int = typer.Option(CorpusSpec.json, "--json", help="Number of JSON documents"),
+    csv: int = typer.Option(CorpusSpec.csv, help="Number of CSV tables"),
+    xml_kb: int = typer.Option(CorpusSpec.xml_kb, help="Approximate KB of text per label"),
+    csv_rows: int = typer.Option(CorpusSpec.csv_rows, help="Rows per CSV table"),
+    error_rate: float = typer.Option(CorpusSpec.error_rate, help="Share of broken files / rows"),
+    seed: int = typer.Option(CorpusSpec.seed, help="Random seed"),
+) -> None:
+    spec = CorpusSpec(xml=xml, json=json_docs, csv=csv, xml_kb=xml_kb, csv_rows=csv_rows, error_rate=error_rate, seed=seed)
+    generate(Path(dest), spec)
+    typer.echo(f"Wrote corpus to {dest}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,94 @@
+# benchmarks/load_test.py
+"""
+Load test for valmods.service: concurrent keep-alive clients against localhost,
+reporting throughput and p50/p99 latency.
+
+    python -m benchmarks.load_test --spawn --requests 5000 --concurrency 32
+    python -m benchmarks.load_test --url http://127.0.0.1:8765 --file examples/bad_sample.json
+"""
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+from urllib.parse import urlsplit
+
+import typer
+
+from valmods.service import request
+
+
+async def _client(host: str, port: int, name: str, body: bytes, n: int, latencies: List[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n):
+            t0 = time.perf_counter()
+            status, _ = await request(reader, writer, host, name, body)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}")
+    finally:
+        writer.close()
+
+
+async def _wait_ready(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run(url: str, file: str, requests: int, concurrency: int) -> List[float]:
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port
+    await _wait_ready(host, port)
+    body = Path(file).read_bytes()
+    latencies: List[float] = []
+    per_client = max(1, requests // concurrency)
+    await asyncio.gather(*(
+        _client(host, port, Path(file).name, body, per_client, latencies) for _ in range(concurrency)
+    ))
+    return latencies
+
+
+def main(
+    url: str = typer.Option("http://127.0.0.1:8765", help="Service base URL"),
+    file: str = typer.Option("examples/bad_label.xml", help="File sent in every request"),
+    requests: int = typer.Option(2000, help="Total requests"),
+    concurrency: int = typer.Option(16, help="Concurrent keep-alive connections"),
+    spawn: bool = typer.Option(False, help="Start a local service with the example schemas first"),
+    workers: int = typer.Option(2, help="Service workers when --spawn is used"),
+) -> None:
+    proc = None
+    if spawn:
+        port = urlsplit(url).port
+        proc = subprocess.Popen([
+            sys.executable, "-m", "valmods.service", "--port", str(port), "--workers", str(workers),
+            "--xsd", "schemas/minimal.xsd", "--sch", "schemas/minimal.sch",
+            "--json-schema", "schemas/sample.schema.json", "--csv-schema", "schemas/csv.schema.yaml",
+        ])
+    try:
+        t0 = time.perf_counter()
+        latencies = asyncio.run(run(url, file, requests, concurrency))
+        wall = time.perf_counter() - t0
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3
+    typer.echo(f"requests={len(latencies)} concurrency={concurrency} wall={wall:.2f}s rps={len(latencies) / wall:,.0f}")
+    typer.echo(f"latency ms: p50={p(0.50):.2f} p90={p(0.90):.2f} p99={p(0.99):.2f} "
+               f"mean={statistics.mean(latencies) * 1e3:.2f} max={latencies[-1] * 1e3:.2f}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,178 @@
+# benchmarks/run.py
+"""
+Benchmark suite: builds a synthetic corpus (benchmarks.corpus) and times every
+validator path, the suggestion rules and the reporters. Results are written as
+JSON so runs can be compared across commits with benchmarks.compare.
+
+    python -m benchmarks.run --out bench-results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.compare bench-results/base.json bench-results/head.json --threshold 0.1
+
+Each case reports the best of --repeat runs (least noisy on a shared machine).
+"""
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import typer
+
+from benchmarks.corpus import CorpusSpec, generate
+from core.models import ValidationReport
+from core.reasoner import enrich_with_suggestions
+from core.reporter import to_html, to_markdown
+from valmods.csv_validator import CSVValidator
+from valmods.json_validator import JSONValidator
+from valmods.runner import run_validation
+from valmods.xml_validator import XMLValidator
+
+XSD, SCH = "schemas/minimal.xsd", "schemas/minimal.sch"
+JSON_SCHEMA, CSV_SCHEMA = "schemas/sample.schema.json", "schemas/csv.schema.yaml"
+
+SCALES = {
+    "small": CorpusSpec(xml=50, json=100, csv=2, csv_rows=2_000),
+    "medium": CorpusSpec(),
+    "large": CorpusSpec(xml=2_000, json=5_000, csv=20, xml_kb=16, csv_rows=100_000),
+}
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _best(fn: Callable[[], int], repeat: int) -> Dict[str, float]:
+    """Time fn() `repeat` times; fn returns the number of items it processed."""
+    times, items = [], 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        items = fn()
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    return {"seconds": best, "items": items, "items_per_s": items / best if best > 0 else 0.0}
+
+
+def _data_rows(path: Path) -> int:
+    """Lines in a CSV file after its header."""
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for _ in f) - 1
+
+
+def run_suite(corpus: Path, repeat: int = 3, workers: int = 1) -> Dict[str, dict]:
+    xml_files = sorted((corpus / "xml").glob("*.xml"))
+    json_files = sorted((corpus / "json").glob("*.json"))
+    csv_files = sorted((corpus / "csv").glob("*.csv"))
+    reports: List[ValidationReport] = []
+
+    def xml_cold() -> int:
+        v = XMLValidator(XSD, schematron_path=SCH)
+        for p in xml_files:
+            v.validate(str(p))
+        return len(xml_files)
+
+    xml_validator = XMLValidator(XSD, schematron_path=SCH)
+    json_validator = JSONValidator(JSON_SCHEMA)
+    csv_validator = CSVValidator(CSV_SCHEMA)
+
+    def over(validator, files) -> Callable[[], int]:
+        def fn() -> int:
+            for p in files:
+                validator.validate(str(p))
+            return len(files)
+        return fn
+
+    n_rows = sum(map(_data_rows, csv_files))
+
+    def csv_rows() -> int:
+        for p in csv_files:
+            csv_validator.validate(str(p))
+        return n_rows
+
+    def pipeline() -> int:
+        results = run_validation(
+            str(corpus), xsd_path=XSD, json_schema_path=JSON_SCHEMA,
+            csv_schema_path=CSV_SCHEMA, schematron_path=SCH, workers=workers,
+        )
+        reports[:] = [r for _, r in results]
+        return len(reports)
+
+    def suggestions() -> int:
+        n = 0
+        for r in reports:
+            for i in r.issues:
+                i.suggestion = None
+            enrich_with_suggestions(r.issues)
+            n += len(r.issues)
+        return n
+
+    def render(fn) -> Callable[[], int]:
+        def go() -> int:
+            for r in reports:
+                fn(r)
+            return len(reports)
+        return go
+
+    cases = [
+        ("xml_validator_cold", xml_cold),
+        ("xml_validator", over(xml_validator, xml_files)),
+        ("json_validator", over(json_validator, json_files)),
+        ("csv_validator_rows", csv_rows),
+        ("run_validation", pipeline),
+        ("enrich_with_suggestions", suggestions),
+        ("report_markdown", render(to_markdown)),
+        ("report_html", render(to_html)),
+    ]
+    results = {}
+    for name, fn in cases:
+        results[name] = _best(fn, repeat)
+        typer.echo(f"{name:<26}{results[name]['seconds']:>9.4f}s{results[name]['items_per_s']:>12.1f}/s", err=True)
+    return results
+
+
+def main(
+    out: str = typer.Option("bench-results.json", "--out", help="Where to write the JSON results"),
+    scale: str = typer.Option("small", "--scale", help=f"Corpus size: {', '.join(SCALES)}"),
+    corpus: str = typer.Option(None, "--corpus", help="Use (or create) the corpus in this directory"),
+    seed: int = typer.Option(0, "--seed", help="Corpus random seed"),
+    error_rate: float = typer.Option(None, "--error-rate", help="Override the scale's error rate"),
+    repeat: int = typer.Option(3, "--repeat", min=1, help="Runs per case; the best is kept"),
+    workers: int = typer.Option(1, "--workers", min=1, help="Workers for the run_validation case"),
+) -> None:
+    if scale not in SCALES:
+        raise typer.BadParameter(f"--scale must be one of {', '.join(SCALES)}")
+    spec = CorpusSpec(**{**asdict(SCALES[scale]), "seed": seed})
+    if error_rate is not None:
+        spec.error_rate = error_rate
+
+    with tempfile.TemporaryDirectory(prefix="aiops_bench_") as tmp:
+        root = Path(corpus) if corpus else Path(tmp)
+        if not (root / "xml").is_dir():
+            generate(root, spec)
+        results = run_suite(root, repeat=repeat, workers=workers)
+
+    payload = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": scale,
+            "corpus": asdict(spec),
+            "repeat": repeat,
+            "workers": workers,
+        },
+        "results": results,
+    }
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    Path(out).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    typer.secho(f"Wrote {out}", fg=typer.colors.GREEN)
+
+
+if __name__ == "__main__":
+    typer.run(main)
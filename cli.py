@@ -1,23 +1,75 @@
 # aiops-data-validator/cli.py
 from __future__ import annotations
 
+import cProfile
+import sys
+from contextlib import ExitStack
 from pathlib import Path
+from time import perf_counter
+from typing import List
 import typer
 
-from valmods.runner import run_validation
-from core.reporter import to_markdown, to_html
-from core.reasoner import enrich_with_suggestions, summarize
+from valmods.runner import iter_validation
+from core.reporter import SarifWriter, write_html, write_index, write_jsonl, write_markdown
+from core.reasoner import default_rule_pack, enrich_with_suggestions, summarize
+from core.rulepack import load_rule_pack
+from core import metrics
+from valmods.discovery import ORDERS, parse_shard
 
 
 def main(
     path: str = typer.Argument(..., help="File or directory to validate"),
     xsd: str = typer.Option(None, "--xsd", help="XML XSD path or URL (for .xml files)"),
     sch: str = typer.Option(None, "--sch", help="Schematron .sch file for XML (optional)"),
-    json_schema: str = typer.Option(None, "--json-schema", help="JSON Schema path (for .json files)"),
+    json_schema: str = typer.Option(None, "--json-schema", help="JSON Schema path (for .json/.jsonl/.ndjson files)"),
     csv_schema: str = typer.Option(None, "--csv-schema", help="CSV schema YAML path (for .csv files)"),
+    routes: str = typer.Option(None, "--routes",
+                               help="Routes YAML choosing schemas per file by glob, root element/namespace, schemaLocation or $schema; "
+                                    "--xsd/--sch/--json-schema/--csv-schema are the fallback"),
     out: str = typer.Option(None, "--out", help="Directory to write per-file reports (MD, and HTML if --html)"),
     html: bool = typer.Option(False, "--html", help="Also write per-file HTML reports when --out is set"),
     use_rules: bool = typer.Option(True, "--rules/--no-rules", help="Attach rule-based suggestions to issues"),
+    rule_pack: str = typer.Option(None, "--rule-pack", help="Suggestion rules YAML (default: core/suggestions.yaml)"),
+    use_llm: bool = typer.Option(False, "--llm", envvar="USE_LLM",
+                                 help="Ask the LLM endpoint (LLM_ENDPOINT) for issues the rules left without a fix"),
+    workers: int = typer.Option(1, "--workers", min=1, help="Validate files in N parallel worker processes"),
+    include: List[str] = typer.Option(None, "--include",
+                                      help="Only validate files whose relative path or name matches this glob (repeatable)"),
+    exclude: List[str] = typer.Option(None, "--exclude",
+                                      help="Skip files and directories matching this glob (repeatable)"),
+    shard: str = typer.Option(None, "--shard", help="Validate only shard i of N (e.g. 2/4); the same split on every machine"),
+    order: str = typer.Option(None, "--order",
+                              help="scan (streamed), size (largest first) or path; default: size with --workers > 1, else scan"),
+    scan_threads: int = typer.Option(1, "--scan-threads", min=1,
+                                     help="List directories on N threads (helps on network filesystems)"),
+    schema_cache: str = typer.Option(None, "--schema-cache", envvar="AIOPS_SCHEMA_CACHE",
+                                     help="Directory for the compiled-schema cache (reused across runs)"),
+    schema_catalog: str = typer.Option(None, "--schema-catalog", envvar="AIOPS_SCHEMA_CATALOG",
+                                       help="Offline schema bundle (python -m valmods.schema_catalog) for XSD/Schematron URLs and their imports"),
+    csv_chunksize: int = typer.Option(None, "--csv-chunksize", min=1,
+                                      help="Stream CSV files in chunks of N rows (bounded memory)"),
+    csv_engine: str = typer.Option(None, "--csv-engine",
+                                   help="pandas or arrow (typed pyarrow reads of the schema's columns); default: the schema's `engine`, else pandas"),
+    max_errors: int = typer.Option(None, "--max-errors", min=1,
+                                   help="Per-file budget: stop checking a file (XSD, Schematron, JSON Schema, CSV) after N issues"),
+    max_total_errors: int = typer.Option(None, "--max-total-errors", min=1,
+                                         help="Run budget: stop after N errors in total; remaining files are not validated"),
+    fail_fast: bool = typer.Option(False, "--fail-fast",
+                                   help="Stop at the first error (--max-errors 1 --max-total-errors 1)"),
+    incremental: bool = typer.Option(False, "--incremental",
+                                     help="Reuse stored results for files unchanged since the last run"),
+    max_issues: int = typer.Option(None, "--max-issues", min=0,
+                                   help="Show at most N issues per report (MD/HTML); the rest are counted by type"),
+    combined: bool = typer.Option(False, "--combined",
+                                  help="With --out, write one index.md (index.html with --html) for all files"),
+    jsonl: str = typer.Option(None, "--jsonl", help="Also write every issue as JSON Lines to this file"),
+    sarif: str = typer.Option(None, "--sarif", help="Also write a SARIF 2.1.0 log to this file"),
+    profile: str = typer.Option(None, "--profile",
+                                help="Write per-stage timings, counters and the slowest files as JSON to this file"),
+    cprofile: str = typer.Option(None, "--cprofile",
+                                 help="Write a cProfile dump (pstats; main process only) to this file"),
+    slowest: int = typer.Option(metrics.DEFAULT_SLOWEST, "--slowest", min=1,
+                                help="How many of the slowest files --profile lists"),
 ) -> None:
 
     target = Path(path)
@@ -25,43 +77,166 @@ def main(
         typer.secho(f"[ERROR] Path not found: {target}", fg=typer.colors.RED, err=True)
         raise typer.Exit(code=2)
 
-    # Run validations (auto-detect by file extension)
-    results = run_validation(
-        target=str(target),
-        xsd_path=xsd,
-        json_schema_path=json_schema,
-        csv_schema_path=csv_schema,
-        schematron_path=sch,  # <- optional Schematron support
-    )
-
-    if not results:
-        typer.secho("No supported files found (xml/json/csv).", fg=typer.colors.YELLOW)
-        raise typer.Exit(code=0)
+    try:
+        shard_spec = parse_shard(shard) if shard else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--shard")
+    order = order or ("size" if workers > 1 else "scan")
+    if order not in ORDERS:
+        raise typer.BadParameter(f"must be one of {', '.join(ORDERS)}", param_hint="--order")
+    if csv_engine not in (None, "pandas", "arrow"):  # the CSV stack is only imported for .csv files
+        raise typer.BadParameter("must be pandas or arrow", param_hint="--csv-engine")
+    route_paths: list[str] = []
+    if routes:
+        from valmods.routing import route_schemas
+        try:
+            route_paths = [routes, *route_schemas(routes)]
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(str(e), param_hint="--routes")
+    catalog_version = None
+    if schema_catalog:
+        from valmods.schema_catalog import CatalogError, SchemaCatalog
+        try:
+            catalog_version = SchemaCatalog.load(schema_catalog).version  # hash-checked once, up front
+        except CatalogError as e:
+            raise typer.BadParameter(str(e), param_hint="--schema-catalog")
 
     out_dir: Path | None = None
     if out:
         out_dir = Path(out)
         out_dir.mkdir(parents=True, exist_ok=True)
 
-    any_errors = False
-    summaries: list[str] = []
-
-    for _, report in results:
-        if use_rules:
-            enrich_with_suggestions(report.issues)  # mutates in-place
+    if fail_fast:
+        max_errors = max_total_errors = 1
 
-        any_errors |= (report.error_count > 0)
-        summaries.append(summarize(report))
+    m = metrics.enable(slowest) if profile else None
+    profiler = cProfile.Profile() if cprofile else None
+    if profiler:
+        profiler.enable()
 
-        md = to_markdown(report)
+    pack = load_rule_pack(rule_pack) if rule_pack else None
+    any_errors = False
+    total_errors = 0
+    stopped_early = False  # the error budget left files unvalidated
+    summaries: list[str] = []
 
-        if out_dir:
-            (out_dir / f"{Path(report.file).stem}_report.md").write_text(md, encoding="utf-8")
-            if html:
-                (out_dir / f"{Path(report.file).stem}_report.html").write_text(to_html(report), encoding="utf-8")
+    with ExitStack() as stack:
+        # Incremental mode: result store lives under --out (or the CWD)
+        store = None
+        if incremental:
+            from valmods.result_store import ResultStore, schema_fingerprint
+            db_path = Path(out or ".") / ".aiops_results.sqlite"
+            options = (f"max_errors={max_errors};max_total_errors={max_total_errors};csv_engine={csv_engine};"
+                       f"catalog={catalog_version}")
+            fingerprint = schema_fingerprint([xsd, sch, json_schema, csv_schema, *route_paths], options=options)
+            store = ResultStore(str(db_path), fingerprint)
+            stack.callback(store.close)
+        llm = None
+        if use_llm:
+            from core.llm import LLMBackend  # asyncio/urllib/sqlite only when asked for
+            llm = LLMBackend()
+            stack.callback(llm.close)
+        jsonl_fh = stack.enter_context(open(jsonl, "w", encoding="utf-8")) if jsonl else None
+        sarif_log = None
+        if sarif:
+            sarif_log = stack.enter_context(SarifWriter(stack.enter_context(open(sarif, "w", encoding="utf-8"))))
+
+        def stop() -> None:
+            nonlocal stopped_early
+            stopped_early = True
+
+        def reports():
+            """Validate lazily (auto-detect by file extension); each report is dropped once written."""
+            nonlocal any_errors, total_errors
+            for _, report in iter_validation(
+                target=str(target),
+                xsd_path=xsd,
+                json_schema_path=json_schema,
+                csv_schema_path=csv_schema,
+                schematron_path=sch,  # <- optional Schematron support
+                schema_cache_dir=schema_cache,
+                schema_catalog=schema_catalog,
+                routes=routes,
+                csv_chunksize=csv_chunksize,
+                csv_engine=csv_engine,
+                max_errors=max_errors,
+                max_total_errors=max_total_errors,
+                workers=workers,
+                store=store,
+                include=include or (),
+                exclude=exclude or (),
+                shard=shard_spec,
+                order=order,
+                scan_threads=scan_threads,
+                on_stop=stop,
+            ):
+                if use_rules:
+                    with metrics.stage("suggestions"):
+                        enrich_with_suggestions(report.issues, pack)  # mutates in-place
+                if llm:
+                    with metrics.stage("llm"):
+                        llm.enrich(report.issues)
+                any_errors |= (report.error_count > 0)
+                total_errors += report.error_count
+                with metrics.stage("summary"):
+                    summaries.append(summarize(report))
+                with metrics.stage("machine_output"):
+                    if jsonl_fh:
+                        write_jsonl(report, jsonl_fh)
+                    if sarif_log:
+                        sarif_log.add(report)
+                # the consumer renders this report before asking for the next one
+                started = perf_counter() if m else 0.0
+                yield report
+                if m:
+                    m.lap("render", started)
+
+        if out_dir and combined:
+            fmt = "html" if html else "md"
+            with open(out_dir / f"index.{fmt}", "w", encoding="utf-8") as fh:
+                write_index(reports(), fh, fmt, max_issues)
         else:
-            typer.echo(md)
-            typer.echo("\n---\n")
+            for report in reports():
+                if out_dir:
+                    stem = Path(report.file).stem
+                    with open(out_dir / f"{stem}_report.md", "w", encoding="utf-8") as fh:
+                        write_markdown(report, fh, max_issues)
+                    if html:
+                        with open(out_dir / f"{stem}_report.html", "w", encoding="utf-8") as fh:
+                            write_html(report, fh, max_issues)
+                else:
+                    write_markdown(report, sys.stdout, max_issues)
+                    typer.echo("\n---\n")
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(cprofile)
+        typer.secho(f"Wrote cProfile dump to {cprofile} (e.g. snakeviz / flameprof)", err=True)
+    if m:
+        extra = {"rule_hits": dict((pack or default_rule_pack()).hits.most_common()) if use_rules else {}}
+        if llm:
+            extra["llm"] = llm.stats
+        if store:
+            extra["store"] = {"hits": store.hits, "misses": store.misses}
+        m.write(profile, workers=workers, **extra)
+        metrics.disable()
+        typer.secho(f"Wrote profile to {profile}", err=True)
+
+    if llm:
+        st = llm.stats
+        typer.secho(f"LLM: {st['issues']} issue(s), {st['signatures']} signature(s), {st['cache_hits']} cached, "
+                    f"{st['requests']} request(s), {st['failed_batches']} failed batch(es)", err=True)
+    if store:
+        typer.secho(f"Incremental: {store.hits} reused, {store.misses} validated", err=True)
+
+    if stopped_early:
+        reason = "--fail-fast" if fail_fast else f"--max-total-errors {max_total_errors}"
+        typer.secho(f"Stopped after {total_errors} error(s) ({reason}); remaining files were not validated.",
+                    fg=typer.colors.YELLOW, err=True)
+
+    if not summaries:
+        typer.secho("No supported files found (xml/json/jsonl/csv).", fg=typer.colors.YELLOW)
+        raise typer.Exit(code=0)
 
     if out_dir:
         (out_dir / "summary.md").write_text("\n".join(summaries) + "\n", encoding="utf-8")
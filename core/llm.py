@@ -1,10 +1,210 @@
 
+# core/llm.py
+"""
+LLM suggestion backend, gated by USE_LLM.
+
+Issues are grouped by a normalized signature (issue type, rule and the message
+with numbers, addresses and long quoted values masked), so a thousand copies of
+"'title' is a required property" cost one prompt slot. Signatures missing from
+the SQLite cache are sent in batches to an OpenAI-style chat completions
+endpoint, a few requests at a time, with a timeout and retries per request.
+
+    USE_LLM=1 LLM_ENDPOINT=http://127.0.0.1:8799/v1/chat/completions python cli.py examples ...
+    python -m core.llm_stub --port 8799     # offline fake model for tests and benchmarks
+"""
+import asyncio
+import hashlib
+import json
 import os
+import re
+import sqlite3
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
 from core.models import ValidationIssue, Suggestion
+from valmods.schema_cache import private_dir, user_cache_dir
+
+SYSTEM_PROMPT = (
+    "You help fix data validation errors in PDS4 XML labels, JSON documents and CSV tables. "
+    "The user sends a JSON array of issues, each with an id. Reply with only a JSON array of "
+    '{"id": <id>, "message": <one-sentence fix>, "example": <short example or null>}, one per issue.'
+)
+
+_MASKS = [
+    (re.compile(r" at 0x[0-9a-fA-F]+"), ""),
+    (re.compile(r"'[^']{40,}'|\"[^\"]{40,}\""), "'…'"),  # long quoted data, not field names
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?(?!\w|\.\d)"), "N"),  # standalone numbers only
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_message(message: str) -> str:
+    for pattern, repl in _MASKS:
+        message = pattern.sub(repl, message)
+    return message.strip()
+
+
+def signature(issue: ValidationIssue) -> str:
+    """Issues with the same signature get the same suggestion."""
+    key = f"{issue.issue_type}|{issue.rule or ''}|{normalize_message(issue.message)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class LLMConfig:
+    endpoint: str = field(default_factory=lambda: os.getenv("LLM_ENDPOINT", "http://127.0.0.1:8799/v1/chat/completions"))
+    model: str = field(default_factory=lambda: os.getenv("LLM_MODEL", "stub"))
+    api_key: Optional[str] = field(default_factory=lambda: os.getenv("LLM_API_KEY"))
+    cache_path: Optional[str] = field(
+        default_factory=lambda: os.getenv("LLM_CACHE", os.path.join(user_cache_dir(), "llm_cache.sqlite"))
+    )
+    batch_size: int = 20     # issues per prompt
+    concurrency: int = 4     # requests in flight
+    timeout: float = 30.0    # seconds per request
+    retries: int = 3         # extra attempts after a failure
+    backoff: float = 0.5     # seconds, doubled per retry
+
+
+class LLMCache:
+    """Persistent signature -> Suggestion cache."""
+
+    def __init__(self, db_path: str):
+        private_dir(Path(db_path).parent)  # cached suggestions end up in reports
+        self.db = sqlite3.connect(db_path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS suggestions (signature TEXT NOT NULL, model TEXT NOT NULL,"
+            " suggestion TEXT NOT NULL, PRIMARY KEY (signature, model))"
+        )
+
+    def get_many(self, signatures: List[str], model: str) -> Dict[str, Suggestion]:
+        out: Dict[str, Suggestion] = {}
+        for k in range(0, len(signatures), 500):  # stay under SQLite's bound-parameter limit
+            chunk = signatures[k:k + 500]
+            rows = self.db.execute(
+                f"SELECT signature, suggestion FROM suggestions WHERE model = ? AND signature IN ({','.join('?' * len(chunk))})",
+                (model, *chunk),
+            )
+            out.update((sig, Suggestion(**json.loads(data))) for sig, data in rows)
+        return out
+
+    def put_many(self, items: Dict[str, Suggestion], model: str) -> None:
+        self.db.executemany(
+            "INSERT OR REPLACE INTO suggestions (signature, model, suggestion) VALUES (?, ?, ?)",
+            [(sig, model, json.dumps({"message": s.message, "example": s.example})) for sig, s in items.items()],
+        )
+        self.db.commit()
+
+    def close(self) -> None:
+        self.db.close()
+
+
+class LLMBackend:
+    def __init__(self, config: Optional[LLMConfig] = None):
+        self.config = config or LLMConfig()
+        self.cache = LLMCache(self.config.cache_path) if self.config.cache_path else None
+        self._memo: Dict[str, Suggestion] = {}
+        self.stats = {
+            "issues": 0, "signatures": 0, "cache_hits": 0,
+            "requests": 0, "retries": 0, "failed_batches": 0, "seconds": 0.0,
+        }
+
+    # -- transport -------------------------------------------------------------
+    def _post(self, payload: dict) -> dict:
+        headers = {"Content-Type": "application/json"}
+        if self.config.api_key:
+            headers["Authorization"] = f"Bearer {self.config.api_key}"
+        req = urllib.request.Request(self.config.endpoint, data=json.dumps(payload).encode("utf-8"), headers=headers)
+        with urllib.request.urlopen(req, timeout=self.config.timeout) as resp:
+            return json.loads(resp.read())
+
+    async def _complete(self, batch: List[ValidationIssue], sigs: List[str], slots: asyncio.Semaphore) -> Dict[str, Suggestion]:
+        items = [{"id": n, "issue_type": i.issue_type, "rule": i.rule, "message": i.message} for n, i in enumerate(batch)]
+        payload = {
+            "model": self.config.model,
+            "temperature": 0,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(items)},
+            ],
+        }
+        async with slots:
+            for attempt in range(self.config.retries + 1):
+                try:
+                    self.stats["requests"] += 1
+                    reply = await asyncio.to_thread(self._post, payload)
+                    return self._parse(reply, sigs)
+                except (OSError, ValueError, KeyError, IndexError, TypeError):  # HTTP/URL errors, timeouts, bad JSON
+                    if attempt == self.config.retries:
+                        self.stats["failed_batches"] += 1
+                        return {}
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.config.backoff * 2 ** attempt)
+        return {}
+
+    @staticmethod
+    def _parse(reply: dict, sigs: List[str]) -> Dict[str, Suggestion]:
+        content = reply["choices"][0]["message"]["content"].strip()
+        if content.startswith("```"):  # tolerate fenced replies
+            content = content.strip("`").partition("\n")[2]
+        out = {}
+        for item in json.loads(content):
+            n = int(item["id"])
+            if 0 <= n < len(sigs) and item.get("message"):
+                out[sigs[n]] = Suggestion(message=str(item["message"]), example=item.get("example"))
+        return out
+
+    # -- public API ------------------------------------------------------------
+    async def suggest(self, issues: List[ValidationIssue], sigs: Optional[List[str]] = None) -> Dict[str, Suggestion]:
+        """signature -> Suggestion for every signature in `issues` the model answered."""
+        groups: Dict[str, ValidationIssue] = {}
+        for s, i in zip(sigs or map(signature, issues), issues):
+            groups.setdefault(s, i)
+        self.stats["issues"] += len(issues)
+        self.stats["signatures"] += len(groups)
+
+        found = {s: self._memo[s] for s in groups if s in self._memo}
+        missing = [s for s in groups if s not in found]
+        if self.cache and missing:
+            found.update(self.cache.get_many(missing, self.config.model))
+            missing = [s for s in missing if s not in found]
+        self.stats["cache_hits"] += len(groups) - len(missing)
+
+        slots = asyncio.Semaphore(self.config.concurrency)
+        size = self.config.batch_size
+        batches = [missing[k:k + size] for k in range(0, len(missing), size)]
+        answers = await asyncio.gather(*(self._complete([groups[s] for s in b], b, slots) for b in batches))
+        fresh = {s: sug for answer in answers for s, sug in answer.items()}
+        if self.cache and fresh:
+            self.cache.put_many(fresh, self.config.model)
+        found.update(fresh)
+        self._memo.update(found)
+        return found
+
+    def enrich(self, issues: List[ValidationIssue]) -> List[Optional[Suggestion]]:
+        """Attach model suggestions to issues that have none; returns one entry per issue."""
+        pending = [i for i in issues if i.suggestion is None]
+        sigs = [signature(i) for i in pending]
+        started = time.perf_counter()
+        found = asyncio.run(self.suggest(pending, sigs)) if pending else {}
+        self.stats["seconds"] += time.perf_counter() - started
+        for i, s in zip(pending, sigs):
+            i.suggestion = found.get(s)
+        return [i.suggestion for i in issues]
+
+    def close(self) -> None:
+        if self.cache:
+            self.cache.close()
+
+
+_backend: Optional[LLMBackend] = None
+
 def enrich_with_llm(issues):
     if not os.getenv("USE_LLM"):  # gate by env
         return []
-    out = []
-    for i in issues:
-        out.append(Suggestion(message=f"AI hint for {i.issue_type}: check {i.path} — {i.message[:80]}…"))
-    return out
+    global _backend
+    if _backend is None:
+        _backend = LLMBackend()
+    return _backend.enrich(issues)
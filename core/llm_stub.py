@@ -0,0 +1,115 @@
+# core/llm_stub.py
+"""
+Fake chat-completions model for testing the LLM backend offline.
+
+Answers every issue in the prompt with a deterministic suggestion, after an
+optional simulated latency; --fail-rate makes some requests fail with 500 so
+retries can be exercised. GET /stats returns request counters.
+
+    python -m core.llm_stub --port 8799 --latency 0.2
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+import typer
+
+
+def fake_suggestion(item: dict) -> dict:
+    message = item.get("message") or ""
+    if "required property" in message or "Missing child element" in message:
+        fix = "Add the missing field/element required by the schema."
+    elif "is not one of" in message:
+        fix = "Use one of the values allowed by the schema's enum."
+    elif "is not of type" in message:
+        fix = "Change the value to the type the schema expects."
+    else:
+        fix = f"Review the {item.get('issue_type', 'validation')} issue: {message[:60]}"
+    return {"id": item["id"], "message": fix, "example": None}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StubServer"
+
+    def log_message(self, *args) -> None:  # keep test output quiet
+        pass
+
+    def _send(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self._send(200, self.server.stats)
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        stub = self.server
+        with stub.lock:
+            stub.stats["requests"] += 1
+            fail = stub.rng.random() < stub.fail_rate
+            if fail:
+                stub.stats["failures"] += 1
+        if stub.latency:
+            time.sleep(stub.latency)
+        if fail:
+            self._send(500, {"error": "simulated failure"})
+            return
+        items = json.loads(body["messages"][-1]["content"])
+        with stub.lock:
+            stub.stats["items"] += len(items)
+        content = json.dumps([fake_suggestion(item) for item in items])
+        self._send(200, {
+            "id": f"stub-{stub.stats['requests']}", "object": "chat.completion", "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        })
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0, fail_rate: float = 0.0, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "items": 0, "failures": 0}
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+
+def start_stub(port: int = 0, **kwargs) -> StubServer:
+    """Start a stub on a background thread (port 0 = pick a free one); stop with .shutdown()."""
+    server = StubServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(
+    port: int = typer.Option(8799, "--port", help="TCP port to bind"),
+    latency: float = typer.Option(0.0, "--latency", help="Seconds to wait before each reply"),
+    fail_rate: float = typer.Option(0.0, "--fail-rate", help="Share of requests answered with HTTP 500"),
+) -> None:
+    server = StubServer(("127.0.0.1", port), latency=latency, fail_rate=fail_rate)
+    typer.secho(f"LLM stub listening on {server.endpoint}", fg=typer.colors.GREEN, err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    typer.run(main)
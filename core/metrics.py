@@ -0,0 +1,153 @@
+# core/metrics.py
+"""
+Opt-in instrumentation: per-stage timers, counters (files, bytes, issues by
+type) and the slowest files of a run.
+
+Instrumented code reads the module-level `active` collector and does nothing
+when it is None, so with profiling off the cost is one attribute load and a
+test per file or chunk:
+
+    m = metrics.active
+    t = perf_counter() if m else 0.0
+    ...
+    if m:
+        t = m.lap("json.parse", t)
+
+`enable()` installs a collector (the CLI's --profile does this); worker processes
+install their own and ship `drain()` deltas back to be `merge()`d.
+"""
+import heapq
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+_NULL = nullcontext()
+T = TypeVar("T")
+_seq = count()
+
+DEFAULT_SLOWEST = 10
+
+
+class Metrics:
+    def __init__(self, slowest: int = DEFAULT_SLOWEST):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}   # name -> [seconds, calls]
+        self.counters: Counter = Counter()
+        self.issues_by_type: Counter = Counter()
+        self.slowest_n = slowest
+        self._slowest: list = []                    # min-heap of (seconds, seq, entry)
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def lap(self, stage: str, since: float) -> float:
+        """Charge the time since `since` to `stage`; returns now, for the next lap."""
+        now = time.perf_counter()
+        self.add(stage, now - since)
+        return now
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - t0)
+
+    def file_done(self, file: str, kind: str, nbytes: int, seconds: float, issues) -> None:
+        """Record one validated file: counters, issue types and the slowest-N list."""
+        self.counters["files"] += 1
+        self.counters[f"files.{kind}"] += 1
+        self.counters["bytes"] += nbytes
+        self.counters["issues"] += len(issues)
+        self.issues_by_type.update(i.issue_type for i in issues)
+        self._keep_slowest((seconds, next(_seq), {
+            "file": file, "kind": kind, "bytes": nbytes, "seconds": seconds, "issues": len(issues),
+        }))
+
+    def _keep_slowest(self, item: tuple) -> None:
+        if len(self._slowest) < self.slowest_n:
+            heapq.heappush(self._slowest, item)
+        elif item[0] > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def drain(self) -> dict:
+        """A picklable delta of everything recorded so far; the collector is reset."""
+        delta = {
+            "stages": self.stages, "counters": dict(self.counters),
+            "issues_by_type": dict(self.issues_by_type), "slowest": [e for _, _, e in self._slowest],
+        }
+        self.stages, self.counters, self.issues_by_type, self._slowest = {}, Counter(), Counter(), []
+        return delta
+
+    def merge(self, delta: dict) -> None:
+        for stage, (seconds, calls) in delta["stages"].items():
+            self.add(stage, seconds, calls)
+        self.counters.update(delta["counters"])
+        self.issues_by_type.update(delta["issues_by_type"])
+        for entry in delta["slowest"]:
+            self._keep_slowest((entry["seconds"], next(_seq), entry))
+
+    def to_dict(self, **extra) -> dict:
+        wall = time.perf_counter() - self.started
+        stages = sorted(self.stages.items(), key=lambda kv: kv[1][0], reverse=True)
+        return {
+            "wall_seconds": wall,
+            "stages": {k: {"seconds": s, "calls": c} for k, (s, c) in stages},
+            "counters": dict(self.counters),
+            "issues_by_type": dict(self.issues_by_type.most_common()),
+            "slowest_files": [e for _, _, e in sorted(self._slowest, reverse=True)],
+            **extra,
+        }
+
+    def write(self, path: str, **extra) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(**extra), f, indent=2)
+
+
+active: Optional[Metrics] = None
+
+
+def enable(slowest: int = DEFAULT_SLOWEST) -> Metrics:
+    global active
+    active = Metrics(slowest)
+    return active
+
+
+def disable() -> None:
+    global active
+    active = None
+
+
+def stage(name: str):
+    """`with metrics.stage("render"):` — a timer when profiling, a no-op otherwise."""
+    return active.timer(name) if active is not None else _NULL
+
+
+def timed(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    """Charge the time spent producing each item of a lazy `iterable` to stage `name`."""
+    m = active
+    if m is None:
+        return iterable
+
+    def gen() -> Iterator[T]:
+        it = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                m.lap(name, started)
+                return
+            m.lap(name, started)
+            yield item
+
+    return gen()
@@ -1,6 +1,8 @@
 # core/models.py
 
-from dataclasses import dataclass, field
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from sys import intern
 from typing import Optional, List
 from uuid import uuid4
 
@@ -9,30 +11,127 @@ class Suggestion:
     message: str
     example: Optional[str] = None
 
-@dataclass
+
+def _intern(s: Optional[str]) -> Optional[str]:
+    return intern(s) if type(s) is str else s
+
+
 class ValidationIssue:
-    issue_type: str
-    severity: str
-    path: str
-    message: str
-    rule: Optional[str] = None
-    suggestion: Optional[Suggestion] = None
-    id: str = field(default_factory=lambda: uuid4().hex[:8])
+    """
+    One validation finding. Slotted rather than a dataclass so that reports with
+    millions of issues stay small: issue_type/severity/rule are interned, and the
+    id is only generated the first time it is read.
+    """
+    __slots__ = ("issue_type", "_severity", "path", "message", "rule", "suggestion", "_id", "line")
+    # Bumped whenever a severity is changed after construction, so cached report counts notice
+    severity_edits = 0
+
+    def __init__(
+        self,
+        issue_type: str,
+        severity: str,
+        path: str,
+        message: str,
+        rule: Optional[str] = None,
+        suggestion: Optional[Suggestion] = None,
+        id: Optional[str] = None,
+        line: Optional[int] = None,
+    ):
+        self.issue_type = _intern(issue_type)
+        self._severity = _intern(severity)
+        self.path = path
+        self.message = message
+        self.rule = _intern(rule)
+        self.suggestion = suggestion
+        self._id = id
+        self.line = line
+
+    @property
+    def severity(self) -> str:
+        return self._severity
+
+    @severity.setter
+    def severity(self, value: str) -> None:
+        self._severity = _intern(value)
+        ValidationIssue.severity_edits += 1
+
+    @property
+    def id(self) -> str:
+        if self._id is None:
+            self._id = uuid4().hex[:8]
+        return self._id
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._id = value
+
+    def _fields(self) -> tuple:
+        return (self.issue_type, self.severity, self.path, self.message, self.rule, self.suggestion, self.id, self.line)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        return (
+            f"ValidationIssue(issue_type={self.issue_type!r}, severity={self.severity!r}, path={self.path!r}, "
+            f"message={self.message!r}, rule={self.rule!r}, suggestion={self.suggestion!r}, "
+            f"id={self.id!r}, line={self.line!r})"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "issue_type": self.issue_type, "severity": self.severity, "path": self.path,
+            "message": self.message, "rule": self.rule,
+            "suggestion": asdict(self.suggestion) if self.suggestion else None,
+            "id": self.id, "line": self.line,
+        }
 
 @dataclass
 class ValidationReport:
     file: str
     issues: List[ValidationIssue]
+    # Validation stopped early (--max-errors / --fail-fast budget): more issues may exist
+    truncated: bool = False
+    # (length, severity edits) -> severity counts; dropped when `issues` is replaced
+    _counts: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value) -> None:
+        if name == "issues":
+            object.__setattr__(self, "_counts", None)
+        object.__setattr__(self, name, value)
+
+    def _severity_counts(self) -> Counter:
+        key = (len(self.issues), ValidationIssue.severity_edits)
+        if self._counts is None or self._counts[0] != key:
+            self._counts = (key, Counter(i._severity for i in self.issues))
+        return self._counts[1]
 
     @property
     def error_count(self) -> int:
-        return sum(1 for i in self.issues if i.severity == "error")
+        return self._severity_counts()["error"]
 
     @property
     def warning_count(self) -> int:
-        return sum(1 for i in self.issues if i.severity == "warning")
+        return self._severity_counts()["warning"]
 
     @property
     def passed(self) -> bool:
         # ✅ add this
         return self.error_count == 0
+
+    def to_dict(self) -> dict:
+        return {"file": self.file, "issues": [i.to_dict() for i in self.issues], "truncated": self.truncated}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValidationReport":
+        issues = []
+        for d in data["issues"]:
+            d = dict(d)
+            if d.get("suggestion"):
+                d["suggestion"] = Suggestion(**d["suggestion"])
+            issues.append(ValidationIssue(**d))
+        return cls(file=data["file"], issues=issues, truncated=data.get("truncated", False))
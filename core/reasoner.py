@@ -1,39 +1,17 @@
-from typing import List
+from typing import List, Optional
 from collections import defaultdict
-from core.models import ValidationIssue, Suggestion, ValidationReport
+from functools import lru_cache
+from core.models import ValidationIssue, ValidationReport
+from core.rulepack import DEFAULT_RULE_PACK, RulePack, load_rule_pack
 
-COMMON_PATTERNS = [
-    # (predicate, suggestion builder)
-    (
-        lambda i: "Namespace" in i.message or "xmlns" in i.message,
-        lambda i: Suggestion(
-            message="Add the correct PDS4 namespace on the root element.",
-            example='<Product_Observational xmlns="http://pds.nasa.gov/pds4/pds/v1">…</Product_Observational>'
-        )
-    ),
-    (
-        lambda i: "is not a valid value" in i.message and "unit" in i.message,
-        lambda i: Suggestion(
-            message="Replace with a valid unit from the PDS Units of Measure dictionary.",
-            example='<value unit="K">120.3</value>'
-        )
-    ),
-    (
-        lambda i: "is a required property" in i.message or "Missing child element" in i.message,
-        lambda i: Suggestion(
-            message="Add the required field/element according to the schema.",
-            example='… "title": "Mars image 123" …'
-        )
-    ),
-]
+@lru_cache(maxsize=None)
+def default_rule_pack() -> RulePack:
+    """The bundled rule pack (core/suggestions.yaml), compiled once per process."""
+    return load_rule_pack(str(DEFAULT_RULE_PACK))
 
-def enrich_with_suggestions(issues: List[ValidationIssue]) -> None:
-    """Attach a Suggestion to issues that match common patterns."""
-    for i in issues:
-        for pred, build in COMMON_PATTERNS:
-            if pred(i) and i.suggestion is None:
-                i.suggestion = build(i)
-                break
+def enrich_with_suggestions(issues: List[ValidationIssue], pack: Optional[RulePack] = None) -> None:
+    """Attach a Suggestion to issues that match a rule of `pack` (default: the bundled pack)."""
+    (pack or default_rule_pack()).enrich(issues)
 
 def summarize(report: ValidationReport) -> str:
     """Produce a human-friendly summary for the report."""
@@ -47,7 +25,8 @@ def summarize(report: ValidationReport) -> str:
         )
         buckets[key].append(i)
 
-    parts = [f"{report.file}: {report.error_count} error(s), {report.warning_count} warning(s)."]
+    parts = [f"{report.file}: {report.error_count} error(s), {report.warning_count} warning(s)."
+             + (" (truncated)" if report.truncated else "")]
     for k, vals in buckets.items():
         sample = vals[0]
         parts.append(f"- {k}: {len(vals)} issue(s). Example @ {sample.path}: {sample.message}")
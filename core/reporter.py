@@ -1,15 +1,132 @@
 # aiops_validator/core/reporter.py
-from jinja2 import Environment, FileSystemLoader
-from core.models import ValidationReport
+import json
+import os
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
 
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from core.models import ValidationIssue, ValidationReport
+from valmods import __version__
 
-env = Environment(loader=FileSystemLoader("templates"), autoescape=True)
 
-def to_markdown(report: ValidationReport) -> str:
+TEMPLATE_DIR = Path(__file__).with_name("templates")
+
+# Compiled templates are cached as bytecode (keyed by source checksum), so a
+# one-file run skips lexing/compiling them; AIOPS_TEMPLATE_CACHE picks the directory.
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True, auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(os.environ.get("AIOPS_TEMPLATE_CACHE")),
+)
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+_SARIF_LEVELS = {"error": "error", "warning": "warning"}
+
+
+def _capped(report: ValidationReport, max_issues: Optional[int]) -> Tuple[Iterable[ValidationIssue], Counter]:
+    """The issues to render, plus per-type counts of the ones left out ("N more")."""
+    if max_issues is None or len(report.issues) <= max_issues:
+        return report.issues, Counter()
+    hidden = Counter(i.issue_type for i in islice(report.issues, max_issues, None))
+    return islice(report.issues, max_issues), hidden
+
+
+def _context(report: ValidationReport, max_issues: Optional[int]) -> dict:
+    issues, hidden = _capped(report, max_issues)
+    return {"report": report, "issues": issues, "hidden": hidden}
+
+
+def to_markdown(report: ValidationReport, max_issues: Optional[int] = None) -> str:
     tpl = env.get_template("report.md.j2")
-    return tpl.render(report=report)
+    return tpl.render(**_context(report, max_issues))
 
-def to_html(report: ValidationReport) -> str:
+def to_html(report: ValidationReport, max_issues: Optional[int] = None) -> str:
     tpl = env.get_template("report.html.j2")
-    return tpl.render(report=report)
+    return tpl.render(**_context(report, max_issues))
+
+
+# Streaming writers: templates are rendered with generate() straight into `fh`,
+# so no full report string is ever built.
+
+def write_markdown(report: ValidationReport, fh: IO[str], max_issues: Optional[int] = None) -> None:
+    fh.writelines(env.get_template("report.md.j2").generate(**_context(report, max_issues)))
+
+def write_html(report: ValidationReport, fh: IO[str], max_issues: Optional[int] = None) -> None:
+    fh.writelines(env.get_template("report.html.j2").generate(**_context(report, max_issues)))
+
+
+def write_index(
+    reports: Iterable[ValidationReport], fh: IO[str], fmt: str = "md", max_issues: Optional[int] = None
+) -> List[dict]:
+    """
+    Write one combined report (fmt "md" or "html") for all `reports`, consuming
+    them lazily; ends with a summary table. Returns the summary rows.
+    """
+    summary: List[dict] = []
+
+    def entries() -> Iterator[dict]:
+        for report in reports:
+            yield _context(report, max_issues)
+            summary.append({
+                "file": report.file, "passed": report.passed, "truncated": report.truncated,
+                "errors": report.error_count, "warnings": report.warning_count,
+            })
+
+    tpl = env.get_template(f"index.{fmt}.j2")
+    fh.writelines(tpl.generate(entries=entries(), summary=summary))
+    return summary
+
+
+def write_jsonl(report: ValidationReport, fh: IO[str]) -> None:
+    """One JSON object per issue (with the file name), for downstream tools."""
+    for i in report.issues:
+        fh.write(json.dumps({"file": report.file, **i.to_dict()}))
+        fh.write("\n")
+
+
+class SarifWriter:
+    """
+    Streams a SARIF 2.1.0 log: results are written as reports are added and the
+    tool/rules section, which depends on every issue type seen, goes last.
+    """
+
+    def __init__(self, fh: IO[str]):
+        self.fh = fh
+        self.rules: dict = {}
+        self.truncated: List[str] = []  # files whose validation stopped at an error budget
+        self._first = True
+        fh.write(f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": "2.1.0", "runs": [{{"results": [')
+
+    def add(self, report: ValidationReport) -> None:
+        if report.truncated:
+            self.truncated.append(report.file)
+        for i in report.issues:
+            self.rules.setdefault(i.issue_type, i.rule)
+            location = {"physicalLocation": {"artifactLocation": {"uri": report.file}}}
+            if i.line:
+                location["physicalLocation"]["region"] = {"startLine": i.line}
+            if i.path:
+                location["logicalLocations"] = [{"fullyQualifiedName": i.path}]
+            result = {
+                "ruleId": i.issue_type,
+                "level": _SARIF_LEVELS.get(i.severity, "note"),
+                "message": {"text": i.message},
+                "locations": [location],
+            }
+            if i.suggestion:
+                result["properties"] = {"suggestion": i.suggestion.message, "example": i.suggestion.example}
+            self.fh.write(("" if self._first else ", ") + json.dumps(result))
+            self._first = False
+
+    def close(self) -> None:
+        rules = [{"id": rid, "shortDescription": {"text": rule or rid}} for rid, rule in self.rules.items()]
+        driver = {"name": "aiops-data-validator", "version": __version__, "rules": rules}
+        props = f', "properties": {json.dumps({"truncatedFiles": self.truncated})}' if self.truncated else ""
+        self.fh.write(f'], "tool": {{"driver": {json.dumps(driver)}}}{props}}}]}}\n')
+
+    def __enter__(self) -> "SarifWriter":
+        return self
 
+    def __exit__(self, *exc) -> None:
+        self.close()
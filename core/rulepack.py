@@ -0,0 +1,164 @@
+# core/rulepack.py
+"""
+Declarative suggestion rules, compiled into an index.
+
+A rule pack is a YAML file with a `rules:` list:
+
+    rules:
+      - id: pds4-unit
+        issue_types: [XSD-VALIDATION]     # optional: only these issue types
+        rules: ["normalize-space(Title) != ''"]   # optional: only issues with this `rule`
+        any: ["unit", "units"]            # message contains at least one of these
+        all: ["is not a valid value"]     # ... and every one of these
+        regex: "attribute 'unit'"         # ... and matches this (re.search)
+        suggestion:
+          message: Replace with a valid unit from the PDS Units of Measure dictionary.
+          example: '<value unit="K">120.3</value>'
+
+Rules are tried in file order and the first match wins, as with the old
+predicate list. Instead of testing every rule, all `any`/`all` literals are
+found in one regex pass over the message (a lookahead over a prefix-trie
+alternation of every literal); only rules keyed by a literal that
+occurs (plus rules without literals) are then checked. Each rule owns a single
+Suggestion instance that is shared by every issue it matches, so treat
+attached suggestions as read-only.
+"""
+import re
+from collections import Counter
+from pathlib import Path
+from sys import intern
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Tuple
+
+import yaml
+
+from core.models import Suggestion, ValidationIssue
+
+DEFAULT_RULE_PACK = Path(__file__).with_name("suggestions.yaml")
+_RULE_KEYS = {"id", "issue_types", "rules", "any", "all", "regex", "suggestion"}
+# Memoized (issue_type, rule, message) -> match; cleared when it grows past this
+_MEMO_SIZE = 100_000
+
+
+def _trie_regex(terms: List[str]) -> str:
+    """
+    Regex alternation of `terms` factored into a prefix trie ("orbit_1|orbit_2" ->
+    "orbit_(?:1|2)"). Python's re tries alternatives one by one, so a flat list of
+    hundreds of literals is slow; the trie fails on the first mismatching char.
+    Optional groups are greedy, so the longest literal at a position wins.
+    """
+    trie: dict = {}
+    for t in terms:
+        node = trie
+        for ch in t:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class CompiledRule(NamedTuple):
+    index: int
+    id: str
+    issue_types: Optional[FrozenSet[str]]
+    rules: Optional[FrozenSet[str]]
+    any: FrozenSet[int]   # literal ids
+    all: FrozenSet[int]
+    regex: Optional[Pattern]
+    suggestion: Suggestion
+
+
+class RulePack:
+    def __init__(self, rules: List[dict], source: str = "<rules>"):
+        self.source = source
+        term_ids: Dict[str, int] = {}
+        compiled: List[CompiledRule] = []
+        for n, r in enumerate(rules):
+            unknown = set(r) - _RULE_KEYS
+            if unknown or not isinstance(r.get("suggestion"), dict) or "message" not in r["suggestion"]:
+                raise ValueError(f"{source}: rule #{n} needs suggestion.message (unknown keys: {sorted(unknown)})")
+            ids = lambda key: frozenset(term_ids.setdefault(str(t), len(term_ids)) for t in r.get(key) or [])
+            opt = lambda key: frozenset(r[key]) if r.get(key) else None
+            compiled.append(CompiledRule(
+                index=n,
+                id=str(r.get("id") or f"rule-{n}"),
+                issue_types=opt("issue_types"),
+                rules=opt("rules"),
+                any=ids("any"),
+                all=ids("all"),
+                regex=re.compile(r["regex"]) if r.get("regex") else None,
+                suggestion=Suggestion(intern(r["suggestion"]["message"]), r["suggestion"].get("example")),
+            ))
+        self.rules = compiled
+        self.terms = list(term_ids)
+
+        # One lookahead per position reports the longest literal starting there; the
+        # shorter literals it contains are implied, which makes the scan complete.
+        self._scanner = re.compile(f"(?=({_trie_regex(self.terms)}))") if self.terms else None
+        self._implied = {t: frozenset(j for j, u in enumerate(self.terms) if u in t) for t in self.terms}
+        # literal id -> rules keyed by it; rules without literals are always candidates
+        self._by_term: List[List[CompiledRule]] = [[] for _ in self.terms]
+        self._unkeyed: List[CompiledRule] = []
+        for rule in compiled:
+            keys = rule.any | rule.all
+            for t in keys:
+                self._by_term[t].append(rule)
+            if not keys:
+                self._unkeyed.append(rule)
+
+        self._memo: Dict[Tuple, Optional[CompiledRule]] = {}
+        self.hits: Counter = Counter()
+
+    def _literals(self, message: str) -> FrozenSet[int]:
+        if self._scanner is None:
+            return frozenset()
+        seen = {m.group(1) for m in self._scanner.finditer(message)}
+        return frozenset().union(*(self._implied[t] for t in seen))
+
+    def match(self, issue: ValidationIssue) -> Optional[CompiledRule]:
+        """The first rule (in pack order) that matches `issue`, or None."""
+        key = (issue.issue_type, issue.rule, issue.message)
+        if key in self._memo:
+            return self._memo[key]
+        found = self._literals(issue.message)
+        candidates = {r.index: r for t in found for r in self._by_term[t]}
+        candidates.update((r.index, r) for r in self._unkeyed)
+        result = None
+        for n in sorted(candidates):
+            r = candidates[n]
+            if r.issue_types is not None and issue.issue_type not in r.issue_types:
+                continue
+            if r.rules is not None and issue.rule not in r.rules:
+                continue
+            if (r.any and r.any.isdisjoint(found)) or not r.all <= found:
+                continue
+            if r.regex is not None and not r.regex.search(issue.message):
+                continue
+            result = r
+            break
+        if len(self._memo) >= _MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = result
+        return result
+
+    def enrich(self, issues: List[ValidationIssue]) -> None:
+        """Attach the shared Suggestion of the first matching rule to issues that have none."""
+        for i in issues:
+            if i.suggestion is None:
+                r = self.match(i)
+                if r is not None:
+                    i.suggestion = r.suggestion
+                    self.hits[r.id] += 1
+
+
+def load_rule_pack(path: str) -> RulePack:
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    rules = data.get("rules", []) if isinstance(data, dict) else data
+    return RulePack(rules, source=str(path))
@@ -15,3 +15,42 @@ def test_xml_validator():
     v = XMLValidator(xsd_path=xsd)
     issues = v.validate(file)
     assert len(issues) >= 1
+
+def test_json_lines_and_streamed_array(tmp_path):
+    records = ['{"title": "a", "instrument": "MAG"}', '{"title": "b"}', '{"title": 3, "instrument": "IMG"}']
+    (tmp_path / "t.jsonl").write_text("\n".join(records) + "\n")
+    v = JSONValidator("schemas/sample.schema.json")
+    issues = v.validate_lines(str(tmp_path / "t.jsonl"))
+    assert [(i.path, i.line) for i in issues] == [("1", 2), ("2.title", 3)]
+    assert v.last_stats["records"] == 3
+
+    (tmp_path / "array.schema.json").write_text(
+        '{"type": "array", "items": {"$ref": "#/$defs/rec"}, "$defs": {"rec": {"type": "object", "required": ["title"]}}}'
+    )
+    (tmp_path / "a.json").write_text("[" + ", ".join(["{\"title\": 1}"] * 5 + ["{}", "7"]) + "]")
+    streamed = JSONValidator(str(tmp_path / "array.schema.json"), stream_threshold=0)
+    loaded = JSONValidator(str(tmp_path / "array.schema.json"))
+    expected = [(i.path, i.message) for i in loaded.validate(str(tmp_path / "a.json"))]
+    assert [(i.path, i.message) for i in streamed.validate(str(tmp_path / "a.json"))] == expected
+    assert streamed.last_stats["records"] == 7
+
+def test_iter_array_across_buffer_edges(monkeypatch):
+    import io, json
+    from valmods import json_validator
+    monkeypatch.setattr(json_validator, "_READ_SIZE", 2)
+    text = ' [1, 22 , {"a": [1, 2]}, "x,]", 333, -4.5e3 ] '
+    assert list(json_validator._iter_array(io.StringIO(text))) == json.loads(text)
+
+def test_json_max_errors_budget(tmp_path):
+    v = JSONValidator("schemas/sample.schema.json", max_errors=1)
+    assert len(v.validate("examples/bad_sample.json")) == 1 and v.last_truncated
+    (tmp_path / "t.jsonl").write_text('{"title": 1}\n{"title": 2}\n{"title": 3}\n')
+    assert [i.line for i in v.validate_lines(str(tmp_path / "t.jsonl"))] == [1]
+    assert v.last_truncated and v.last_stats["records"] == 1  # reading stopped at the budget
+    assert JSONValidator("schemas/sample.schema.json", max_errors=5).validate("examples/bad_sample.json")
+
+def test_malformed_json_is_an_issue(tmp_path):
+    (tmp_path / "broken.json").write_text('{"title": "a",\n "instrument": }\n')
+    v = JSONValidator("schemas/sample.schema.json")
+    for issues in (v.validate(str(tmp_path / "broken.json")), v.validate_bytes(b'{"title": "a",\n "instrument": }')):
+        assert [(i.issue_type, i.path, i.line) for i in issues] == [("JSON-PARSE", "$", 2)]
@@ -0,0 +1,28 @@
+from benchmarks.compare import compare
+from benchmarks.corpus import CorpusSpec, generate
+from valmods.runner import run_validation
+
+
+def _snapshot(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def test_corpus_is_deterministic_and_has_failures(tmp_path):
+    spec = CorpusSpec(xml=20, json=20, csv=1, xml_kb=1, csv_rows=200, error_rate=0.3, seed=7)
+    a, b = generate(tmp_path / "a", spec), generate(tmp_path / "b", spec)
+    assert _snapshot(a) == _snapshot(b)
+
+    results = run_validation(
+        str(a), xsd_path="schemas/minimal.xsd", json_schema_path="schemas/sample.schema.json",
+        csv_schema_path="schemas/csv.schema.yaml", schematron_path="schemas/minimal.sch",
+    )
+    assert len(results) == 41
+    failed = [r for _, r in results if not r.passed]
+    assert 0 < len(failed) < 41
+
+
+def test_compare_flags_regressions():
+    base = {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}
+    head = {"a": {"seconds": 1.05}, "b": {"seconds": 1.5}, "c": {"seconds": 1.0}}
+    rows = {name: regressed for name, _, _, _, regressed in compare(base, head, threshold=0.1)}
+    assert rows == {"a": False, "b": True}
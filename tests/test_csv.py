@@ -1,6 +1,109 @@
+import pytest
+
 from valmods.csv_validator import CSVValidator
 
 def test_csv_validator_good_bad():
     v = CSVValidator("schemas/csv.schema.yaml")
     assert v.validate("examples/good.csv") == []
     assert len(v.validate("examples/bad.csv")) > 0
+
+def test_csv_chunked_matches_in_memory():
+    whole = CSVValidator("schemas/csv.schema.yaml")
+    chunked = CSVValidator("schemas/csv.schema.yaml", chunksize=1)
+    for f in ("examples/good.csv", "examples/bad.csv"):
+        expected = [(i.issue_type, i.path, i.message) for i in whole.validate(f)]
+        assert [(i.issue_type, i.path, i.message) for i in chunked.validate(f)] == expected
+
+RULES_YAML = """
+required_columns: [id, code, kind, start, stop, obs_date, units]
+rules:
+  - {kind: unique, column: id}
+  - {kind: regex, column: code, pattern: "[A-Z]{3}-\\\\d+"}
+  - {kind: enum, column: kind, values: [IMG, MAG]}
+  - {kind: compare, column: start, op: le, other: stop}
+  - {kind: date_range, column: obs_date, min: "2020-01-01", max: "2030-12-31"}
+  - {kind: nonempty, column: units, when: {column: kind, equals: MAG}}
+"""
+
+RULES_CSV = """id,code,kind,start,stop,obs_date,units
+1,ABC-1,IMG,1,2,2021-05-01,
+2,abc-2,MAG,5,3,2019-01-01,nT
+2,XYZ-3,RAW,1,1,not-a-date,
+"""
+
+def test_csv_rule_engine(tmp_path):
+    (tmp_path / "s.yaml").write_text(RULES_YAML)
+    (tmp_path / "t.csv").write_text(RULES_CSV)
+    for chunksize in (None, 1):
+        v = CSVValidator(str(tmp_path / "s.yaml"), chunksize=chunksize)
+        got = {i.rule: i.message for i in v.validate(str(tmp_path / "t.csv"))}
+        assert got["unique"].endswith("(1 row(s): 2)")
+        assert got["regex"].endswith("(1 row(s): 1)")
+        assert got["enum"].endswith("(1 row(s): 2)")
+        assert got["compare"].endswith("(1 row(s): 1)")
+        assert got["date_range"].endswith("(2 row(s): 1, 2)")
+        assert "nonempty" not in got  # only MAG rows need units
+
+def test_csv_arrow_engine_matches_pandas(tmp_path):
+    (tmp_path / "s.yaml").write_text(RULES_YAML + "engine: arrow\nblock_size: 64\n")
+    (tmp_path / "t.csv").write_text(RULES_CSV)
+    expected = [(i.rule, i.message) for i in CSVValidator(str(tmp_path / "s.yaml"), engine="pandas").validate(str(tmp_path / "t.csv"))]
+    for chunksize in (None, 1):  # whole file / 64-byte streamed blocks
+        v = CSVValidator(str(tmp_path / "s.yaml"), chunksize=chunksize)
+        assert [(i.rule, i.message) for i in v.validate(str(tmp_path / "t.csv"))] == expected
+    arrow = CSVValidator("schemas/csv.schema.yaml", engine="arrow")
+    assert arrow.validate("examples/good.csv") == []
+    assert [i.message for i in arrow.validate("examples/bad.csv")][0] == "id expected int (1 row(s): 1)"
+
+def test_csv_arrow_type_violations(tmp_path):
+    (tmp_path / "s.yaml").write_text("engine: arrow\nblock_size: 64\ntypes: {n: int, x: float, ok: bool, d: date, s: str}\n")
+    rows = ["1,1.5,true,2021-05-01,a", "NA,,,,", "2.5,x,yes,2021-13-01,b", " 7 ,1e3,0,2021-05-02,c",
+            "99999999999999999999,inf,1,bad,d", "-3,-Infinity,FALSE,2021-05-03,e", "x,.5,False,2021-05-04,f"]
+    (tmp_path / "t.csv").write_text("n,x,ok,d,s,unused\n" + "\n".join(r + ",z" for r in rows) + "\n")
+    for chunksize in (None, 1):
+        v = CSVValidator(str(tmp_path / "s.yaml"), chunksize=chunksize)
+        got = {i.path: i.message for i in v.validate(str(tmp_path / "t.csv"))}
+        assert got == {
+            "$.n": "n expected int (3 row(s): 2, 4, 6)",
+            "$.x": "x expected float (1 row(s): 2)",
+            "$.ok": "ok expected bool (1 row(s): 2)",
+            "$.d": "d expected date (2 row(s): 2, 4)",
+        }
+
+def test_csv_max_errors_budget():
+    for engine in ("pandas", "arrow"):
+        for chunksize in (None, 1):
+            v = CSVValidator("schemas/csv.schema.yaml", chunksize=chunksize, engine=engine, max_errors=2)
+            issues = v.validate("examples/bad.csv")
+            assert len(issues) == 2 and v.last_truncated
+            assert v.validate("examples/good.csv") == [] and not v.last_truncated
+
+def test_csv_rule_kinds_and_columns_are_checked(tmp_path):
+    (tmp_path / "typo.yaml").write_text("rules:\n  - {kind: regx, column: code, pattern: x}\n")
+    with pytest.raises(ValueError, match="rule #0 .* one of"):
+        CSVValidator(str(tmp_path / "typo.yaml"))
+    (tmp_path / "s.yaml").write_text("required_columns: [id]\nrules:\n  - {kind: unique, column: id}\n"
+                                     "  - {kind: compare, column: start, other: stop}\n")
+    (tmp_path / "t.csv").write_text("id,start\n1,2\n")
+    for engine in ("pandas", "arrow"):
+        issues = CSVValidator(str(tmp_path / "s.yaml"), engine=engine).validate(str(tmp_path / "t.csv"))
+        assert [(i.issue_type, i.rule, i.message) for i in issues] == [
+            ("CSV-MISSING-COLUMN", "compare", "Missing column for compare rule on start: stop")]
+
+def test_csv_arrow_signed_ints_in_the_string_pass(tmp_path):
+    # the bad float fails the typed read; the string pass must still accept "+2" and in-range 19-digit ints
+    (tmp_path / "s.yaml").write_text("engine: arrow\ntypes: {id: int, x: float}\n")
+    (tmp_path / "t.csv").write_text("id,x\n1,1.5\n+2,oops\n3,2\n+9223372036854775807,3\n-9223372036854775809,4\n")
+    got = {i.path: i.message for i in CSVValidator(str(tmp_path / "s.yaml")).validate(str(tmp_path / "t.csv"))}
+    assert got == {"$.id": "id expected int (1 row(s): 4)", "$.x": "x expected float (1 row(s): 1)"}
+
+def test_csv_compare_counts_values_it_cannot_compare(tmp_path):
+    (tmp_path / "s.yaml").write_text("rules:\n  - {kind: compare, column: start, op: le, other: stop}\n"
+                                     "  - {kind: compare, column: t0, op: lt, other: t1, format: \"%Y-%m-%d\"}\n")
+    (tmp_path / "t.csv").write_text("start,stop,t0,t1\n1,2,2021-01-01,2021-01-02\n3,abc,2021-01-03,2021-01-02\n"
+                                    "5,4,2021-01-01,soon\n,x,,\n")
+    for engine in ("pandas", "arrow"):
+        for chunksize in (None, 1):
+            v = CSVValidator(str(tmp_path / "s.yaml"), engine=engine, chunksize=chunksize)
+            assert [i.message for i in v.validate(str(tmp_path / "t.csv"))] == [
+                "start not <= stop (2 row(s): 1, 2)", "t0 not < t1 (2 row(s): 1, 2)"]
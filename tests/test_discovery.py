@@ -0,0 +1,54 @@
+import pytest
+
+from valmods.discovery import discover, parse_shard
+from valmods.runner import run_validation
+
+KINDS = {"xml", "json", "jsonl", "csv"}
+
+
+def _tree(root):
+    files = {
+        "a/one.xml": 10, "a/two.json": 300, "a/skip.img": 5000,
+        "a/raw/three.xml": 20, "b/.git/config.json": 1, "b/four.csv": 200, "b/five.json.bak": 1,
+    }
+    for rel, size in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(b"x" * size)
+    return root
+
+
+def _rel(root, paths):
+    return [p.relative_to(root).as_posix() for p in paths]
+
+
+def test_filters_prune_and_order(tmp_path):
+    root = _tree(tmp_path)
+    found = _rel(root, discover(str(root), kinds=KINDS, exclude=[".git", "a/raw"], order="path"))
+    assert found == ["a/one.xml", "a/two.json", "b/four.csv"]
+    assert _rel(root, discover(str(root), kinds=KINDS, include=["*.xml"], order="path")) == ["a/one.xml", "a/raw/three.xml"]
+    largest = _rel(root, discover(str(root), kinds=KINDS, exclude=[".git"], order="size"))
+    assert largest == ["a/two.json", "b/four.csv", "a/raw/three.xml", "a/one.xml"]
+    threaded = _rel(root, discover(str(root), kinds=KINDS, threads=4))
+    assert sorted(threaded) == sorted(_rel(root, discover(str(root), kinds=KINDS)))
+
+
+def test_shards_partition_the_tree(tmp_path):
+    root = _tree(tmp_path)
+    everything = set(_rel(root, discover(str(root), kinds=KINDS)))
+    parts = [set(_rel(root, discover(str(root), kinds=KINDS, shard=(i, 3)))) for i in (1, 2, 3)]
+    assert set().union(*parts) == everything and sum(map(len, parts)) == len(everything)
+    assert parse_shard("2/3") == (2, 3)
+    for bad in ("0/3", "4/3", "x", "1/2/3"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_pool_streams_in_size_order():
+    kwargs = dict(xsd_path="schemas/minimal.xsd", json_schema_path="schemas/sample.schema.json",
+                  csv_schema_path="schemas/csv.schema.yaml", schematron_path="schemas/minimal.sch")
+    serial = run_validation("examples", order="size", **kwargs)
+    parallel = run_validation("examples", workers=2, chunksize=1, order="size", **kwargs)
+    assert [str(p) for p, _ in parallel] == [str(p) for p, _ in serial]
+    assert [r.error_count for _, r in parallel] == [r.error_count for _, r in serial]
+    assert len(serial) == 5 and not run_validation("examples", exclude=["*"], **kwargs)
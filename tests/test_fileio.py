@@ -0,0 +1,44 @@
+import json
+import re
+
+from valmods.fileio import TextReader, open_input
+from valmods.json_validator import JSONValidator
+from valmods.xml_validator import XMLValidator
+
+
+def test_small_files_are_read_and_large_ones_mapped(tmp_path):
+    p = tmp_path / "doc.json"
+    p.write_text('{"title": "é"}', encoding="utf-8")
+    with open_input(str(p)) as small, open_input(str(p), mmap_threshold=0) as mapped:
+        assert not small.mapped and mapped.mapped
+        assert small.text() == mapped.text() == '{"title": "é"}'
+        assert mapped.stream().read(1) == b"{" and mapped.stream().read(1) == b"{"  # rewound each time
+    assert mapped.data.closed
+
+
+def test_text_reader_keeps_split_characters_whole(tmp_path):
+    p = tmp_path / "t.txt"
+    p.write_text("aé" * 10, encoding="utf-8")
+    with open_input(str(p), mmap_threshold=0) as src:
+        reader = src.text_stream()
+        parts = iter(lambda: reader.read(2), "")
+        assert "".join(parts) == "aé" * 10
+    assert isinstance(reader, TextReader)
+
+
+def test_validators_agree_on_mapped_and_read_inputs(tmp_path):
+    label = tmp_path / "label.xml"
+    label.write_text("<Product>\n  <Title></Title>\n</Product>\n", encoding="utf-8")
+    broken = tmp_path / "broken.xml"
+    broken.write_text("<Product>\n<Title>x</Titl>\n</Product>\n", encoding="utf-8")
+    doc = tmp_path / "doc.json"
+    doc.write_text(json.dumps({"title": "x", "instrument": "UNKNOWN"}), encoding="utf-8")
+
+    def issues(threshold):
+        xml = XMLValidator("schemas/minimal.xsd", schematron_path="schemas/minimal.sch", mmap_threshold=threshold)
+        js = JSONValidator("schemas/sample.schema.json", mmap_threshold=threshold)
+        found = xml.validate(str(label)) + xml.validate(str(broken)) + js.validate(str(doc))
+        return [(i.issue_type, i.path, re.sub(r" at 0x[0-9a-f]+", "", i.message), i.line) for i in found]
+
+    assert issues(None) == issues(0)
+    assert [t for t, *_ in issues(0)] == ["XSD-VALIDATION", "SCHEMATRON", "XML-PARSE", "JSON-SCHEMA"]
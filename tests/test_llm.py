@@ -0,0 +1,57 @@
+from core.llm import LLMBackend, LLMConfig, enrich_with_llm, signature
+from core.llm_stub import start_stub
+from core.models import ValidationIssue
+
+
+def _issues():
+    # 6 issues, 3 signatures: numbers and addresses are masked, field names are not
+    return [
+        ValidationIssue("JSON-SCHEMA", "error", f"{k}", "'title' is a required property") for k in range(3)
+    ] + [
+        ValidationIssue("XSD-VALIDATION", "error", "/P", f"Unexpected child at position {k} <Element P at 0x{k}f>")
+        for k in range(2)
+    ] + [ValidationIssue("JSON-SCHEMA", "error", "0", "'instrument' is a required property")]
+
+
+def test_signature_normalization():
+    a, b, c, d, e, f = _issues()
+    assert signature(a) == signature(b) and signature(d) == signature(e)
+    assert signature(a) != signature(f)
+
+
+def test_backend_dedupes_batches_retries_and_caches(tmp_path, monkeypatch):
+    stub = start_stub(fail_rate=0.3, seed=1)
+    config = LLMConfig(endpoint=stub.endpoint, cache_path=str(tmp_path / "llm.sqlite"),
+                       batch_size=2, concurrency=2, retries=6, backoff=0)
+    try:
+        backend = LLMBackend(config)
+        issues = _issues()
+        backend.enrich(issues)
+        assert all(i.suggestion for i in issues)
+        assert issues[0].suggestion is issues[2].suggestion
+        assert backend.stats["signatures"] == 3 and backend.stats["failed_batches"] == 0
+        assert stub.stats["items"] == 3  # one prompt slot per signature
+        assert backend.stats["requests"] == 2 + stub.stats["failures"]
+        backend.close()
+
+        # a new backend (new process) answers from the persistent cache
+        again = LLMBackend(config)
+        issues = _issues()
+        again.enrich(issues)
+        assert all(i.suggestion for i in issues)
+        assert again.stats["cache_hits"] == 3 and again.stats["requests"] == 0
+        again.close()
+    finally:
+        stub.shutdown()
+
+    monkeypatch.delenv("USE_LLM", raising=False)
+    assert enrich_with_llm(_issues()) == []
+
+
+def test_unreachable_endpoint_gives_up(tmp_path):
+    config = LLMConfig(endpoint="http://127.0.0.1:9/v1/chat/completions", cache_path=None,
+                       timeout=1, retries=1, backoff=0)
+    backend = LLMBackend(config)
+    issues = _issues()
+    assert backend.enrich(issues) == [None] * 6
+    assert backend.stats["failed_batches"] == 1 and backend.stats["requests"] == 2
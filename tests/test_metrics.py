@@ -0,0 +1,62 @@
+import json
+
+import typer
+from typer.testing import CliRunner
+
+from cli import main
+from core import metrics
+from valmods.runner import run_validation
+
+SCHEMAS = dict(xsd_path="schemas/minimal.xsd", schematron_path="schemas/minimal.sch",
+               json_schema_path="schemas/sample.schema.json", csv_schema_path="schemas/csv.schema.yaml")
+
+
+def test_collects_stages_counters_and_slowest_files():
+    m = metrics.enable(slowest=2)
+    try:
+        run_validation("examples", **SCHEMAS)
+    finally:
+        metrics.disable()
+    d = m.to_dict()
+    assert d["counters"]["files"] == 5 and d["counters"]["files.xml"] == 2
+    assert d["counters"]["issues"] == sum(d["issues_by_type"].values())
+    assert {"xml.prescreen", "xml.xsd", "json.schema", "csv.read", "discovery"} <= set(d["stages"])
+    assert len(d["slowest_files"]) == 2
+    assert d["slowest_files"][0]["seconds"] >= d["slowest_files"][1]["seconds"]
+
+
+def test_json_records_are_counted(tmp_path):
+    (tmp_path / "a.jsonl").write_text('{"id": 1}\n{"id": 2}\n\n{"id": 3}\n')
+    (tmp_path / "b.json").write_text('{"id": 4}')
+    m = metrics.enable()
+    try:
+        run_validation(str(tmp_path), xsd_path=None, json_schema_path="schemas/sample.schema.json")
+    finally:
+        metrics.disable()
+    assert m.counters["json.records"] == 3 and "json.lines" in m.stages  # a whole document isn't a record stream
+
+
+def test_worker_deltas_are_merged():
+    m = metrics.enable()
+    try:
+        run_validation("examples", workers=2, **SCHEMAS)
+    finally:
+        metrics.disable()
+    assert m.counters["files"] == 5 and "xml.xsd" in m.stages
+
+
+def test_disabled_by_default_and_cli_profile(tmp_path):
+    assert metrics.active is None
+    assert run_validation("examples", **SCHEMAS)  # nothing recorded, nothing raised
+
+    out = tmp_path / "profile.json"
+    app = typer.Typer()
+    app.command()(main)
+    result = CliRunner().invoke(app, [
+        "examples", "--xsd", "schemas/minimal.xsd", "--json-schema", "schemas/sample.schema.json",
+        "--out", str(tmp_path / "reports"), "--profile", str(out), "--slowest", "3",
+    ])
+    assert result.exit_code == 2, result.output
+    data = json.loads(out.read_text())
+    assert {"render", "suggestions"} <= set(data["stages"]) and len(data["slowest_files"]) == 3
+    assert "rule_hits" in data and metrics.active is None
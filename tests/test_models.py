@@ -0,0 +1,28 @@
+from core.models import Suggestion, ValidationIssue, ValidationReport
+
+def test_issue_attributes_and_lazy_id():
+    i = ValidationIssue("XSD-VALIDATION", "error", "/Product", "boom", suggestion=Suggestion("fix it"))
+    assert (i.issue_type, i.severity, i.path, i.message, i.rule, i.line) == ("XSD-VALIDATION", "error", "/Product", "boom", None, None)
+    assert i.id == i.id and len(i.id) == 8
+    i.suggestion = None
+    assert i.suggestion is None
+
+def test_report_counts_follow_list_changes():
+    r = ValidationReport(file="x", issues=[ValidationIssue("T", "error", "$", "m")])
+    assert (r.error_count, r.warning_count, r.passed) == (1, 0, False)
+    r.issues.append(ValidationIssue("T", "warning", "$", "m"))
+    assert (r.error_count, r.warning_count) == (1, 1)
+    r.issues = []
+    assert r.passed
+
+def test_report_counts_follow_in_place_edits():
+    r = ValidationReport(file="x", issues=[ValidationIssue("T", "error", "$", "m")])
+    assert r.error_count == 1
+    r.issues[0].severity = "warning"
+    assert (r.error_count, r.warning_count) == (0, 1)
+    r.issues = [ValidationIssue("T", "error", "$", "m")]  # same length, new list
+    assert (r.error_count, r.warning_count) == (1, 0)
+
+def test_report_round_trip():
+    r = ValidationReport(file="x", issues=[ValidationIssue("T", "error", "$", "m", suggestion=Suggestion("s", "e"), line=3)])
+    assert ValidationReport.from_dict(r.to_dict()) == r
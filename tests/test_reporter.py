@@ -0,0 +1,47 @@
+import io
+import json
+
+from core.models import Suggestion, ValidationIssue, ValidationReport
+from core.reporter import SarifWriter, to_markdown, write_index, write_jsonl, write_markdown
+
+
+def _report(name="a.json", n=5):
+    issues = [ValidationIssue("JSON-SCHEMA", "error", f"{k}.title", f"bad {k}", line=k + 1) for k in range(n)]
+    issues.append(ValidationIssue("JSON-PARSE", "error", "5", "broken", suggestion=Suggestion("Fix it")))
+    return ValidationReport(name, issues)
+
+
+def test_streaming_markdown_matches_render_and_caps():
+    report = _report()
+    fh = io.StringIO()
+    write_markdown(report, fh)
+    assert fh.getvalue() == to_markdown(report)
+
+    fh = io.StringIO()
+    write_markdown(report, fh, max_issues=2)
+    text = fh.getvalue()
+    assert "bad 1" in text and "bad 2" not in text
+    assert "4 more issue(s): JSON-SCHEMA × 3, JSON-PARSE × 1" in text
+
+
+def test_combined_index_and_machine_outputs():
+    reports = [_report("a.json"), ValidationReport("b.json", [])]
+    fh = io.StringIO()
+    summary = write_index(iter(reports), fh, "md", max_issues=1)
+    assert [(r["file"], r["passed"], r["errors"]) for r in summary] == [("a.json", False, 6), ("b.json", True, 0)]
+    assert "| b.json | PASS | 0 | 0 |" in fh.getvalue()
+
+    fh = io.StringIO()
+    write_jsonl(reports[0], fh)
+    rows = [json.loads(line) for line in fh.getvalue().splitlines()]
+    assert len(rows) == 6 and rows[0]["file"] == "a.json" and rows[0]["line"] == 1
+
+    fh = io.StringIO()
+    with SarifWriter(fh) as sarif:
+        for r in reports:
+            sarif.add(r)
+    log = json.loads(fh.getvalue())
+    run = log["runs"][0]
+    assert log["version"] == "2.1.0" and len(run["results"]) == 6
+    assert {r["id"] for r in run["tool"]["driver"]["rules"]} == {"JSON-SCHEMA", "JSON-PARSE"}
+    assert run["results"][0]["locations"][0]["physicalLocation"]["region"] == {"startLine": 1}
@@ -0,0 +1,30 @@
+import shutil
+from valmods.result_store import ResultStore, schema_fingerprint
+from valmods.runner import run_validation
+
+SCHEMAS = dict(
+    xsd_path="schemas/minimal.xsd",
+    json_schema_path="schemas/sample.schema.json",
+    csv_schema_path="schemas/csv.schema.yaml",
+)
+
+def _run(target, db):
+    with ResultStore(db, schema_fingerprint(SCHEMAS.values())) as store:
+        results = run_validation(target, store=store, **SCHEMAS)
+    return store, [(str(p), [(i.issue_type, i.path) for i in r.issues]) for p, r in results]
+
+def test_incremental_reuses_unchanged_files(tmp_path):
+    bundle = tmp_path / "bundle"
+    shutil.copytree("examples", bundle)
+    db = str(tmp_path / "results.sqlite")
+
+    first, cold = _run(str(bundle), db)
+    assert (first.hits, first.misses) == (0, 5)
+
+    second, warm = _run(str(bundle), db)
+    assert (second.hits, second.misses) == (5, 0)
+    assert warm == cold
+
+    (bundle / "good.csv").write_text("id,name,score\n1,,5\n")
+    third, _ = _run(str(bundle), db)
+    assert (third.hits, third.misses) == (4, 1)
@@ -0,0 +1,79 @@
+import json
+
+from valmods.routing import Router, sniff
+from valmods.runner import run_validation
+
+XSD = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:{v}" elementFormDefault="qualified">
+  <xs:element name="label"><xs:complexType><xs:sequence><xs:element name="{field}" type="xs:int"/></xs:sequence></xs:complexType></xs:element>
+</xs:schema>"""
+ROUTES = """routes:
+  - name: im-v1
+    match: {namespace: "urn:v1"}
+    xsd: schemas/v1.xsd
+  - name: im-v2
+    match: {schema_location: "*/v2.xsd"}
+    xsd: schemas/v2.xsd
+  - match: {$schema: "https://example.org/v1/*"}
+    json_schema: schemas/v1.json
+  - match: {glob: "legacy/*", $schema: ["https://example.org/v2/*"]}
+    json_schema: schemas/v2.json
+"""
+
+
+def write_bundle(tmp_path):
+    schemas = tmp_path / "cfg" / "schemas"
+    schemas.mkdir(parents=True)
+    for v, field in (("v1", "a"), ("v2", "b")):
+        (schemas / f"{v}.xsd").write_text(XSD.format(v=v, field=field))
+        (schemas / f"{v}.json").write_text(json.dumps({"type": "object", "required": [field]}))
+    (tmp_path / "cfg" / "routes.yaml").write_text(ROUTES)
+    data = tmp_path / "data"
+    (data / "legacy").mkdir(parents=True)
+    files = {
+        "one.xml": '<label xmlns="urn:v1"><a>1</a></label>',
+        "one_bad.xml": '<label xmlns="urn:v1"><b>1</b></label>',
+        "two.xml": '<?xml-model href="https://example.org/im/v2.xsd"?>\n<label xmlns="urn:v2"><b>2</b></label>',
+        "other.xml": '<label xmlns="urn:v9"><a>1</a></label>',
+        "one.json": json.dumps({"$schema": "https://example.org/v1/doc", "a": 1}),
+        "legacy/two.json": json.dumps({"$schema": "https://example.org/v2/doc", "a": 1}),
+        "two.json": json.dumps({"$schema": "https://example.org/v2/doc", "b": 1}),
+    }
+    for rel, text in files.items():
+        (data / rel).write_text(text)
+    return data, str(tmp_path / "cfg" / "routes.yaml")
+
+
+def test_one_pass_over_a_mixed_bundle(tmp_path):
+    data, routes = write_bundle(tmp_path)
+    by_file = {}
+    for workers in (1, 2):
+        results = run_validation(str(data), xsd_path=None, json_schema_path=None, routes=routes, workers=workers,
+                                 order="path")
+        by_file[workers] = {p.relative_to(data).as_posix(): sorted({i.issue_type for i in r.issues}) for p, r in results}
+    assert by_file[1] == by_file[2] == {
+        "legacy/two.json": ["JSON-SCHEMA"],   # routed by glob + $schema to v2, which requires "b"
+        "one.json": [],
+        "one.xml": [],
+        "one_bad.xml": ["XSD-VALIDATION"],
+        "other.xml": ["ROUTE"],              # no route, no --xsd fallback
+        "two.json": ["ROUTE"],               # the v2 route only covers legacy/
+        "two.xml": [],
+    }
+
+
+def test_routes_share_validators_and_build_lazily(tmp_path):
+    data, routes = write_bundle(tmp_path)
+    (tmp_path / "cfg" / "routes.yaml").write_text(ROUTES.replace("schemas/v2.xsd", "schemas/v1.xsd"))
+    router = Router(routes, route_root=str(data), json_schema_path=str(tmp_path / "cfg" / "schemas" / "v1.json"))
+    assert router.pool == {}
+    assert router.validate(data / "one.xml").issues == []
+    assert router.validate_bytes(b'<label xmlns="urn:v2" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+                                 b' xsi:schemaLocation="urn:v2 http://x/v2.xsd"><a>1</a></label>', "x.xml").issues
+    assert len(router.pool) == 1            # both XML routes name v1.xsd
+    assert router.validate(data / "two.json").issues[0].issue_type == "JSON-SCHEMA"  # the fallback schema
+
+
+def test_sniff_reads_only_the_head():
+    head = b'<?xml version="1.0"?>\n<?xml-model href="a.sch"?>\n<p:Product xmlns:p="urn:p" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="urn:p p.xsd"><p:x>' + b"1" * 50
+    assert sniff(head, "xml") == {"namespace": ("urn:p",), "root": ("Product",), "schema_location": ("a.sch", "p.xsd")}
+    assert sniff(b'{"$schema": "https://e.org/s"', "json") == {"$schema": ("https://e.org/s",)}
@@ -0,0 +1,59 @@
+from core.models import ValidationIssue
+from core.reasoner import enrich_with_suggestions
+from core.rulepack import RulePack, _trie_regex
+
+
+def _issue(message, issue_type="XSD-VALIDATION", rule=None):
+    return ValidationIssue(issue_type, "error", "/Product", message, rule=rule)
+
+
+def test_default_pack_matches_legacy_patterns():
+    issues = [
+        _issue("Namespace mismatch on root"),
+        _issue("'x' is not a valid value for unit"),
+        _issue("'title' is a required property", "JSON-SCHEMA"),
+        _issue("something else"),
+        _issue("'K' is not a valid value"),  # needs both literals of the unit rule
+    ]
+    enrich_with_suggestions(issues)
+    messages = [i.suggestion.message if i.suggestion else None for i in issues]
+    assert messages == [
+        "Add the correct PDS4 namespace on the root element.",
+        "Replace with a valid unit from the PDS Units of Measure dictionary.",
+        "Add the required field/element according to the schema.",
+        None,
+        None,
+    ]
+
+
+def test_order_dispatch_overlaps_and_shared_suggestions():
+    pack = RulePack([
+        {"id": "typed", "issue_types": ["SCHEMATRON"], "any": ["Title"], "suggestion": {"message": "fill title"}},
+        {"id": "by-rule", "rules": ["count(x) = 1"], "suggestion": {"message": "one x"}},
+        # "Title" is a substring of "SubTitle": both must be seen from one scan
+        {"id": "both", "all": ["SubTitle", "Title", "itle"], "suggestion": {"message": "sub"}},
+        {"id": "regex", "any": ["value"], "regex": r"value \d+", "suggestion": {"message": "number"}},
+        {"id": "catch-all", "issue_types": ["CSV-PARSE"], "suggestion": {"message": "csv"}},
+    ])
+    issues = [
+        _issue("Title must not be empty.", "SCHEMATRON"),
+        _issue("Title must not be empty."),  # wrong type for "typed", no other rule
+        _issue("x", "SCHEMATRON", rule="count(x) = 1"),
+        _issue("bad SubTitle"),
+        _issue("value 12"),
+        _issue("value twelve"),
+        _issue("cannot parse", "CSV-PARSE"),
+        _issue("Title must not be empty.", "SCHEMATRON"),
+    ]
+    pack.enrich(issues)
+    assert [i.suggestion.message if i.suggestion else None for i in issues] == [
+        "fill title", None, "one x", "sub", "number", None, "csv", "fill title",
+    ]
+    assert issues[0].suggestion is issues[7].suggestion
+    assert pack.hits == {"typed": 2, "by-rule": 1, "both": 1, "regex": 1, "catch-all": 1}
+
+
+def test_trie_regex_prefers_longest():
+    import re
+    pattern = re.compile(f"(?=({_trie_regex(['ab', 'abc', 'b.c'])}))")
+    assert [m.group(1) for m in pattern.finditer("abc b.c")] == ["abc", "b.c"]
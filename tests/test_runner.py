@@ -0,0 +1,53 @@
+import re
+from pathlib import Path
+from valmods.runner import run_validation
+
+def _flatten(results):
+    # xmlschema messages embed element repr addresses ("at 0x7f..."), which differ per process
+    return [
+        (str(p), [(i.issue_type, i.path, re.sub(r" at 0x[0-9a-f]+", "", i.message)) for i in r.issues])
+        for p, r in results
+    ]
+
+def test_parallel_matches_serial():
+    kwargs = dict(
+        xsd_path="schemas/minimal.xsd",
+        json_schema_path="schemas/sample.schema.json",
+        csv_schema_path="schemas/csv.schema.yaml",
+        schematron_path="schemas/minimal.sch",
+    )
+    serial = run_validation("examples", **kwargs)
+    parallel = run_validation("examples", workers=2, **kwargs)
+    assert len(serial) == 5
+    assert _flatten(parallel) == _flatten(serial)
+
+def test_error_budgets_stop_early_and_mark_truncated():
+    kwargs = dict(xsd_path="schemas/minimal.xsd", json_schema_path="schemas/sample.schema.json",
+                  csv_schema_path="schemas/csv.schema.yaml", schematron_path="schemas/minimal.sch")
+    for workers in (1, 2):
+        first = run_validation("examples", max_total_errors=1, workers=workers, **kwargs)
+        assert [(p.name, r.error_count) for p, r in first] == [("bad_label.xml", 1)]
+        budget = run_validation("examples", max_total_errors=3, workers=workers, **kwargs)
+        assert sum(r.error_count for _, r in budget) == 3 and budget[-1][1].truncated
+    per_file = {p.name: r for p, r in run_validation("examples", max_errors=1, **kwargs)}
+    assert len(per_file) == 5 and all(len(r.issues) <= 1 for r in per_file.values())
+    assert per_file["bad_sample.json"].truncated and not per_file["good.csv"].truncated
+
+def test_budget_stop_is_signalled_only_when_files_are_left(tmp_path):
+    from valmods.runner import iter_validation
+    for n in (1, 2, 3):
+        (tmp_path / str(n)).mkdir()
+        for i in range(n):
+            (tmp_path / str(n) / f"{i}.json").write_bytes(Path("examples/bad_sample.json").read_bytes())  # two errors each
+    cases = [  # (files, budget, files reported, stop signalled)
+        (1, 2, 1, []),      # spent on the only file
+        (3, 2, 1, [True]),  # spent on the first of three
+        (2, 3, 2, []),      # spent part-way through the last file's errors
+    ]
+    for workers in (1, 2):
+        for n, budget, reported, expected in cases:
+            stops = []
+            pairs = list(iter_validation(str(tmp_path / str(n)), xsd_path=None,
+                                         json_schema_path="schemas/sample.schema.json", max_total_errors=budget,
+                                         workers=workers, order="path", on_stop=lambda: stops.append(True)))
+            assert len(pairs) == reported and stops == expected, n
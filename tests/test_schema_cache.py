@@ -0,0 +1,46 @@
+import pytest
+
+import valmods.xml_validator as xml_validator
+from valmods.xml_validator import XMLValidator
+from valmods.schema_cache import SchemaCache
+
+def test_warm_start_skips_compilation(tmp_path, monkeypatch):
+    cold = XMLValidator("schemas/minimal.xsd", schematron_path="schemas/minimal.sch", cache_dir=str(tmp_path))
+    expected = [(i.issue_type, i.path) for i in cold.validate("examples/bad_schematron.xml")]
+
+    def boom(*args, **kwargs):
+        raise AssertionError("schema was recompiled")
+    monkeypatch.setattr(xml_validator, "XMLSchema", boom)
+    monkeypatch.setattr(xml_validator, "Schematron", boom)
+
+    warm = XMLValidator("schemas/minimal.xsd", schematron_path="schemas/minimal.sch", cache_dir=str(tmp_path))
+    assert [(i.issue_type, i.path) for i in warm.validate("examples/bad_schematron.xml")] == expected
+
+def test_key_follows_includes_and_eviction(tmp_path):
+    (tmp_path / "types.xsd").write_text(
+        '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"><xs:simpleType name="t"><xs:restriction base="xs:string"/></xs:simpleType></xs:schema>'
+    )
+    main = tmp_path / "main.xsd"
+    main.write_text(
+        '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"><xs:include schemaLocation="types.xsd"/>'
+        '<xs:element name="a" type="t"/></xs:schema>'
+    )
+    cache = SchemaCache(str(tmp_path / "cache"), max_bytes=1)
+    before = cache.key("xsd", [str(main)])
+    (tmp_path / "types.xsd").write_text((tmp_path / "types.xsd").read_text().replace("string", "token"))
+    assert cache.key("xsd", [str(main)]) != before
+
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"y" * 10)
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) <= 1
+
+def test_cache_dir_must_be_private(tmp_path, monkeypatch):
+    monkeypatch.delenv("AIOPS_SCHEMA_CACHE", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert SchemaCache().directory == tmp_path / "xdg" / "aiops-data-validator" / "schemas"
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)  # e.g. created first by another user under /tmp
+    with pytest.raises(PermissionError, match="Refusing to use cache directory"):
+        SchemaCache(str(shared))
@@ -0,0 +1,85 @@
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from valmods.schema_catalog import CatalogError, SchemaCatalog, prefetch
+from valmods.xml_validator import XMLValidator
+
+MAIN_XSD = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:d="urn:dict"
+  targetNamespace="urn:main" xmlns="urn:main" elementFormDefault="qualified">
+  <xs:import namespace="urn:dict" schemaLocation="{base}/dict/types.xsd"/>
+  <xs:include schemaLocation="common.xsd"/>
+  <xs:element name="label"><xs:complexType><xs:sequence>
+    <xs:element name="name" type="Name"/><xs:element name="count" type="d:Count"/>
+  </xs:sequence></xs:complexType></xs:element>
+</xs:schema>"""
+COMMON_XSD = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:main">
+  <xs:simpleType name="Name"><xs:restriction base="xs:string"><xs:maxLength value="5"/></xs:restriction></xs:simpleType>
+</xs:schema>"""
+DICT_XSD = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:dict">
+  <xs:simpleType name="Count"><xs:restriction base="xs:positiveInteger"/></xs:simpleType>
+</xs:schema>"""
+MAIN_SCH = """<sch:schema xmlns:sch="http://purl.oclc.org/dsdl/schematron">
+  <sch:ns prefix="m" uri="urn:main"/>
+  <sch:include href="{base}/rules/count.sch"/>
+</sch:schema>"""
+COUNT_SCH = """<sch:pattern xmlns:sch="http://purl.oclc.org/dsdl/schematron">
+  <sch:rule context="m:label"><sch:assert test="m:count &lt; 100">count must stay below 100</sch:assert></sch:rule>
+</sch:pattern>"""
+
+
+def label(name, count):
+    return f'<label xmlns="urn:main"><name>{name}</name><count>{count}</count></label>'.encode()
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def schema_server(tmp_path):
+    """A stand-in schema host; the test stops it before building validators."""
+    root = tmp_path / "srv"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(root)))
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    for rel, text in {"pds/main.xsd": MAIN_XSD, "pds/common.xsd": COMMON_XSD, "dict/types.xsd": DICT_XSD,
+                      "pds/main.sch": MAIN_SCH, "rules/count.sch": COUNT_SCH}.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text.format(base=base), encoding="utf-8")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield base, server
+    server.shutdown()
+    server.server_close()
+
+
+def test_prefetched_bundle_validates_offline(tmp_path, schema_server):
+    base, server = schema_server
+    bundle = tmp_path / "bundle"
+    catalog = prefetch([f"{base}/pds/main.xsd", f"{base}/pds/main.sch"], str(bundle))
+    assert len(catalog.entries) == 5
+    assert prefetch([f"{base}/pds/main.xsd", f"{base}/pds/main.sch"], str(bundle)).version == catalog.version
+    server.shutdown()  # from here on every schema must come from the bundle
+    server.server_close()
+
+    v = XMLValidator(f"{base}/pds/main.xsd", schematron_path=f"{base}/pds/main.sch", catalog=str(bundle),
+                     cache_dir=str(tmp_path / "cache"))
+    assert v.validate_bytes(label("abc", 5)) == []
+    assert {i.issue_type for i in v.validate_bytes(label("toolong", 0))} == {"XSD-VALIDATION"}
+    assert [i.message for i in v.validate_bytes(label("abc", 500))] == ["count must stay below 100"]
+
+
+def test_bundle_integrity_and_coverage(tmp_path, schema_server):
+    base, _ = schema_server
+    bundle = tmp_path / "bundle"
+    catalog = prefetch([f"{base}/pds/main.xsd"], str(bundle))
+    with pytest.raises(CatalogError, match="not in the schema bundle"):
+        XMLValidator(f"{base}/pds/other.xsd", catalog=str(bundle))
+
+    path = catalog.resolve(f"{base}/dict/types.xsd")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("<!-- edited -->")
+    with pytest.raises(CatalogError, match="does not match its catalog hash"):
+        SchemaCatalog.load(str(bundle))
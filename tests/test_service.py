@@ -0,0 +1,40 @@
+import asyncio
+from pathlib import Path
+from valmods.service import ValidationService, request
+
+def test_service_validates_over_http():
+    config = dict(xsd_path="schemas/minimal.xsd", json_schema_path="schemas/sample.schema.json")
+
+    async def scenario():
+        service = ValidationService(config, workers=1)
+        server = await service.start(port=0)
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            body = Path("examples/bad_sample.json").read_bytes()
+            replies = [await request(reader, writer, host, "bad_sample.json", body) for _ in range(3)]
+            unknown = await request(reader, writer, host, "notes.txt", b"hello")
+            writer.close()
+        finally:
+            server.close()
+            await service.close()
+        return replies, unknown
+
+    replies, unknown = asyncio.run(scenario())
+    for status, payload in replies:
+        assert status == 200 and payload["passed"] is False
+        assert payload["error_count"] == len(payload["issues"]) >= 2
+    assert unknown[0] == 400
+
+def test_warm_worker_batch_round_trips_reports(monkeypatch):
+    # The path the Streamlit UI takes: warm validators in a pool worker, reports back as dicts
+    from core.models import ValidationReport
+    from valmods import service
+    from valmods.service import init_worker, validate_batch
+    for name in ("_validators", "_rule_pack"):  # put this process's worker globals back afterwards
+        monkeypatch.setattr(service, name, None)
+    init_worker(dict(xsd_path="schemas/minimal.xsd", csv_schema_path="schemas/csv.schema.yaml"))
+    items = [(name, None, Path("examples", name).read_bytes()) for name in ("bad_label.xml", "good.csv", "bad_sample.json")]
+    (s1, xml), (s2, csv), (s3, json) = validate_batch(items, True)
+    assert (s1, s2, s3) == (200, 200, 400)  # no JSON schema configured
+    assert ValidationReport.from_dict(xml).error_count == 1 and ValidationReport.from_dict(csv).passed
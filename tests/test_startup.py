@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("xmlschema", "lxml", "pandas", "jsonschema", "core.llm", "typer")
+
+
+def _loaded_after(code: str) -> set:
+    out = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return {m for m in HEAVY if m in out}
+
+
+def test_cli_import_loads_no_validator_stack():
+    assert _loaded_after("import cli") == {"typer"}  # the CLI's own framework, nothing else
+
+
+def test_validators_load_for_the_kinds_seen():
+    code = (
+        "from valmods.runner import run_validation\n"
+        "run_validation('examples/bad_sample.json', xsd_path='schemas/minimal.xsd',"
+        " json_schema_path='schemas/sample.schema.json', csv_schema_path='schemas/csv.schema.yaml')"
+    )
+    assert _loaded_after(code) == {"jsonschema"}
+    assert _loaded_after("from valmods.xml_validator import XMLValidator") == {"xmlschema", "lxml"}
+
+
+def test_templates_resolve_outside_the_repo(tmp_path):
+    code = (
+        "from core.models import ValidationReport\n"
+        "from core.reporter import to_markdown\n"
+        "print(to_markdown(ValidationReport(file='x.json', issues=[])))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                         env={**os.environ, "PYTHONPATH": str(ROOT), "AIOPS_TEMPLATE_CACHE": str(tmp_path)})
+    assert out.returncode == 0, out.stderr
+    assert "x.json" in out.stdout
+    assert any(tmp_path.glob("__jinja2_*"))  # compiled template bytecode was cached
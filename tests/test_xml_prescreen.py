@@ -0,0 +1,46 @@
+from core.reasoner import enrich_with_suggestions
+from valmods.xml_validator import XMLValidator
+
+XSD, SCH = "schemas/minimal.xsd", "schemas/minimal.sch"
+
+
+def test_prescreen_rejects_root_namespace_and_prologue():
+    v = XMLValidator(XSD, schematron_path=SCH)
+    root = v.validate_bytes(b"<?xml version='1.0'?>\n<Label><Title/></Label>")
+    assert [(i.issue_type, i.line) for i in root] == [("XML-ROOT", 2)]
+
+    ns = v.validate_bytes(b'<Product xmlns="http://pds.nasa.gov/pds4/pds/v1"><Title/></Product>')
+    assert [i.issue_type for i in ns] == ["XML-NAMESPACE"]
+    enrich_with_suggestions(ns)
+    assert "namespace" in ns[0].suggestion.message
+
+    prologue = v.validate_bytes(b"<?xml version='1.0'?>\n<!DOCTYPE Product [<!ELEMENT>]>\n<Product/>")
+    assert [i.issue_type for i in prologue] == ["XML-PARSE"] and prologue[0].line == 2
+
+    assert v.rejected == 3
+    assert set(v.last_stats) == {"prescreen"}  # schema stages were skipped
+
+
+def test_full_validation_and_max_errors(tmp_path):
+    label = tmp_path / "empty_title.xml"
+    label.write_text("<Product>\n  <Title></Title>\n</Product>\n", encoding="utf-8")
+
+    v = XMLValidator(XSD, schematron_path=SCH)
+    assert [i.issue_type for i in v.validate(str(label))] == ["XSD-VALIDATION", "SCHEMATRON"]
+    assert set(v.last_stats) == {"prescreen", "parse", "xsd", "schematron"}
+
+    capped = XMLValidator(XSD, schematron_path=SCH, max_errors=1)
+    assert [i.issue_type for i in capped.validate(str(label))] == ["XSD-VALIDATION"]
+    assert "schematron" not in capped.last_stats
+
+
+def test_external_entities_are_not_expanded(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("TOP-SECRET", encoding="utf-8")
+    label = tmp_path / "xxe.xml"
+    label.write_text(f'<?xml version="1.0"?>\n<!DOCTYPE Product [<!ENTITY x SYSTEM "{secret.as_uri()}">]>\n'
+                     "<Product><Title>&x;</Title><Observation_Area>a</Observation_Area></Product>\n", encoding="utf-8")
+    v = XMLValidator(XSD, schematron_path=SCH)
+    for issues in (v.validate(str(label)), v.validate_bytes(label.read_bytes())):
+        assert "Title must not be empty." in [i.message for i in issues]  # &x; stayed an unexpanded reference
+        assert not any("TOP-SECRET" in i.message for i in issues)
@@ -1,14 +1,17 @@
-import streamlit as st
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from io import StringIO
 from pathlib import Path
-from datetime import datetime
 
-from valmods.xml_validator import XMLValidator
-from valmods.json_validator import JSONValidator
-from valmods.csv_validator import CSVValidator  # NEW: CSV support
+import streamlit as st
 
 from core.models import ValidationReport
-from core.reasoner import enrich_with_suggestions, summarize
-from core.reporter import to_markdown, to_html
+from core.reporter import to_html, to_markdown, write_index
+from valmods.result_store import schema_fingerprint
+from valmods.schema_cache import default_cache_dir
+from valmods.service import init_worker, validate_batch
 
 
 # ---------- Page meta ----------
@@ -52,26 +55,94 @@ with st.expander("⚙️ Configuration", expanded=False):
         help="YAML file describing required columns, types, and simple rules."
     )
 
+    workers = st.number_input(
+        "Worker processes",
+        min_value=1, max_value=32, value=min(4, os.cpu_count() or 1),
+        help="Files are validated in parallel by this many warm validator processes."
+    )
+
 
 # ---------- Uploader ----------
 uploads = st.file_uploader(
     "Drop files here",
-    type=["xml", "json", "csv"],
+    type=["xml", "json", "jsonl", "ndjson", "csv"],
     accept_multiple_files=True
 )
 run = st.button("▶️ Run validation", type="primary", use_container_width=True)
 
 
 # ---------- Helpers ----------
-def detect_kind(name: str) -> str:
-    s = Path(name).suffix.lower()
-    if s == ".xml":
-        return "xml"
-    if s == ".json":
-        return "json"
-    if s == ".csv":
-        return "csv"
-    return "unknown"
+# Compiled schemas persist here, so even a new worker pool doesn't recompile the XSD/Schematron
+SCHEMA_CACHE = default_cache_dir()
+KINDS = {"Auto-detect": None, "XML (PDS4)": "xml", "JSON": "json"}
+
+
+@st.cache_resource(show_spinner=False)
+def live_pools() -> dict:
+    """The worker pool in use, so the next one built can shut it down."""
+    return {}
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def worker_pool(config: tuple, fingerprint: str, workers: int) -> ProcessPoolExecutor:
+    """
+    Validator processes kept across reruns and sessions. Each compiles the schemas
+    once; `fingerprint` hashes their contents, so editing a schema builds a new pool.
+    Only one pool is kept: the one it replaces exits once its queued work is done.
+    Spawned rather than forked: the Streamlit server process is multi-threaded.
+    """
+    live = live_pools()
+    if "pool" in live:
+        live["pool"].shutdown(wait=False)
+    live["pool"] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=init_worker, initargs=(dict(config),))
+    return live["pool"]
+
+
+def validate_uploads(pool: ProcessPoolExecutor, workers: int, files, kind):
+    """(name, status, payload) per upload, validated in memory, in the order they finish."""
+    items = [(uf.name, kind, uf.getvalue()) for uf in files]
+    # Small batches: few round trips, but results still arrive steadily
+    size = max(1, min(16, len(items) // (4 * workers)))
+    futures = {
+        pool.submit(validate_batch, items[i:i + size], True): [name for name, _, _ in items[i:i + size]]
+        for i in range(0, len(items), size)
+    }
+    for fut in as_completed(futures):
+        for name, (status, payload) in zip(futures[fut], fut.result()):
+            yield name, status, payload
+
+
+def show_tiles(target, results) -> None:
+    ok = [p for _, status, p in results if status == 200]
+    c1, c2, c3 = target.columns(3)
+    c1.metric("Files", len(results))
+    c2.metric("Errors", sum(p["error_count"] for p in ok))
+    c3.metric("Warnings", sum(p["warning_count"] for p in ok))
+
+
+def show_result(n: int, name: str, status: int, payload: dict) -> None:
+    if status != 200:
+        st.error(f"{name}: {payload['error']}")
+        return
+    report = ValidationReport.from_dict(payload)
+    verdict = "✅ PASS" if report.passed else f"❌ FAIL ({report.error_count} error(s))"
+    with st.expander(f"{name} — {verdict}", expanded=False):
+        st.markdown(to_markdown(report))
+        st.download_button(
+            "⬇️ Download HTML report",
+            data=to_html(report).encode("utf-8"),
+            file_name=f"{Path(name).stem}_report.html",
+            mime="text/html",
+            key=f"html-{n}",
+        )
+
+
+def show_combined(results) -> None:
+    buf = StringIO()
+    write_index((ValidationReport.from_dict(p) for _, status, p in results if status == 200), buf, "html")
+    st.download_button("⬇️ Download combined HTML report", data=buf.getvalue().encode("utf-8"),
+                       file_name="index.html", mime="text/html", key="html-index")
 
 
 # ---------- Main run ----------
@@ -80,75 +151,37 @@ if run:
         st.warning("Please upload at least one file.")
         st.stop()
 
-    run_dir = Path("ui_runs") / datetime.now().strftime("%Y%m%d_%H%M%S")
-    run_dir.mkdir(parents=True, exist_ok=True)
+    config = dict(xsd_path=xsd or None, schematron_path=sch or None, json_schema_path=json_schema or None,
+                  csv_schema_path=csv_schema or None, schema_cache_dir=SCHEMA_CACHE)
+    try:
+        fingerprint = schema_fingerprint([xsd, sch, json_schema, csv_schema])
+    except Exception as e:  # unreadable schema path or URL
+        st.error(f"Could not read the schemas: {e}")
+        st.stop()
+    pool = worker_pool(tuple(sorted(config.items())), fingerprint, int(workers))
 
+    # Tiles and progress update as each file finishes; results list below them
+    tiles = st.empty()
+    bar = st.progress(0.0, text=f"Validating {len(uploads)} file(s)…")
     results = []
-    with st.spinner("Validating..."):
-        for uf in uploads:
-            # Save uploaded file to disk for validators
-            path = run_dir / uf.name
-            with open(path, "wb") as f:
-                f.write(uf.getbuffer())
-
-            # Decide which validator to use
-            if kind == "Auto-detect":
-                k = detect_kind(uf.name)
-            else:
-                k = "xml" if "XML" in kind else "json"
-
-            # Run the appropriate validator
-            if k == "xml":
-                if not xsd:
-                    st.error("Please provide a PDS4 XSD path/URL for XML validation.")
-                    continue
-                v = XMLValidator(xsd, sch or None)
-
-            elif k == "json":
-                if not json_schema:
-                    st.error("Please provide a JSON Schema path for JSON validation.")
-                    continue
-                v = JSONValidator(json_schema)
-
-            elif k == "csv":
-                if not csv_schema:
-                    st.error("Please provide a CSV Schema (YAML) path for CSV validation.")
-                    continue
-                v = CSVValidator(csv_schema)
-
-            else:
-                st.error(f"Unsupported file type for {uf.name}")
-                continue
-
-            # Validate and enrich with rule-based suggestions
-            issues = v.validate(str(path))
-            enrich_with_suggestions(issues)
-
-            # Build report (counts/properties computed on the class)
-            report = ValidationReport(file=str(path), issues=issues)
-            results.append((path, report))
-
-    # ---------- Summary tiles ----------
-    total_files = len(results)
-    total_errors = sum(r.error_count for _, r in results)
-    total_warnings = sum(r.warning_count for _, r in results)
-
-    c1, c2, c3 = st.columns(3)
-    c1.metric("Files", total_files)
-    c2.metric("Errors", total_errors)
-    c3.metric("Warnings", total_warnings)
-
-    # ---------- Per-file sections ----------
-    for path, report in results:
-        st.markdown(f"### {path.name} — {'✅ PASS' if report.passed else '❌ FAIL'}")
-        st.markdown(to_markdown(report))
-
-        # Provide HTML download
-        html_bytes = to_html(report).encode("utf-8")
-        st.download_button(
-            "⬇️ Download HTML report",
-            data=html_bytes,
-            file_name=f"{path.stem}_report.html",
-            mime="text/html",
-            use_container_width=False,
-        )
+    try:
+        for name, status, payload in validate_uploads(pool, int(workers), uploads, KINDS[kind]):
+            results.append((name, status, payload))
+            show_result(len(results), name, status, payload)
+            bar.progress(len(results) / len(uploads), text=f"Validated {len(results)}/{len(uploads)} file(s)")
+            if len(results) % 10 == 0 or len(results) == len(uploads):
+                show_tiles(tiles.container(), results)
+    except BrokenProcessPool:
+        worker_pool.clear()  # a worker failed to start, e.g. a schema that doesn't compile
+        st.error("The validator processes stopped. Check the schema paths and run again.")
+        st.stop()
+    bar.empty()
+    st.session_state["results"] = results  # survives the reruns triggered by download buttons
+    show_combined(results)
+
+elif st.session_state.get("results"):
+    results = st.session_state["results"]
+    show_tiles(st, results)
+    for n, (name, status, payload) in enumerate(results, start=1):
+        show_result(n, name, status, payload)
+    show_combined(results)
@@ -0,0 +1,121 @@
+# valmods/csv_arrow.py
+"""
+pyarrow side of the CSV validator (`engine: arrow` in the CSV schema YAML).
+
+Only the columns the schema references (required, typed, or read by a rule) are
+parsed, and the declared `types` are handed to the Arrow reader, so a clean file
+is converted in one multi-threaded C++ pass with no inference. Arrow stops at the
+first value it can't convert, so a file that fails is read a second time with its
+typed columns as strings and `convert()` finds every offending row with compute
+kernels, giving the same per-type count and first row numbers as the rules.
+
+Declared types and what they accept (Arrow's own CSV conversion rules):
+
+    int    -123 (64-bit; surrounding blanks allowed)
+    float  1.5, .5, 5., 1e-3, inf, -Infinity
+    bool   true/false, True/False, TRUE/FALSE, 1/0
+    date   2021-05-01
+    str    anything
+
+Empty cells and the usual null markers (NA, N/A, null, NaN, ...) are nulls, not
+type errors, as with pandas. Columns referenced only by rules are read as
+strings and take the narrowest of int/float/bool per batch, as pandas infers them
+per chunk.
+"""
+import csv
+import io
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+ARROW_TYPES = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(), "date": pa.date32(), "str": pa.string()}
+
+_PATTERNS = {
+    "int": r"^[+-]?\d+$",
+    "float": r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$|^[+-]?([iI][nN][fF]([iI][nN][iI][tT][yY])?|[nN][aA][nN])$",
+    "bool": r"^(0|1|true|false|True|False|TRUE|FALSE)$",
+}
+# Bytes per block when streaming (Arrow's 1 MiB default makes for many small batches)
+STREAM_BLOCK_SIZE = 16 * 1024 * 1024
+_INT64_DIGITS = 18  # literals with more digits (sign aside) may overflow and are checked one by one
+
+
+def header(source) -> List[str]:
+    """Column names from the first line of a path or binary file object (rewound afterwards)."""
+    if isinstance(source, str) or hasattr(source, "__fspath__"):
+        with open(source, "rb") as f:
+            return header(f)
+    text = io.TextIOWrapper(source, encoding="utf-8", newline="")
+    try:
+        return next(csv.reader(text), [])
+    finally:
+        text.detach()
+        source.seek(0)
+
+
+def batches(
+    source, columns: Sequence[str], types: dict, *, typed: bool, stream: bool, block_size: Optional[int] = None,
+) -> Iterator[pa.Table]:
+    """
+    `columns` of the CSV as Arrow tables: the whole file at once, or one block at a
+    time when `stream` is set. Declared columns get their Arrow type when `typed`
+    (raising pa.ArrowInvalid on the first bad value), else every column is a string.
+    """
+    column_types = {c: (ARROW_TYPES[types[c]] if typed and c in types else pa.string()) for c in columns}
+    convert = pacsv.ConvertOptions(column_types=column_types, include_columns=list(columns), strings_can_be_null=True)
+    read = pacsv.ReadOptions(block_size=block_size or (STREAM_BLOCK_SIZE if stream else None))
+    if not stream:
+        yield pacsv.read_csv(source, read_options=read, convert_options=convert)
+        return
+    with pacsv.open_csv(source, read_options=read, convert_options=convert) as reader:
+        for batch in reader:
+            yield pa.Table.from_batches([batch])
+
+
+def _mask(values) -> np.ndarray:
+    return np.array(pc.fill_null(values, False).to_numpy(zero_copy_only=False), dtype=bool)
+
+
+def convert(values, t: str) -> Tuple[np.ndarray, pa.ChunkedArray]:
+    """(mask of values that are not a valid `t`, the column as `t` with those values nulled)."""
+    if t == "str":
+        return np.zeros(len(values), dtype=bool), values
+    if t == "date":
+        parsed = pc.strptime(values, format="%Y-%m-%d", unit="s", error_is_null=True)
+        return _mask(pc.and_(pc.is_valid(values), pc.is_null(parsed))), pc.cast(parsed, pa.date32())
+    text = values if t == "bool" else pc.utf8_trim_whitespace(values)
+    bad = _mask(pc.invert(pc.match_substring_regex(text, _PATTERNS[t])))
+    if t == "int":
+        long = _mask(pc.greater(pc.utf8_length(pc.utf8_ltrim(text, characters="+-")), _INT64_DIGITS)) & ~bad
+        for i in np.flatnonzero(long):
+            bad[i] = not -2**63 <= int(text[int(i)].as_py()) < 2**63
+        text = pc.utf8_ltrim(text, characters="+")  # Arrow's cast takes "-5" but not "+5"
+    good = pc.if_else(pa.array(bad), pa.scalar(None, pa.string()), text)
+    return bad, pc.cast(good, ARROW_TYPES[t])
+
+
+def infer(values):
+    """An undeclared (string) column as int64, float64 or bool if every value converts, as pandas would."""
+    for target in (pa.int64(), pa.float64(), pa.bool_()):
+        try:
+            return pc.cast(values, target)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            continue
+    return values
+
+
+def frame(table: pa.Table, types: dict, typed: bool) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """A batch as a DataFrame for the rules, and each declared column's bad-value mask (string pass only)."""
+    arrays, bad = {}, {}
+    for name in table.column_names:
+        values = table.column(name)
+        if name not in types:
+            values = infer(values)
+        elif not typed:
+            bad[name], values = convert(values, types[name])
+        arrays[name] = values
+    return pa.table(arrays).to_pandas(), bad
@@ -0,0 +1,172 @@
+# valmods/csv_rules.py
+"""
+Vectorized CSV rules driven by the `rules:` list of a CSV schema YAML.
+
+Every rule is evaluated as a whole-column pandas/NumPy operation that returns a
+boolean mask of offending rows; CSVValidator counts the offenders and keeps the
+first few row numbers. Supported kinds:
+
+    - {kind: nonempty, column: name}
+    - {kind: min, column: score, value: 0}          # also: max
+    - {kind: regex, column: code, pattern: "[A-Z]{3}-\\d+"}
+    - {kind: enum, column: instrument, values: [IRIS, MAG, IMG]}
+    - {kind: unique, column: id}
+    - {kind: compare, column: start, op: le, other: stop}   # numbers, or dates (optional format)
+    - {kind: date_range, column: obs_date, min: "2020-01-01", max: "2030-12-31", format: "%Y-%m-%d"}
+
+Any rule may carry a condition so it only applies to some rows:
+
+    - {kind: nonempty, column: units, when: {column: type, in: [float, int]}}
+
+`when` accepts `equals`, `in` or `notnull: true`.
+
+CSVValidator rejects a schema with an unknown kind, and reports a rule whose
+columns the file lacks as CSV-MISSING-COLUMN instead of letting it pass.
+"""
+import operator
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_COMPARE_OPS = {
+    "lt": operator.lt, "le": operator.le, "gt": operator.gt,
+    "ge": operator.ge, "eq": operator.eq, "ne": operator.ne,
+}
+_OP_WORDS = {"lt": "<", "le": "<=", "gt": ">", "ge": ">=", "eq": "==", "ne": "!="}
+
+
+def _nonempty(df: pd.DataFrame, r: dict, state: dict) -> pd.Series:
+    return df[r["column"]].isna()
+
+
+def _min(df: pd.DataFrame, r: dict, state: dict) -> pd.Series:
+    return pd.to_numeric(df[r["column"]], errors="coerce") < r["value"]
+
+
+def _max(df: pd.DataFrame, r: dict, state: dict) -> pd.Series:
+    return pd.to_numeric(df[r["column"]], errors="coerce") > r["value"]
+
+
+def _per_value(s: pd.Series, bad: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Evaluate `bad` once per distinct non-null value and broadcast back to the rows.
+    String checks (regex, enum, dates) are per-element under the hood, and typical
+    columns repeat a handful of values, so this keeps them near C speed.
+    """
+    codes, uniques = pd.factorize(s)
+    flags = np.asarray(bad(pd.Series(uniques)), dtype=bool)
+    out = np.zeros(len(s), dtype=bool)
+    present = codes >= 0
+    out[present] = flags[codes[present]]
+    return pd.Series(out, index=s.index)
+
+
+def _regex(df: pd.DataFrame, r: dict, state: dict) -> pd.Series:
+    if "compiled" not in state:
+        state["compiled"] = re.compile(r["pattern"])
+    pattern = state["compiled"]
+    return _per_value(df[r["column"]], lambda u: ~u.astype(str).str.fullmatch(pattern).fillna(False).astype(bool))
+
+
+def _enum(df: pd.DataFrame, r: dict, state: dict) -> pd.Series:
+    allowed = r["values"]
+    allowed_str = [str(v) for v in allowed]
+    return _per_value(df[r["column"]], lambda u: ~(u.isin(allowed) | u.astype(str).isin(allowed_str)))
+
+
+def _unique(df: pd.DataFrame, r: dict, state: dict) -> pd.Series:
+    s = df[r["column"]]
+    seen = state.setdefault("seen", None)
+    dup = s.duplicated(keep="first") & s.notna()
+    if seen is not None:
+        dup |= s.isin(seen)
+    # values from earlier chunks; a pandas Index keeps isin() vectorized
+    fresh = s[s.notna() & ~dup].unique()
+    state["seen"] = pd.Index(fresh) if seen is None else seen.append(pd.Index(fresh))
+    return dup
+
+
+def _comparable(a: pd.Series, b: pd.Series, fmt: Optional[str]) -> Tuple[pd.Series, pd.Series]:
+    """Both columns as numbers, or as dates if neither holds a number; other values become NaN/NaT."""
+    x, y = pd.to_numeric(a, errors="coerce"), pd.to_numeric(b, errors="coerce")
+    if x.notna().any() or y.notna().any():
+        return x, y
+    return pd.to_datetime(a, format=fmt, errors="coerce"), pd.to_datetime(b, format=fmt, errors="coerce")
+
+
+def _compare(df: pd.DataFrame, r: dict, state: dict) -> pd.Series:
+    a, b = df[r["column"]], df[r["other"]]
+    present = a.notna() & b.notna()
+    x, y = _comparable(a, b, r.get("format"))
+    # a present value that is not a number (or date) can't satisfy the comparison
+    return present & (x.isna() | y.isna() | ~_COMPARE_OPS[r.get("op", "le")](x, y))
+
+
+def _date_range(df: pd.DataFrame, r: dict, state: dict) -> pd.Series:
+    def bad(u: pd.Series) -> pd.Series:
+        dates = pd.to_datetime(u, format=r.get("format"), errors="coerce")
+        out = dates.isna()
+        if r.get("min") is not None:
+            out |= dates < pd.Timestamp(r["min"])
+        if r.get("max") is not None:
+            out |= dates > pd.Timestamp(r["max"])
+        return out
+    return _per_value(df[r["column"]], bad)
+
+
+# kind -> (issue type, mask function, message)
+RULES: Dict[str, Tuple[str, Callable[[pd.DataFrame, dict, dict], pd.Series], Callable[[dict], str]]] = {
+    "nonempty": ("CSV-RULE-NONEMPTY", _nonempty, lambda r: f"Empty values in {r['column']}"),
+    "min": ("CSV-RULE-MIN", _min, lambda r: f"{r['column']} below {r['value']}"),
+    "max": ("CSV-RULE-MAX", _max, lambda r: f"{r['column']} above {r['value']}"),
+    "regex": ("CSV-RULE-REGEX", _regex, lambda r: f"{r['column']} does not match /{r['pattern']}/"),
+    "enum": ("CSV-RULE-ENUM", _enum, lambda r: f"{r['column']} not in allowed values {r['values']}"),
+    "unique": ("CSV-RULE-UNIQUE", _unique, lambda r: f"Duplicate values in {r['column']}"),
+    "compare": (
+        "CSV-RULE-COMPARE", _compare,
+        lambda r: f"{r['column']} not {_OP_WORDS[r.get('op', 'le')]} {r['other']}",
+    ),
+    "date_range": (
+        "CSV-RULE-DATE", _date_range,
+        lambda r: f"{r['column']} not a date in [{r.get('min') or '-inf'}, {r.get('max') or '+inf'}]",
+    ),
+}
+
+
+def rule_columns(r: dict) -> List[str]:
+    """Every column a rule (and its condition) reads."""
+    cols = [r.get("column"), r.get("other"), (r.get("when") or {}).get("column")]
+    return [c for c in cols if c is not None]
+
+
+def _condition(df: pd.DataFrame, when: dict) -> pd.Series:
+    s = df[when["column"]]
+    if "equals" in when:
+        return s == when["equals"]
+    if "in" in when:
+        return s.isin(when["in"])
+    if when.get("notnull"):
+        return s.notna()
+    raise ValueError(f"Unsupported 'when' condition: {when}")
+
+
+def rule_mask(df: pd.DataFrame, r: dict, state: dict) -> Optional[pd.Series]:
+    """Boolean mask of the rows in `df` that break rule `r` (None if `df` lacks one of its columns)."""
+    if any(c not in df.columns for c in rule_columns(r)):
+        return None
+    mask = RULES[r["kind"]][1](df, r, state)
+    if r.get("when"):
+        mask = mask & _condition(df, r["when"])
+    return mask
+
+
+def rule_issue(r: dict) -> Tuple[str, str]:
+    """(issue_type, message) for a failing rule."""
+    issue_type, _, message = RULES[r["kind"]]
+    text = message(r)
+    if r.get("when"):
+        cond = {k: v for k, v in r["when"].items() if k != "column"}
+        text += f" where {r['when']['column']} {cond}"
+    return issue_type, text
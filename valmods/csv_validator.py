@@ -1,45 +1,239 @@
-from typing import List
+from typing import Dict, Iterator, List, Optional
+import io
 from pathlib import Path
 import pandas as pd, yaml
+from time import perf_counter
 from core.models import ValidationIssue
+from core import metrics
+from valmods.csv_rules import RULES, rule_columns, rule_issue, rule_mask
+from valmods.schema_cache import SchemaCache
+
+# How many offending row numbers to quote per failing check
+MAX_REPORTED_ROWS = 5
+
+ENGINES = ("pandas", "arrow")
+
+
+def _rows_note(rows: List[int], count: int) -> str:
+    more = ", …" if count > len(rows) else ""
+    return f" ({count} row(s): {', '.join(map(str, rows))}{more})"
+
+
+class _RuleState:
+    """Running offender count, first row numbers and rule scratch state across chunks."""
+
+    def __init__(self, max_rows: int = MAX_REPORTED_ROWS):
+        self.count = 0
+        self.rows: List[int] = []
+        self.max_rows = max_rows
+        self.context: dict = {}  # e.g. values already seen by a `unique` rule
+
+    def update(self, mask: pd.Series) -> None:
+        values = mask.to_numpy(dtype=bool)
+        n = int(values.sum())
+        if not n:
+            return
+        self.count += n
+        if len(self.rows) < self.max_rows:
+            self.rows.extend(mask.index[values][: self.max_rows - len(self.rows)].tolist())
+
 
 class CSVValidator:
     standard = "CSV"
 
-    def __init__(self, schema_yaml: str):
-        spec = yaml.safe_load(Path(schema_yaml).read_text())
+    def __init__(
+        self, schema_yaml: str, cache_dir: Optional[str] = None, chunksize: Optional[int] = None,
+        engine: Optional[str] = None, max_errors: Optional[int] = None,
+    ):
+        load = lambda: yaml.safe_load(Path(schema_yaml).read_text())
+        spec = SchemaCache(cache_dir).get_or_build("csv", [schema_yaml], load) if cache_dir else load()
         self.required = spec.get("required_columns", [])
         self.types = spec.get("types", {})
         self.rules = spec.get("rules", [])
+        for n, r in enumerate(self.rules):
+            if not isinstance(r, dict) or r.get("kind") not in RULES or not r.get("column"):
+                raise ValueError(f"{schema_yaml}: rule #{n} ({r!r}) needs a column and a kind, one of {list(RULES)}")
+        self.max_rows = spec.get("max_reported_rows", MAX_REPORTED_ROWS)
+        # Rows per chunk for streaming validation (None = read the whole file at once)
+        self.chunksize = chunksize or spec.get("chunksize")
+        # "pandas" (default) or "arrow": typed, column-pruned reads (see valmods.csv_arrow)
+        self.engine = engine or spec.get("engine", "pandas")
+        if self.engine not in ENGINES:
+            raise ValueError(f"CSV engine must be one of {ENGINES}, got {self.engine!r}")
+        # Per-file budget: once this many checks fail, the remaining rules and chunks are skipped
+        self.max_errors = max_errors
+        self.last_truncated = False
+        # Arrow engine: bytes per block (streamed when chunked; see valmods.csv_arrow)
+        self.block_size = spec.get("block_size")
+        if self.engine == "arrow":
+            from valmods.csv_arrow import ARROW_TYPES
+            unknown = {c: t for c, t in self.types.items() if t not in ARROW_TYPES}
+            if unknown:
+                raise ValueError(f"Unsupported CSV types {unknown}; the arrow engine knows {list(ARROW_TYPES)}")
+
+    def columns(self) -> List[str]:
+        """Every column the schema reads: required, typed, or used by a rule."""
+        cols = [*self.required, *self.types, *(c for r in self.rules for c in rule_columns(r))]
+        return list(dict.fromkeys(cols))
+
+    def _chunks(self, source) -> Iterator[pd.DataFrame]:
+        if self.chunksize:
+            yield from pd.read_csv(source, chunksize=self.chunksize)
+        else:
+            yield pd.read_csv(source)
 
     def validate(self, path: str) -> List[ValidationIssue]:
-        issues: List[ValidationIssue] = []
+        """
+        Validate a CSV file. With a chunksize the file is streamed and only one chunk
+        is held in memory; type and rule state carries across chunks, so the issues
+        are the same as for a whole-file read.
+        """
+        return self._validate_source(path)
+
+    def validate_bytes(self, data: bytes, name: str = "<bytes>") -> List[ValidationIssue]:
+        """Validate an in-memory CSV table."""
+        return self._validate_source(io.BytesIO(data))
+
+    def _unread(self, r: dict, columns: List[str]) -> List[str]:
+        """Columns rule `r` needs that the file lacks (required ones are reported on their own)."""
+        return [c for c in rule_columns(r) if c not in columns and c not in self.required]
+
+    def _spent(self, columns: List[str], failed_types: int, rule_states: List[_RuleState]) -> bool:
+        """Whether the failing checks so far (one issue each) use up `max_errors`."""
+        if self.max_errors is None or columns is None:
+            return False
+        missing = sum(c not in columns for c in self.required) + sum(1 for r in self.rules if self._unread(r, columns))
+        return missing + failed_types + sum(1 for s in rule_states if s.count) >= self.max_errors
+
+    def _validate_source(self, source) -> List[ValidationIssue]:
+        self.last_truncated = False
+        if self.engine == "arrow":
+            return self._validate_arrow(source)
+        columns: Optional[List[str]] = None
+        type_ok: Dict[str, bool] = {}
+        rule_states = [_RuleState(r.get("max_rows", self.max_rows)) for r in self.rules]
+
+        m = metrics.active
+        started = perf_counter() if m else 0.0
+        reader = self._chunks(source)
+        while True:
+            try:
+                df = next(reader)
+            except StopIteration:
+                break
+            except Exception as e:
+                return [ValidationIssue("CSV-PARSE", "error", path="$", message=str(e))]
+            if m:
+                started = m.lap("csv.read", started)
+            if self._spent(columns, list(type_ok.values()).count(False), rule_states):
+                self.last_truncated = True  # budget used up and there is more to read
+                break
+            if columns is None:
+                columns = list(df.columns)
+            # types
+            for col, t in self.types.items():
+                if col not in df.columns or not type_ok.get(col, True):
+                    continue
+                s = df[col].dropna()
+                type_ok[col] = (t=="int" and pd.api.types.is_integer_dtype(s)) or \
+                               (t=="float" and (pd.api.types.is_float_dtype(s) or pd.api.types.is_integer_dtype(s))) or \
+                               t == "str"  # every CSV value is text: nothing to check
+            # rules (vectorized, see valmods.csv_rules)
+            for r, state in zip(self.rules, rule_states):
+                if self._spent(columns, list(type_ok.values()).count(False), rule_states):
+                    self.last_truncated = True
+                    break
+                mask = rule_mask(df, r, state.context)
+                if mask is not None:
+                    state.update(mask)
+            if m:
+                started = m.lap("csv.checks", started)
+
+        failed = {col: "" for col, ok in type_ok.items() if not ok}
+        return self._issues(columns or [], failed, rule_states)
+
+    def _validate_arrow(self, source) -> List[ValidationIssue]:
+        """
+        Typed read of the referenced columns; only when a value fails to convert is
+        the file read again as strings to find (and count) every offending row.
+        """
+        import pyarrow as pa
+        from valmods.csv_arrow import header
+
         try:
-            df = pd.read_csv(path)
-        except Exception as e:
+            present = header(source)
+        except (OSError, UnicodeDecodeError) as e:
             return [ValidationIssue("CSV-PARSE", "error", path="$", message=str(e))]
+        wanted = [c for c in self.columns() if c in present]
+        for typed in (True, False):
+            try:
+                return self._arrow_pass(source, present, wanted, typed)
+            except pa.ArrowInvalid as e:
+                error = e
+                if hasattr(source, "seek"):
+                    source.seek(0)
+        return [ValidationIssue("CSV-PARSE", "error", path="$", message=str(error))]
+
+    def _arrow_pass(self, source, present: List[str], wanted: List[str], typed: bool) -> List[ValidationIssue]:
+        from valmods.csv_arrow import batches, frame
+
+        declared = {c: t for c, t in self.types.items() if c in wanted}
+        type_states = {c: _RuleState(self.max_rows) for c in declared}
+        rule_states = [_RuleState(r.get("max_rows", self.max_rows)) for r in self.rules]
+
+        m = metrics.active
+        started = perf_counter() if m else 0.0
+        offset = 0
+        self.last_truncated = False
+        failed_types = lambda: sum(1 for s in type_states.values() if s.count)
+        for table in batches(source, wanted, declared, typed=typed, stream=bool(self.chunksize),
+                             block_size=self.block_size):
+            if m:
+                started = m.lap("csv.read", started)
+            if self._spent(present, failed_types(), rule_states):
+                self.last_truncated = True
+                break
+            df, bad = frame(table, declared, typed)
+            df.index = pd.RangeIndex(offset, offset + len(df))  # row numbers run on across batches
+            offset += len(df)
+            for col, mask in bad.items():
+                type_states[col].update(pd.Series(mask, index=df.index))
+            for r, state in zip(self.rules, rule_states):
+                if self._spent(present, failed_types(), rule_states):
+                    self.last_truncated = True
+                    break
+                mask = rule_mask(df, r, state.context)
+                if mask is not None:
+                    state.update(mask)
+            if m:
+                started = m.lap("csv.checks", started)
+        failed = {col: _rows_note(state.rows, state.count) for col, state in type_states.items() if state.count}
+        return self._issues(present, failed, rule_states)
+
+    def _issues(self, columns: List[str], failed: Dict[str, str], rule_states: List[_RuleState]) -> List[ValidationIssue]:
+        """Issues in schema order; `failed` maps each column with bad types to a rows note (or "")."""
+        issues: List[ValidationIssue] = []
         # required
         for col in self.required:
-            if col not in df.columns:
+            if col not in columns:
                 issues.append(ValidationIssue("CSV-MISSING-COLUMN", "error", path="$", message=f"Missing column: {col}"))
         # types
         for col, t in self.types.items():
-            if col not in df.columns:
+            if col in failed:
+                issues.append(ValidationIssue("CSV-TYPE", "error", path=f"$.{col}", message=f"{col} expected {t}{failed[col]}"))
+        # rules
+        for r, state in zip(self.rules, rule_states):
+            unread = self._unread(r, columns)
+            if unread:
+                issues.append(ValidationIssue("CSV-MISSING-COLUMN", "error", "$",
+                                              f"Missing column for {r['kind']} rule on {r['column']}: {', '.join(unread)}",
+                                              rule=r["kind"]))
+            if not state.count:
                 continue
-            s = df[col].dropna()
-            ok = (t=="int" and pd.api.types.is_integer_dtype(s)) or \
-                 (t=="float" and (pd.api.types.is_float_dtype(s) or pd.api.types.is_integer_dtype(s))) or \
-                 (t=="str" and s.astype(str).dtype == object)
-            if not ok:
-                issues.append(ValidationIssue("CSV-TYPE", "error", path=f"$.{col}", message=f"{col} expected {t}"))
-        # simple rules
-        for r in self.rules:
-            kind, col = r.get("kind"), r.get("column")
-            if col not in df.columns: continue
-            if kind == "nonempty" and df[col].isna().any():
-                issues.append(ValidationIssue("CSV-RULE-NONEMPTY", "error", f"$.{col}", f"Empty values in {col}"))
-            if kind == "min" and (df[col] < r["value"]).any():
-                issues.append(ValidationIssue("CSV-RULE-MIN", "error", f"$.{col}", f"{col} below {r['value']}"))
-            if kind == "max" and (df[col] > r["value"]).any():
-                issues.append(ValidationIssue("CSV-RULE-MAX", "error", f"$.{col}", f"{col} above {r['value']}"))
+            issue_type, message = rule_issue(r)
+            note = _rows_note(state.rows, state.count)
+            issues.append(ValidationIssue(issue_type, "error", f"$.{r['column']}", f"{message}{note}", rule=r["kind"]))
+        if self.max_errors is not None and len(issues) > self.max_errors:
+            self.last_truncated = True
+            del issues[self.max_errors:]
         return issues
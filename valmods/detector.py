@@ -1,8 +1,13 @@
-
+import os
 from pathlib import Path
+
+_KINDS = {".xml": "xml", ".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+
+def kind_of(name: str) -> str:
+    """Kind from a bare file name (no Path object; cheap enough for millions of scandir entries)."""
+    return _KINDS.get(os.path.splitext(name)[1].lower(), "unknown")
+
+
 def detect_kind(p: Path) -> str:
-    ext = p.suffix.lower()
-    if ext == ".xml": return "xml"
-    if ext == ".json": return "json"
-    if ext == ".csv": return "csv"
-    return "unknown"
+    return kind_of(p.name)
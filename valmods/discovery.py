@@ -0,0 +1,138 @@
+# valmods/discovery.py
+"""
+Streaming discovery of the files to validate.
+
+The tree is walked with os.scandir (optionally listing directories on a thread
+pool, which pays off on network filesystems) and files are filtered as they are
+seen: by kind from the name alone, by --include/--exclude globs and by shard,
+so nothing is stat()ed or kept in memory unless it will be validated.
+
+Globs use fnmatch against the path relative to the target and against the bare
+name, so `*.bak`, `.git`, `raw/*` and `*/calibration/*` all do what they look
+like. An excluded directory is not descended into.
+
+Sharding hashes the relative path (CRC-32), so `--shard 2/4` selects the same
+files on every machine with no coordination, whatever the scan order.
+
+Orders: "scan" streams files as found; "size" (largest first, for balancing a
+worker pool) and "path" first collect the selected files.
+"""
+import os
+import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from valmods.detector import detect_kind, kind_of
+
+ORDERS = ("scan", "size", "path")
+
+Shard = Tuple[int, int]  # (index, count), index from 1
+
+
+def parse_shard(spec: str) -> Shard:
+    """'2/4' -> (2, 4); shards are numbered 1..N."""
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N (e.g. 2/4), got {spec!r}") from None
+    if not 1 <= i <= n:
+        raise ValueError(f"Shard index must be between 1 and {n}, got {i}")
+    return i, n
+
+
+def in_shard(rel: str, shard: Shard) -> bool:
+    i, n = shard
+    return zlib.crc32(rel.encode("utf-8", "surrogateescape")) % n == i - 1
+
+
+def _matches(rel: str, name: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatchcase(rel, p) or fnmatchcase(name, p) for p in patterns)
+
+
+def _list_dir(path: str, prefix: str, exclude: Sequence[str]) -> Tuple[List[Tuple[str, str, str]], List[Tuple[str, str]]]:
+    """One directory: its files as (rel, name, path) and its subdirectories as (path, rel prefix)."""
+    files, dirs = [], []
+    try:
+        it = os.scandir(path)
+    except OSError:  # unreadable or vanished directory: skip it, as rglob does
+        return files, dirs
+    with it:
+        for e in it:
+            rel = prefix + e.name
+            if exclude and _matches(rel, e.name, exclude):
+                continue
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    dirs.append((e.path, rel + "/"))
+                elif e.is_file():
+                    files.append((rel, e.name, e.path))
+            except OSError:
+                continue
+    return files, dirs
+
+
+def walk(root: str, exclude: Sequence[str] = (), threads: int = 1) -> Iterator[Tuple[str, str, str]]:
+    """(relative path, name, path) of every file under `root`, as directories are listed."""
+    if threads <= 1:
+        stack = [(root, "")]
+        while stack:
+            files, dirs = _list_dir(*stack.pop(), exclude)
+            yield from files
+            stack.extend(reversed(dirs))
+        return
+    # At most two listings per thread in flight, so a fast walk can't buffer the whole tree
+    todo, pending = deque([(root, "")]), set()
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="scandir") as ex:
+        while todo or pending:
+            while todo and len(pending) < 2 * threads:
+                pending.add(ex.submit(_list_dir, *todo.popleft(), exclude))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                files, dirs = fut.result()
+                todo.extend(dirs)
+                yield from files
+
+
+def _size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def discover(
+    target: str, *, kinds: Optional[Set[str]] = None, include: Sequence[str] = (), exclude: Sequence[str] = (),
+    shard: Optional[Shard] = None, order: str = "scan", threads: int = 1,
+) -> Iterator[Path]:
+    """The files under `target` to validate (see the module docstring); a file target is returned as is."""
+    if order not in ORDERS:
+        raise ValueError(f"order must be one of {ORDERS}, got {order!r}")
+    root = Path(target)
+    if root.is_file():
+        if kinds is None or detect_kind(root) in kinds:
+            yield root
+        return
+
+    selected: Iterable[Tuple[str, str, str]] = (
+        (rel, name, path) for rel, name, path in walk(str(root), exclude, threads)
+        if (kinds is None or kind_of(name) in kinds)
+        and (not include or _matches(rel, name, include))
+        and (shard is None or in_shard(rel, shard))
+    )
+    if order == "scan":
+        yield from (Path(path) for _, _, path in selected)
+        return
+    if order == "path":
+        yield from (Path(path) for _, _, path in sorted(selected))
+        return
+    picked = [(rel, path) for rel, _, path in selected]
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as ex:
+            sizes = list(ex.map(_size, (path for _, path in picked)))
+    else:
+        sizes = [_size(path) for _, path in picked]
+    ranked = sorted(zip(sizes, picked), key=lambda t: (-t[0], t[1][0]))
+    yield from (Path(path) for _, (_, path) in ranked)
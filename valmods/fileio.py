@@ -0,0 +1,100 @@
+# valmods/fileio.py
+"""
+Shared input access for the validators: each file is opened once and exposed
+as a single read-only buffer that every stage reads from.
+
+Files below `MMAP_THRESHOLD` are read into one bytes object (a single
+sequential read is the cheapest way over NFS); larger files are memory-mapped,
+so the parser pulls pages straight from the page cache instead of copying the
+file through read() calls. Both paths pass sequential read-ahead hints to the
+kernel where the platform supports them.
+
+    with open_input(path) as src:
+        prescreen(src.stream())         # iterparse the head
+        etree.parse(src.stream(), ...)  # same buffer, rewound
+        json.loads(src.text())          # decoded straight from the mapping
+"""
+import codecs
+import mmap
+import os
+from io import BytesIO
+from typing import BinaryIO, Optional, Union
+
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+class InputFile:
+    """One input's contents: `data` is bytes (small or in-memory inputs) or a read-only mmap."""
+
+    def __init__(self, data: Union[bytes, mmap.mmap], name: str = "<bytes>"):
+        self.data = data
+        self.name = name
+        self.size = len(data)
+        self.mapped = isinstance(data, mmap.mmap)
+
+    @classmethod
+    def open(cls, path: str, mmap_threshold: Optional[int] = None) -> "InputFile":
+        threshold = MMAP_THRESHOLD if mmap_threshold is None else mmap_threshold
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size < threshold:
+                _fadvise_sequential(f.fileno())
+                return cls(f.read(), str(path))
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # stays valid once f is closed
+        for advice in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+            if hasattr(mm, "madvise") and hasattr(mmap, advice):
+                mm.madvise(getattr(mmap, advice))
+        return cls(mm, str(path))
+
+    def stream(self) -> BinaryIO:
+        """A binary reader positioned at the start (the mapping itself, rewound, or a BytesIO view)."""
+        if self.mapped:
+            self.data.seek(0)
+            return self.data
+        return BytesIO(self.data)  # shares the bytes object until written to
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """The whole file decoded, without an intermediate bytes copy for mapped files."""
+        return str(self.data, encoding)
+
+    def text_stream(self, encoding: str = "utf-8") -> "TextReader":
+        """An incremental text reader over the buffer (multi-byte characters may span reads)."""
+        return TextReader(self.stream(), encoding)
+
+    def close(self) -> None:
+        if self.mapped:
+            self.data.close()
+
+    def __enter__(self) -> "InputFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TextReader:
+    """Minimal read(size)-only text stream: decodes chunks of a binary reader as they are read."""
+
+    def __init__(self, raw: BinaryIO, encoding: str = "utf-8"):
+        self._raw = raw
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+
+    def read(self, size: int = -1) -> str:
+        while True:
+            chunk = self._raw.read(size)
+            text = self._decoder.decode(chunk, final=not chunk)
+            if text or not chunk:  # "" only at end of input
+                return text
+
+
+def _fadvise_sequential(fd: int) -> None:
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # advisory only (e.g. unsupported on this filesystem)
+
+
+def open_input(path: str, mmap_threshold: Optional[int] = None) -> InputFile:
+    """Open `path` once for all validation stages; use as a context manager."""
+    return InputFile.open(path, mmap_threshold)
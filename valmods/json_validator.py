@@ -1,29 +1,224 @@
-from typing import List
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
 import json
+import time
 from jsonschema import Draft202012Validator
 from core.models import ValidationIssue
+from core import metrics
+from valmods.fileio import open_input
+from valmods.schema_cache import SchemaCache
+
+# Top-level arrays at least this large are validated element by element
+STREAM_THRESHOLD = 64 * 1024 * 1024
+_READ_SIZE = 1024 * 1024
+# Array-level keywords that per-element validation still honours exactly
+_STREAMABLE_KEYS = {"$schema", "$id", "$defs", "definitions", "title", "description", "$comment", "type", "items"}
+
+
+def _load_schema(schema_path: str) -> dict:
+    with open(schema_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _iter_array(f: TextIO) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time from a text stream."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill(need_more: bool = False) -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = f.read(_READ_SIZE * (4 if need_more else 1))
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_ws() -> Optional[str]:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return None
+
+    if skip_ws() != "[":
+        raise ValueError("Expected a top-level JSON array")
+    pos += 1
+    if skip_ws() == "]":
+        return
+    while True:
+        if skip_ws() is None:
+            raise ValueError("Unterminated JSON array")
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if not fill(need_more=True):
+                raise
+            continue
+        if end == len(buf) and fill():
+            continue  # a number may continue past the buffer edge; decode again
+        pos = end
+        yield value
+        sep = skip_ws()
+        pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {sep!r}")
+
+
+def _parse_error(e: ValueError) -> List[ValidationIssue]:
+    """A document that isn't JSON (or UTF-8), as a JSON-PARSE issue instead of an exception."""
+    return [ValidationIssue("JSON-PARSE", "error", path="$", message=str(e), line=getattr(e, "lineno", None))]
+
 
 class JSONValidator:
     standard = "JSON"
 
-    def __init__(self, schema_path: str):
-        with open(schema_path, "r", encoding="utf-8") as f:
-            self.schema = json.load(f)
+    def __init__(self, schema_path: str, cache_dir: Optional[str] = None, stream_threshold: int = STREAM_THRESHOLD,
+                 mmap_threshold: Optional[int] = None, max_errors: Optional[int] = None):
+        if cache_dir:
+            # The validator object holds an unpicklable ref resolver, so the parsed
+            # document is cached and the (cheap) validator wrapper is rebuilt.
+            self.schema = SchemaCache(cache_dir).get_or_build("json", [schema_path], lambda: _load_schema(schema_path))
+        else:
+            self.schema = _load_schema(schema_path)
         self.validator = Draft202012Validator(self.schema)
+        self.stream_threshold = stream_threshold
+        self.mmap_threshold = mmap_threshold  # None: valmods.fileio.MMAP_THRESHOLD
+        # Element validator for streaming large arrays; only when the array schema
+        # has no keywords (minItems, contains, ...) that need the whole array.
+        schema = self.schema if isinstance(self.schema, dict) else {}
+        items = schema.get("items")
+        self.item_validator = (
+            self.validator.evolve(schema=items)
+            if schema.get("type") == "array" and isinstance(items, dict) and set(schema) <= _STREAMABLE_KEYS
+            else None
+        )
+        # Throughput of the last streamed/JSONL run: {"records", "seconds", "records_per_s"};
+        # None after a whole-document parse. Runs with metrics count the records as json.records.
+        self.last_stats: Optional[dict] = None
+        # Per-file budget: stop after this many issues; last_truncated says whether it cut a file short
+        self.max_errors = max_errors
+        self.last_truncated = False
 
-    def validate(self, path: str) -> List[ValidationIssue]:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    def _room(self, issues: List[ValidationIssue]) -> Optional[int]:
+        """Issues the budget still allows for this file (None: unlimited)."""
+        return None if self.max_errors is None else self.max_errors - len(issues)
 
+    def _issues(self, validator, data: Any, prefix: Tuple = (), line: Optional[int] = None,
+                room: Optional[int] = None) -> List[ValidationIssue]:
         issues: List[ValidationIssue] = []
-        for err in self.validator.iter_errors(data):
+        for err in validator.iter_errors(data):
+            if room is not None and len(issues) >= room:
+                self.last_truncated = True
+                break
             issues.append(
                 ValidationIssue(
                     issue_type="JSON-SCHEMA",
                     severity="error",
-                    path=".".join(map(str, err.path)) or "$",
+                    path=".".join(map(str, (*prefix, *err.path))) or "$",
                     message=err.message,
                     suggestion=None,
+                    line=line,
                 )
             )
         return issues
+
+    def _record_stats(self, records: int, started: float) -> None:
+        seconds = time.perf_counter() - started
+        self.last_stats = {
+            "records": records, "seconds": seconds,
+            "records_per_s": records / seconds if seconds > 0 else float(records),
+        }
+
+    def validate(self, path: str) -> List[ValidationIssue]:
+        # One open per file: the head check, the streaming parser and json.loads share the buffer
+        self.last_truncated, self.last_stats = False, None
+        with open_input(path, self.mmap_threshold) as src:
+            if (self.item_validator is not None and src.size >= self.stream_threshold
+                    and src.data[:_READ_SIZE].lstrip().startswith(b"[")):
+                with metrics.stage("json.stream"):
+                    return self._validate_array(src.text_stream())
+
+            m = metrics.active
+            started = time.perf_counter() if m else 0.0
+            try:
+                data = json.loads(src.text())
+            except ValueError as e:  # includes json.JSONDecodeError and UnicodeDecodeError
+                return _parse_error(e)
+        if m:
+            started = m.lap("json.parse", started)
+        issues = self._issues(self.validator, data, room=self.max_errors)
+        if m:
+            m.lap("json.schema", started)
+        return issues
+
+    def validate_bytes(self, data: bytes, name: str = "<bytes>", lines: bool = False) -> List[ValidationIssue]:
+        """Validate an in-memory JSON document, or JSON Lines records with lines=True."""
+        self.last_truncated, self.last_stats = False, None
+        if lines:
+            return self._validate_records(data.decode("utf-8").splitlines())
+        try:
+            doc = json.loads(data)
+        except ValueError as e:
+            return _parse_error(e)
+        return self._issues(self.validator, doc, room=self.max_errors)
+
+    def validate_array_stream(self, path: str) -> List[ValidationIssue]:
+        """Validate a top-level array one element at a time (memory flat in file size)."""
+        with open_input(path, self.mmap_threshold) as src:
+            return self._validate_array(src.text_stream())
+
+    def _validate_array(self, f: TextIO) -> List[ValidationIssue]:
+        issues: List[ValidationIssue] = []
+        started, n = time.perf_counter(), 0
+        self.last_truncated = False
+        try:
+            for n, item in enumerate(_iter_array(f), start=1):
+                issues.extend(self._issues(self.item_validator, item, prefix=(n - 1,), room=self._room(issues)))
+                if self.last_truncated:
+                    break
+        except ValueError as e:  # includes json.JSONDecodeError
+            if self._room(issues) == 0:
+                self.last_truncated = True
+            else:
+                issues.append(ValidationIssue("JSON-PARSE", "error", path=str(n), message=str(e)))
+        self._record_stats(n, started)
+        return issues
+
+    def validate_lines(self, path: str) -> List[ValidationIssue]:
+        """
+        Validate a JSON Lines / NDJSON file: every non-blank line is one record,
+        checked against the full schema. Paths start with the record index and
+        issues carry the line number.
+        """
+        with open(path, "r", encoding="utf-8") as f, metrics.stage("json.lines"):
+            return self._validate_records(f)
+
+    def _validate_records(self, lines: Iterable[str]) -> List[ValidationIssue]:
+        issues: List[ValidationIssue] = []
+        started, n = time.perf_counter(), 0
+        self.last_truncated = False
+        for lineno, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                if self._room(issues) == 0:
+                    self.last_truncated = True
+                else:
+                    issues.append(ValidationIssue("JSON-PARSE", "error", path=str(n), message=str(e), line=lineno))
+            else:
+                issues.extend(self._issues(self.validator, record, prefix=(n,), line=lineno, room=self._room(issues)))
+            n += 1
+            if self.last_truncated:
+                break
+        self._record_stats(n, started)
+        return issues
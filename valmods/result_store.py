@@ -0,0 +1,76 @@
+# valmods/result_store.py
+"""
+SQLite store of previous ValidationReports for incremental re-validation.
+
+A stored report is reused when the file's content hash and the fingerprint of
+the schema set (every schema file and its imports, the validator version and
+the library versions) both match.
+"""
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Optional
+
+from core.models import ValidationReport
+from valmods import __version__
+from valmods.schema_cache import graph_digest
+
+_BLOCK = 1 << 20
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def schema_fingerprint(schema_paths: Iterable[Optional[str]], options: str = "") -> str:
+    """Identify the schema set, validator options and validator/library versions a result was produced with."""
+    return graph_digest(f"results|{__version__}", [p for p in schema_paths if p], extra=options)
+
+
+class ResultStore:
+    """Content-addressed cache of ValidationReports, scoped to one schema fingerprint."""
+
+    def __init__(self, db_path: str, fingerprint: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(db_path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " digest TEXT NOT NULL, fingerprint TEXT NOT NULL, report TEXT NOT NULL,"
+            " PRIMARY KEY (digest, fingerprint))"
+        )
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: str, file: str) -> Optional[ValidationReport]:
+        row = self.db.execute(
+            "SELECT report FROM results WHERE digest = ? AND fingerprint = ?", (digest, self.fingerprint)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        report = ValidationReport.from_dict(json.loads(row[0]))
+        report.file = file  # identical content may live under another name
+        return report
+
+    def put(self, digest: str, report: ValidationReport) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO results (digest, fingerprint, report) VALUES (?, ?, ?)",
+            (digest, self.fingerprint, json.dumps(report.to_dict())),
+        )
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,213 @@
+# valmods/routing.py
+"""
+Per-file schema routing, so a single run can validate a bundle that mixes PDS4
+IM versions and several JSON/CSV product types.
+
+A routes file is YAML with a `routes:` list:
+
+    routes:
+      - name: pds4-1k                            # optional, for messages
+        match:
+          glob: "*/calibration/*"                # relative path or name, as --include
+          namespace: http://pds.nasa.gov/pds4/pds/v1
+          root: Product_Observational
+          schema_location: "*PDS4_PDS_1K00.*"    # any xsi:schemaLocation / xml-model href
+        xsd: https://pds.nasa.gov/pds4/pds/v1/PDS4_PDS_1K00.xsd
+        sch: https://pds.nasa.gov/pds4/pds/v1/PDS4_PDS_1K00.sch
+      - match: {$schema: "https://example.org/telemetry/v2/*"}
+        json_schema: schemas/telemetry-v2.schema.json
+      - match: {glob: "*.csv"}
+        csv_schema: schemas/csv.schema.yaml
+
+Each match value is a glob, or a list of globs of which any may match, and
+every key given must match. A file goes to the first route that matches and has
+a schema for its kind. Files that no route takes use the run's own --xsd/--sch/
+--json-schema/--csv-schema, or get a ROUTE error if there are none for their
+kind. Relative schema paths are relative to the routes file.
+
+Content keys are read from the first SNIFF_BYTES of a file, once, and only if a
+candidate route asks for them: for XML, the root element's namespace and local
+name, plus the xsi:schemaLocation, xsi:noNamespaceSchemaLocation and xml-model
+hrefs; for JSON and JSON Lines, the first "$schema" value.
+
+Routes that name the same schemas share one ValidatorSet. It is built the first
+time a file is routed to it and reused for the rest of the run, or the rest of
+the worker process.
+"""
+import re
+from fnmatch import fnmatchcase
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import yaml
+
+from core.models import ValidationIssue, ValidationReport
+from valmods.detector import detect_kind
+from valmods.runner import ValidatorSet, supported_kinds
+
+SNIFF_BYTES = 16 * 1024
+_MATCH_KEYS = {"glob", "namespace", "root", "schema_location", "$schema"}
+_CONTENT_KEYS = _MATCH_KEYS - {"glob"}
+# routes-file key -> ValidatorSet argument
+_SCHEMA_KEYS = {"xsd": "xsd_path", "sch": "schematron_path", "json_schema": "json_schema_path",
+                "csv_schema": "csv_schema_path"}
+_KIND_SCHEMA = {"xml": "xsd_path", "json": "json_schema_path", "jsonl": "json_schema_path", "csv": "csv_schema_path"}
+_XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+_SCHEMA_ID = re.compile(rb'"\$schema"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+class Route(NamedTuple):
+    name: str
+    match: Dict[str, Tuple[str, ...]]   # key -> globs
+    schemas: Tuple[Tuple[str, str], ...]  # sorted ValidatorSet arguments
+
+    def accepts(self, kind: str) -> bool:
+        return _KIND_SCHEMA.get(kind) in dict(self.schemas)
+
+
+def _globs(value) -> Tuple[str, ...]:
+    return tuple(str(v) for v in value) if isinstance(value, list) else (str(value),)
+
+
+def _any(values: Sequence[str], globs: Sequence[str]) -> bool:
+    return any(fnmatchcase(v, g) for v in values for g in globs)
+
+
+def _schema_path(base: Path, ref: str) -> str:
+    if urlparse(ref).scheme in ("http", "https") or Path(ref).is_absolute():
+        return ref
+    return str(base / ref)
+
+
+def load_routes(path: str) -> List[Route]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    entries = data.get("routes", []) if isinstance(data, dict) else data
+    base = Path(path).parent
+    routes = []
+    for n, r in enumerate(entries):
+        match = (r.get("match") or {}) if isinstance(r, dict) else None
+        if not isinstance(match, dict):
+            raise ValueError(f"{path}: route #{n} must be a mapping with a `match` mapping")
+        unknown = sorted((set(r) - set(_SCHEMA_KEYS) - {"name", "match"}) | (set(match) - _MATCH_KEYS))
+        schemas = {_SCHEMA_KEYS[k]: _schema_path(base, str(r[k])) for k in _SCHEMA_KEYS if r.get(k)}
+        if unknown or not (schemas.keys() & set(_KIND_SCHEMA.values())):
+            raise ValueError(f"{path}: route #{n} needs xsd, json_schema or csv_schema (unknown keys: {unknown})")
+        routes.append(Route(str(r.get("name") or f"route-{n}"), {k: _globs(v) for k, v in match.items()},
+                            tuple(sorted(schemas.items()))))
+    return routes
+
+
+def route_schemas(path: str) -> List[str]:
+    """Every schema a routes file names (for fingerprints)."""
+    return sorted({p for r in load_routes(path) for _, p in r.schemas})
+
+
+def sniff(head: bytes, kind: str) -> Dict[str, Tuple[str, ...]]:
+    """The content match values of a file from its first bytes; missing ones are empty."""
+    if kind in ("json", "jsonl"):
+        m = _SCHEMA_ID.search(head)
+        return {"$schema": (m.group(1).decode("utf-8", "replace"),) if m else ()}
+    if kind != "xml":
+        return {}
+    from lxml import etree
+    found = {"namespace": (), "root": (), "schema_location": ()}
+    locations: List[str] = []
+    try:
+        for event, el in etree.iterparse(BytesIO(head), events=("pi", "start"), resolve_entities=False):
+            if event == "pi":
+                if el.target == "xml-model" and el.get("href"):
+                    locations.append(el.get("href"))
+                continue
+            ns, _, local = el.tag[1:].partition("}") if el.tag.startswith("{") else ("", "", el.tag)
+            locations += el.get(f"{{{_XSI_NS}}}schemaLocation", "").split()[1::2]
+            locations += el.get(f"{{{_XSI_NS}}}noNamespaceSchemaLocation", "").split()
+            found.update(namespace=(ns,), root=(local,))
+            break
+    except etree.XMLSyntaxError:
+        pass  # a malformed head: only what came before the error
+    found["schema_location"] = tuple(locations)
+    return found
+
+
+def _head(path: Path) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read(SNIFF_BYTES)
+    except OSError:
+        return b""
+
+
+class Router:
+    """Validates each file with the ValidatorSet of its route (see the module docstring)."""
+
+    def __init__(self, routes: str, route_root: Optional[str] = None, **config):
+        self.source = routes
+        self.routes = load_routes(routes)
+        self.root = Path(route_root) if route_root else None
+        # Run-wide options (cache, budgets, CSV engine...) and the fallback schemas
+        self.config = config
+        self.fallback = ValidatorSet(**config)
+        self.pool: Dict[tuple, ValidatorSet] = {}
+        self.kinds = supported_kinds(config) | {k for r in self.routes for k in supported_kinds(dict(r.schemas))}
+        self.last_sniffed: Dict[str, Tuple[str, ...]] = {}
+
+    def validators(self, route: Route) -> ValidatorSet:
+        vs = self.pool.get(route.schemas)
+        if vs is None:
+            options = {k: v for k, v in self.config.items() if k not in _SCHEMA_KEYS.values()}
+            vs = self.pool[route.schemas] = ValidatorSet(**options, **dict(route.schemas))
+        return vs
+
+    def route(self, rel: str, name: str, kind: str, head: Callable[[], bytes]) -> Optional[Route]:
+        """The first route for this file; `head` is called at most once, if content is needed."""
+        self.last_sniffed = {}
+        sniffed = None
+        for r in self.routes:
+            if not r.accepts(kind):
+                continue
+            if "glob" in r.match and not _any((rel, name), r.match["glob"]):
+                continue
+            if r.match.keys() & _CONTENT_KEYS:
+                if sniffed is None:
+                    sniffed = self.last_sniffed = sniff(head(), kind)
+                if not all(_any(sniffed.get(k, ()), g) for k, g in r.match.items() if k != "glob"):
+                    continue
+            return r
+        return None
+
+    def _rel(self, p: Path) -> str:
+        try:
+            rel = p.relative_to(self.root).as_posix() if self.root else p.name
+        except ValueError:
+            rel = p.name
+        return p.name if rel == "." else rel
+
+    def _unrouted(self, file: str, kind: str) -> Optional[ValidationReport]:
+        if kind not in self.kinds:
+            return None
+        seen = ", ".join(f"{k} {v[0]}" for k, v in self.last_sniffed.items() if v)
+        message = f"No route in {self.source} matches this file and no default schema is set for {kind} files"
+        return ValidationReport(file=file, issues=[ValidationIssue(
+            "ROUTE", "error", "$", message + (f" (found {seen})" if seen else ""))])
+
+    def validate(self, p: Path) -> Optional[ValidationReport]:
+        kind = detect_kind(p)
+        route = self.route(self._rel(p), p.name, kind, lambda: _head(p))
+        report = (self.validators(route) if route else self.fallback).validate(p)
+        return report or self._unrouted(str(p), kind)
+
+    def validate_bytes(self, data: bytes, name: str, kind: str | None = None) -> Optional[ValidationReport]:
+        kind = kind or detect_kind(Path(name))
+        route = self.route(name, Path(name).name, kind, lambda: data[:SNIFF_BYTES])
+        report = (self.validators(route) if route else self.fallback).validate_bytes(data, name, kind)
+        return report or self._unrouted(name, kind)
+
+    def load(self) -> "Router":
+        """Build the fallback and every route's validators now (for long-running processes)."""
+        self.fallback.load()
+        for r in self.routes:
+            self.validators(r).load()
+        return self
@@ -1,35 +1,335 @@
 # valmods/runner.py
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from importlib.util import find_spec
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Tuple
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 from valmods.detector import detect_kind
-from valmods.xml_validator import XMLValidator
-from valmods.json_validator import JSONValidator
-try:
-    from valmods.csv_validator import CSVValidator
-except Exception:
-    CSVValidator = None
+from valmods.discovery import Shard, discover
+from valmods.result_store import ResultStore, file_digest
 from core.models import ValidationReport
+from core import metrics
+
+
+# CSV support is optional (pandas); checked without importing it
+HAS_CSV = find_spec("pandas") is not None
+
+
+class ValidatorSet:
+    """
+    The configured validators, dispatched to by file kind. Each validator (and
+    its dependencies: xmlschema/lxml, jsonschema, pandas) is imported and built
+    the first time a file of its kind is seen, so a run over one JSON file never
+    loads the XML or CSV stacks. `load()` builds them all up front.
+
+    `max_errors` is a per-file budget: each validator stops once a file has that
+    many issues, and the report is marked `truncated`. `schema_catalog` is an
+    offline schema bundle (valmods.schema_catalog) for XSD/Schematron URLs.
+    """
+
+    def __init__(
+        self, *, xsd_path: str | None = None, json_schema_path: str | None = None,
+        csv_schema_path: str | None = None, schematron_path: str | None = None,
+        schema_cache_dir: str | None = None, csv_chunksize: int | None = None,
+        csv_engine: str | None = None, max_errors: int | None = None, schema_catalog: str | None = None
+    ):
+        self.xsd_path, self.schematron_path = xsd_path, schematron_path
+        self.json_schema_path, self.csv_schema_path = json_schema_path, csv_schema_path
+        self.schema_cache_dir, self.csv_chunksize, self.max_errors = schema_cache_dir, csv_chunksize, max_errors
+        self.csv_engine, self.schema_catalog = csv_engine, schema_catalog
+
+    @cached_property
+    def xml(self):
+        if not self.xsd_path:
+            return None
+        from valmods.xml_validator import XMLValidator
+        return XMLValidator(self.xsd_path, schematron_path=self.schematron_path,
+                            cache_dir=self.schema_cache_dir, max_errors=self.max_errors, catalog=self.schema_catalog)
+
+    @cached_property
+    def json(self):
+        if not self.json_schema_path:
+            return None
+        from valmods.json_validator import JSONValidator
+        return JSONValidator(self.json_schema_path, cache_dir=self.schema_cache_dir, max_errors=self.max_errors)
+
+    @cached_property
+    def csv(self):
+        if not (self.csv_schema_path and HAS_CSV):
+            return None
+        from valmods.csv_validator import CSVValidator
+        return CSVValidator(self.csv_schema_path, cache_dir=self.schema_cache_dir, chunksize=self.csv_chunksize,
+                            engine=self.csv_engine, max_errors=self.max_errors)
+
+    def load(self) -> "ValidatorSet":
+        """Build every configured validator now (for long-running processes)."""
+        for kind in ("xml", "json", "csv"):
+            getattr(self, kind)
+        return self
+
+    def _record(self, m: metrics.Metrics, kind: str, file: str, nbytes: int, started: float, issues) -> None:
+        if kind == "xml":
+            for stage, seconds in self.xml.last_stats.items():
+                m.add(f"xml.{stage}", seconds)
+        elif kind in ("json", "jsonl") and self.json.last_stats:
+            # the time is already in json.stream / json.lines: records over those seconds is the rate
+            m.counters["json.records"] += self.json.last_stats["records"]
+        m.file_done(file, kind, nbytes, perf_counter() - started, issues)
+
+    def validate(self, p: Path) -> Optional[ValidationReport]:
+        m = metrics.active
+        started = perf_counter() if m else 0.0
+        kind = detect_kind(p)
+        if kind == "xml" and self.xml:
+            v, issues = self.xml, self.xml.validate(str(p))
+        elif kind == "json" and self.json:
+            v, issues = self.json, self.json.validate(str(p))
+        elif kind == "jsonl" and self.json:
+            v, issues = self.json, self.json.validate_lines(str(p))
+        elif kind == "csv" and self.csv:
+            v, issues = self.csv, self.csv.validate(str(p))
+        else:
+            return None
+        if m:
+            self._record(m, kind, str(p), p.stat().st_size, started, issues)
+        return ValidationReport(file=str(p), issues=issues, truncated=v.last_truncated)
+
+    def validate_bytes(self, data: bytes, name: str, kind: str | None = None) -> Optional[ValidationReport]:
+        """Validate an in-memory file; the kind comes from `name` unless given."""
+        m = metrics.active
+        started = perf_counter() if m else 0.0
+        kind = kind or detect_kind(Path(name))
+        if kind == "xml" and self.xml:
+            v, issues = self.xml, self.xml.validate_bytes(data, name)
+        elif kind in ("json", "jsonl") and self.json:
+            v, issues = self.json, self.json.validate_bytes(data, name, lines=(kind == "jsonl"))
+        elif kind == "csv" and self.csv:
+            v, issues = self.csv, self.csv.validate_bytes(data, name)
+        else:
+            return None
+        if m:
+            self._record(m, kind, name, len(data), started, issues)
+        return ValidationReport(file=name, issues=issues, truncated=v.last_truncated)
+
+
+def supported_kinds(config: dict) -> set:
+    kinds = set()
+    if config.get("xsd_path"): kinds.add("xml")
+    if config.get("json_schema_path"): kinds.update(("json", "jsonl"))
+    if config.get("csv_schema_path") and HAS_CSV: kinds.add("csv")
+    if config.get("routes"):
+        from valmods.routing import load_routes
+        for route in load_routes(config["routes"]):
+            kinds |= supported_kinds(dict(route.schemas))
+    return kinds
+
+
+def build_validators(config: dict):
+    """A ValidatorSet for the config, or a Router (valmods.routing) when it has `routes`."""
+    if config.get("routes"):
+        from valmods.routing import Router
+        return Router(**config)
+    return ValidatorSet(**config)
+
+
+# Per-process validators for the worker pool (built once by the initializer)
+_worker_validators = None
+
+def _init_worker(config: dict, profile: bool = False) -> None:
+    global _worker_validators
+    _worker_validators = build_validators(config)
+    if profile:
+        metrics.enable()
+
+def _validate_in_worker(paths: List[Path]) -> Tuple[List[ValidationReport], Optional[dict]]:
+    """Reports for one batch, plus its metrics delta when profiling."""
+    reports = [_worker_validators.validate(p) for p in paths]
+    return reports, (metrics.active.drain() if metrics.active else None)
+
+
+def _validate_paths(
+    files: Iterable[Path], config: dict, workers: int, chunksize: int | None
+) -> Iterator[Tuple[Path, ValidationReport]]:
+    """
+    (path, report) for `files` in order, serially or from a process pool.
+    `files` is consumed lazily: at most two batches per worker are in flight,
+    so a streamed file list is never held in memory.
+    """
+    files = iter(files)
+    head = list(islice(files, 2))
+    if workers <= 1 or len(head) < 2:
+        validators = build_validators(config)
+        for p in chain(head, files):
+            yield p, validators.validate(p)
+        return
+
+    if chunksize is None:
+        chunksize = 8
+    m = metrics.active
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config, m is not None)) as ex:
+        batches = iter(lambda: list(islice(files, chunksize)), [])
+        submit = lambda batch: (batch, ex.submit(_validate_in_worker, batch))
+        pending = deque(map(submit, chain([head], islice(batches, 2 * workers - 1))))
+        try:
+            while pending:
+                batch, future = pending.popleft()
+                reports, delta = future.result()
+                pending.extend(map(submit, islice(batches, 1)))
+                if delta and m:
+                    m.merge(delta)
+                yield from zip(batch, reports)
+        finally:  # closed early (error budget spent): drop the batches not yet started
+            for _, future in pending:
+                future.cancel()
+
+
+def _with_store(
+    files: Iterable[Path], store: ResultStore, config: dict, workers: int, chunksize: int | None
+) -> Iterator[Tuple[Path, ValidationReport]]:
+    """Stored reports for unchanged files; the rest are validated (and stored) in order."""
+    files = list(files)
+    with metrics.stage("store.lookup"):
+        digests = [file_digest(p) for p in files]
+        stored = [store.get(d, str(p)) for p, d in zip(files, digests)]
+    fresh = _validate_paths([p for p, r in zip(files, stored) if r is None], config, workers, chunksize)
+    try:
+        for p, digest, report in zip(files, digests, stored):
+            if report is None:
+                _, report = next(fresh)
+                with metrics.stage("store.put"):
+                    store.put(digest, report)
+            yield p, report
+    finally:
+        fresh.close()
+
+
+class _Counted:
+    """Discovered files, counting those handed out, so a stopped run can tell whether any were left."""
+
+    def __init__(self, files: Iterable[Path]):
+        self.files, self.taken = iter(files), 0
+
+    def __iter__(self) -> "_Counted":
+        return self
+
+    def __next__(self) -> Path:
+        p = next(self.files)
+        self.taken += 1
+        return p
+
+    def left(self, reported: int) -> bool:
+        """Whether files were handed out but not reported, or discovery has more."""
+        return self.taken > reported or next(self.files, None) is not None
+
+
+def _within_budget(
+    pairs: Iterator[Tuple[Path, ValidationReport]], budget: int | None,
+    files: _Counted | None = None, on_stop: Callable[[], None] | None = None,
+) -> Iterator[Tuple[Path, ValidationReport]]:
+    """
+    Pass (path, report) pairs through until `budget` errors have been reported in
+    total, then stop (closing `pairs` cancels pending work). The report that
+    overshoots is cut to the remaining budget and marked truncated. `on_stop` is
+    called if that left any of `files` unreported.
+    """
+    if budget is None:
+        yield from pairs
+        return
+    left = budget
+    try:
+        for n, (p, report) in enumerate(pairs, start=1):
+            errors = report.error_count
+            if errors > left:
+                kept, kept_errors = [], 0
+                for issue in report.issues:
+                    if issue.severity == "error":
+                        if kept_errors == left:
+                            break
+                        kept_errors += 1
+                    kept.append(issue)
+                report.issues, report.truncated = kept, True
+            left -= report.error_count
+            yield p, report
+            if left <= 0:
+                if on_stop and (files is None or files.left(n)):
+                    on_stop()
+                return
+    finally:
+        pairs.close()
+
+
+def iter_validation(
+    target: str, *, xsd_path: str | None, json_schema_path: str | None,
+    csv_schema_path: str | None = None, schematron_path: str | None = None,
+    schema_cache_dir: str | None = None, schema_catalog: str | None = None, routes: str | None = None,
+    csv_chunksize: int | None = None, csv_engine: str | None = None,
+    max_errors: int | None = None, max_total_errors: int | None = None, workers: int = 1,
+    chunksize: int | None = None, store: ResultStore | None = None, include: Sequence[str] = (),
+    exclude: Sequence[str] = (), shard: Shard | None = None, order: str = "scan", scan_threads: int = 1,
+    on_stop: Callable[[], None] | None = None,
+) -> Iterator[Tuple[Path, ValidationReport]]:
+    """
+    Validate every supported file under `target`, yielding (path, report) pairs.
+
+    Files are discovered lazily (valmods.discovery: include/exclude globs, shard
+    i/N). order="scan" streams them; "size" (largest first) balances a worker
+    pool better but collects the file list first.
+
+    With workers > 1 files are sent in batches to a process pool whose workers each
+    build the validators once; results still come back in discovery order, so the
+    output is identical to a serial run in the same order. With a `store`, files whose content and
+    schema fingerprint are unchanged reuse their stored report and only the rest
+    are validated.
+
+    With `routes` (a routes YAML, see valmods.routing) each file is validated
+    against the schemas of its route, the other schema arguments being the
+    fallback, so a bundle of mixed schema versions takes a single pass.
+
+    Error budgets: `max_errors` per file (see ValidatorSet) and `max_total_errors`
+    for the run, after which iteration stops and pending files are cancelled.
+    No single file may use more than the run's budget, so the tighter of the two
+    applies per file. Truncated reports have `truncated` set, and `on_stop` is
+    called when the run's budget left files unvalidated.
+    """
+    if max_total_errors is not None:
+        max_errors = min(max_errors or max_total_errors, max_total_errors)
+    config = dict(
+        xsd_path=xsd_path, json_schema_path=json_schema_path,
+        csv_schema_path=csv_schema_path, schematron_path=schematron_path,
+        schema_cache_dir=schema_cache_dir, schema_catalog=schema_catalog, csv_chunksize=csv_chunksize,
+        csv_engine=csv_engine, max_errors=max_errors,
+    )
+    if routes:
+        config.update(routes=routes, route_root=target)
+    files = discover(
+        target, kinds=supported_kinds(config), include=include, exclude=exclude, shard=shard,
+        order=order, threads=scan_threads,
+    )
+    files = _Counted(metrics.timed("discovery", files))
+
+    if store is None:
+        pairs = _validate_paths(files, config, workers, chunksize)
+    else:
+        pairs = _with_store(files, store, config, workers, chunksize)
+    yield from _within_budget(pairs, max_total_errors, files, on_stop)
+
 
 def run_validation(
     target: str, *, xsd_path: str | None, json_schema_path: str | None,
-    csv_schema_path: str | None = None, schematron_path: str | None = None  # NEW
+    csv_schema_path: str | None = None, schematron_path: str | None = None,
+    schema_cache_dir: str | None = None, schema_catalog: str | None = None, routes: str | None = None,
+    csv_chunksize: int | None = None, csv_engine: str | None = None,
+    max_errors: int | None = None, max_total_errors: int | None = None, workers: int = 1,
+    store: ResultStore | None = None, **discovery
 ) -> List[Tuple[Path, ValidationReport]]:
-    root = Path(target)
-    files = [root] if root.is_file() else [p for p in root.rglob("*") if p.is_file()]
-    xml_v = XMLValidator(xsd_path, schematron_path=schematron_path) if xsd_path else None  # CHANGED
-    json_v = JSONValidator(json_schema_path) if json_schema_path else None
-    csv_v = CSVValidator(csv_schema_path) if (csv_schema_path and CSVValidator) else None
-
-    results = []
-    for p in files:
-        kind = detect_kind(p)
-        if kind == "xml" and xml_v:
-            issues = xml_v.validate(str(p))
-        elif kind == "json" and json_v:
-            issues = json_v.validate(str(p))
-        elif kind == "csv" and csv_v:
-            issues = csv_v.validate(str(p))
-        else:
-            continue
-        results.append((p, ValidationReport(file=str(p), issues=issues)))
-    return results
+    """All of iter_validation's pairs as a list; `discovery` takes its include/exclude/shard/order/scan_threads."""
+    return list(iter_validation(
+        target, xsd_path=xsd_path, json_schema_path=json_schema_path,
+        csv_schema_path=csv_schema_path, schematron_path=schematron_path,
+        schema_cache_dir=schema_cache_dir, schema_catalog=schema_catalog, routes=routes, csv_chunksize=csv_chunksize,
+        csv_engine=csv_engine, max_errors=max_errors, max_total_errors=max_total_errors, workers=workers,
+        store=store, **discovery,
+    ))
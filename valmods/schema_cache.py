@@ -0,0 +1,189 @@
+# valmods/schema_cache.py
+"""
+Persistent cache of compiled schemas (XSD, Schematron XSLT, JSON Schema, CSV spec).
+
+Entries are keyed by a content hash over the schema file *and* everything it
+pulls in through xs:import/include/redefine/override or sch:include, plus the
+library versions that produced the compiled object. The directory is bounded in
+size and evicts least-recently-used entries.
+"""
+import hashlib
+import os
+import pickle
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_XSD_NS = "http://www.w3.org/2001/XMLSchema"
+_SCH_NS = "http://purl.oclc.org/dsdl/schematron"
+# JSON/YAML schemas have no XML dependencies; skipping them keeps lxml unloaded
+_NON_XML_SUFFIXES = {".json", ".yaml", ".yml"}
+
+
+@lru_cache(maxsize=None)
+def _ref_xpath():
+    from lxml import etree
+    return etree.XPath(
+        "//xs:import/@schemaLocation | //xs:include/@schemaLocation"
+        " | //xs:redefine/@schemaLocation | //xs:override/@schemaLocation"
+        " | //sch:include/@href",
+        namespaces={"xs": _XSD_NS, "sch": _SCH_NS},
+    )
+
+
+def user_cache_dir() -> str:
+    """Per-user cache root: $XDG_CACHE_HOME (else ~/.cache)/aiops-data-validator."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "aiops-data-validator")
+
+
+def default_cache_dir() -> str:
+    return os.environ.get("AIOPS_SCHEMA_CACHE") or os.path.join(user_cache_dir(), "schemas")
+
+
+def private_dir(path) -> Path:
+    """
+    Create `path` (mode 0700) and make sure only the current user can write to
+    it: caches are loaded from it (pickles, schemas), so a directory someone else
+    created or can write to is refused rather than trusted.
+    """
+    directory = Path(path)
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if hasattr(os, "getuid"):  # POSIX only
+        st = directory.stat()
+        if st.st_uid != os.getuid() or st.st_mode & 0o022:
+            raise PermissionError(f"Refusing to use cache directory {directory}: it must be owned by the current user "
+                                  "and not writable by group or others")
+    return directory
+
+
+def _is_url(ref: str) -> bool:
+    return urlparse(ref).scheme in ("http", "https", "file")
+
+
+def schema_graph(path: str) -> List[str]:
+    """
+    The schema file followed by every local file it imports/includes, transitively.
+    Remote locations are returned as URLs (they are hashed by name, not content).
+    """
+    seen: List[str] = []
+    todo = [path if _is_url(path) else str(Path(path).resolve())]
+    while todo:
+        ref = todo.pop(0)
+        if ref in seen:
+            continue
+        seen.append(ref)
+        if _is_url(ref) or not os.path.exists(ref) or Path(ref).suffix.lower() in _NON_XML_SUFFIXES:
+            continue
+        from lxml import etree
+        try:
+            doc = etree.parse(ref)
+        except etree.XMLSyntaxError:
+            continue  # not XML after all
+        for loc in _ref_xpath()(doc):
+            target = urljoin(Path(ref).as_uri(), loc) if not _is_url(loc) else loc
+            if target.startswith("file://"):
+                target = str(Path(urlparse(target).path).resolve())
+            todo.append(target)
+    return seen
+
+
+@lru_cache(maxsize=None)
+def _library_versions() -> str:
+    # Read from package metadata so hashing a JSON schema doesn't import the XML stack
+    from importlib.metadata import version
+
+    def v(dist: str) -> str:
+        try:
+            return version(dist)
+        except Exception:
+            return "?"
+
+    return "|".join([
+        f"fmt={CACHE_FORMAT}", f"py={sys.version_info[:2]}", f"lxml={v('lxml')}",
+        f"xmlschema={v('xmlschema')}", f"jsonschema={v('jsonschema')}",
+    ])
+
+
+def graph_digest(kind: str, sources: Iterable[str], extra: str = "") -> str:
+    """sha256 over the library versions and the full import/include graph of each source."""
+    h = hashlib.sha256()
+    h.update(f"{kind}|{_library_versions()}|{extra}".encode("utf-8"))
+    for src in sources:
+        for ref in schema_graph(src):
+            h.update(b"\0" + ref.encode("utf-8") + b"\0")
+            if not _is_url(ref) and os.path.exists(ref):
+                h.update(Path(ref).read_bytes())
+    return h.hexdigest()
+
+
+class SchemaCache:
+    """Size-bounded, LRU-evicting on-disk store for compiled schema objects."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = private_dir(directory or default_cache_dir())
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, kind: str, sources: Iterable[str], extra: str = "") -> str:
+        return graph_digest(kind, sources, extra)
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def get(self, key: str):
+        entry = self._entry(key)
+        try:
+            with open(entry, "rb") as f:
+                obj = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        os.utime(entry)  # bump recency for LRU eviction
+        return obj
+
+    def put(self, key: str, obj) -> None:
+        entry = self._entry(key)
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for p in self.directory.glob("*.pkl"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                pass
+            total -= size
+
+    def get_or_build(self, kind: str, sources: Iterable[str], build: Callable[[], object], extra: str = ""):
+        """Return the cached object for these schema sources, compiling and storing it on a miss."""
+        key = self.key(kind, list(sources), extra)
+        obj = self.get(key)
+        if obj is not None:
+            self.hits += 1
+            return obj
+        self.misses += 1
+        obj = build()
+        try:
+            self.put(key, obj)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            pass  # uncachable objects still work, they are just rebuilt next time
+        return obj
@@ -0,0 +1,234 @@
+# valmods/schema_catalog.py
+"""
+Offline schema bundles: prefetch remote XSD/Schematron files and everything they
+import or include, then build validators without touching the network.
+
+    python -m valmods.schema_catalog https://pds.nasa.gov/pds4/pds/v1/PDS4_PDS_1K00.xsd \\
+        https://pds.nasa.gov/pds4/pds/v1/PDS4_PDS_1K00.sch --bundle /data/pds4-schemas
+
+A bundle directory keeps one immutable version per distinct set of schema
+contents, and a `current` file naming the newest:
+
+    <bundle>/current
+    <bundle>/<version>/catalog.json    URL -> file, sha256, target namespace
+    <bundle>/<version>/catalog.xml     the same mapping as an OASIS XML catalog (xmllint etc.)
+    <bundle>/<version>/files/<host>/<path>
+
+Files are laid out like their URLs, so relative schemaLocation/href references
+resolve inside the bundle as they did on the server. Absolute URLs go through
+the catalog: xmlschema gets namespace location hints (tried before the remote
+location of an xs:import) and may only read local files, and a Schematron's
+sch:include hrefs are pointed at the bundled files before lxml expands them.
+Each file's sha256 is checked when a catalog is loaded. xmlschema consults the hints for xs:import only, so an
+xs:include of an absolute URL is not remapped (PDS4 dictionaries import by
+namespace).
+
+Sources may also be local schemas, e.g. a mission XSD that imports the PDS4
+dictionaries: their remote dependencies are bundled, the local files are not.
+"""
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import tempfile
+import urllib.request
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlparse
+from xml.sax.saxutils import quoteattr
+
+CATALOG_FORMAT = 1
+CATALOG = "catalog.json"
+CURRENT = "current"
+
+_XSD_NS = "http://www.w3.org/2001/XMLSchema"
+_SCH_NS = "http://purl.oclc.org/dsdl/schematron"
+_REF_TAGS = {
+    f"{{{_XSD_NS}}}import": "schemaLocation", f"{{{_XSD_NS}}}include": "schemaLocation",
+    f"{{{_XSD_NS}}}redefine": "schemaLocation", f"{{{_XSD_NS}}}override": "schemaLocation",
+    f"{{{_SCH_NS}}}include": "href",
+}
+
+
+class CatalogError(ValueError):
+    """A bundle that is missing, doesn't match its hashes or doesn't cover a location."""
+
+
+def _remote(ref: str) -> bool:
+    return urlparse(ref).scheme in ("http", "https")
+
+
+def _download(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=30) as r:
+        return r.read()
+
+
+def _mirror(url: str) -> str:
+    """Bundle-relative path for a URL: files/<host>/<path>."""
+    u = urlparse(url)
+    path = posixpath.normpath("/" + u.path).lstrip("/") or "index"
+    return posixpath.join("files", u.netloc.replace(":", "_"), path)
+
+
+def _refs(root) -> List[Tuple[bool, str]]:
+    """(is an xs:import, location) of each import/include in a schema document."""
+    refs = []
+    for el in root.iter(*_REF_TAGS):
+        loc = el.get(_REF_TAGS[el.tag])
+        if loc:
+            refs.append((el.tag == f"{{{_XSD_NS}}}import", loc))
+    return refs
+
+
+class SchemaCatalog:
+    """One version of a schema bundle: URL -> verified local file."""
+
+    def __init__(self, directory: Path, version: str, entries: Dict[str, dict]):
+        self.directory, self.version, self.entries = directory, version, entries
+
+    @classmethod
+    def load(cls, path: str, verify: bool = True) -> "SchemaCatalog":
+        """A bundle's current version (or the version directory given), hash-checked unless verify=False."""
+        directory = Path(path)
+        if not (directory / CATALOG).exists():
+            try:
+                directory = directory / (directory / CURRENT).read_text(encoding="utf-8").strip()
+            except OSError:
+                raise CatalogError(f"No schema bundle in {path} (create one with python -m valmods.schema_catalog)") from None
+        try:
+            doc = json.loads((directory / CATALOG).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise CatalogError(f"Unreadable schema catalog in {directory}: {e}") from None
+        if doc.get("format") != CATALOG_FORMAT:
+            raise CatalogError(f"{directory / CATALOG} has format {doc.get('format')!r}, expected {CATALOG_FORMAT}")
+        catalog = cls(directory, doc["version"], doc["entries"])
+        if verify:
+            catalog.verify()
+        return catalog
+
+    def verify(self) -> None:
+        for url, entry in self.entries.items():
+            path = self.directory / entry["path"]
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                raise CatalogError(f"{path} ({url}) is missing from the schema bundle") from None
+            if digest != entry["sha256"]:
+                raise CatalogError(f"{path} ({url}) does not match its catalog hash; prefetch the bundle again")
+
+    def resolve(self, url: str) -> Optional[str]:
+        entry = self.entries.get(url)
+        return str(self.directory / entry["path"]) if entry else None
+
+    def local(self, location: str) -> str:
+        """A schema location as a local path: the bundled file for a URL, anything else unchanged."""
+        if not _remote(location):
+            return location
+        path = self.resolve(location)
+        if path is None:
+            raise CatalogError(f"{location} is not in the schema bundle {self.directory}; prefetch it first")
+        return path
+
+    def locations(self) -> List[Tuple[str, str]]:
+        """(namespace, local path) hints for xmlschema, for every bundled file reached through xs:import."""
+        return [(e["namespace"], self.resolve(url)) for url, e in self.entries.items() if e.get("namespace")]
+
+    def localize(self, doc) -> None:
+        """Point a parsed Schematron's absolute sch:include hrefs at bundled files (lxml's include step takes no resolver)."""
+        for el in doc.iter(f"{{{_SCH_NS}}}include"):
+            href = urljoin(doc.docinfo.URL or "", el.get("href", ""))
+            if _remote(href):
+                el.set("href", Path(self.local(href)).as_uri())
+
+
+def _write_bundle(directory: Path, version: str, sources: Sequence[str], entries: Dict[str, dict],
+                  contents: Dict[str, bytes]) -> None:
+    for url, entry in entries.items():
+        dest = directory / entry["path"]
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(contents[url])
+    doc = {"format": CATALOG_FORMAT, "version": version, "created": datetime.now(timezone.utc).isoformat(),
+           "sources": list(sources), "entries": entries}
+    (directory / CATALOG).write_text(json.dumps(doc, indent=1, sort_keys=True), encoding="utf-8")
+    uris = "".join(f"  <uri name={quoteattr(url)} uri={quoteattr(e['path'])}/>\n"
+                   f"  <system systemId={quoteattr(url)} uri={quoteattr(e['path'])}/>\n" for url, e in entries.items())
+    (directory / "catalog.xml").write_text(
+        '<?xml version="1.0"?>\n<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">\n' + uris + "</catalog>\n",
+        encoding="utf-8")
+
+
+def prefetch(sources: Sequence[str], bundle: str, fetch: Callable[[str], bytes] = _download) -> SchemaCatalog:
+    """
+    Download `sources` and their whole import/include graph into a new version
+    of `bundle` (reusing it if the contents are unchanged) and make it current.
+    """
+    from lxml import etree
+
+    entries: Dict[str, dict] = {}
+    contents: Dict[str, bytes] = {}
+    imported = set()
+    todo = deque((s if _remote(s) else str(Path(s).resolve()), True) for s in sources)
+    seen = set()
+    while todo:
+        ref, is_import = todo.popleft()
+        if is_import:
+            imported.add(ref)
+        if ref in seen:
+            continue
+        seen.add(ref)
+        try:
+            data = fetch(ref) if _remote(ref) else Path(ref).read_bytes()
+            root = etree.fromstring(data, etree.XMLParser(no_network=True, resolve_entities=False))
+        except (OSError, etree.XMLSyntaxError) as e:
+            raise CatalogError(f"Could not fetch {ref}: {e}") from None
+        if _remote(ref):
+            contents[ref] = data
+            entries[ref] = {"path": _mirror(ref), "sha256": hashlib.sha256(data).hexdigest(),
+                            "namespace": root.get("targetNamespace")}
+        base = ref if _remote(ref) else Path(ref).as_uri()
+        for import_, loc in _refs(root):
+            target = urljoin(base, loc)
+            todo.append((target if _remote(target) else urllib.request.url2pathname(urlparse(target).path), import_))
+    for url, entry in entries.items():
+        if url not in imported:  # only included: xmlschema reaches it by a relative path
+            entry["namespace"] = None
+
+    version = hashlib.sha256("".join(f"{u}\0{e['sha256']}\n" for u, e in sorted(entries.items())).encode()).hexdigest()[:16]
+    root_dir = Path(bundle)
+    root_dir.mkdir(parents=True, exist_ok=True)
+    target_dir = root_dir / version
+    if not (target_dir / CATALOG).exists():
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=root_dir))
+        _write_bundle(tmp, version, sources, entries, contents)
+        try:
+            os.rename(tmp, target_dir)
+        except OSError:  # another prefetch wrote the same version first
+            shutil.rmtree(tmp, ignore_errors=True)
+    current = root_dir / f".{CURRENT}.{os.getpid()}.tmp"
+    current.write_text(version + "\n", encoding="utf-8")
+    os.replace(current, root_dir / CURRENT)
+    return SchemaCatalog.load(str(target_dir))
+
+
+def _cli() -> None:
+    # typer is imported here, not at the top: every XMLValidator imports this module
+    import typer
+
+    def main(
+        sources: List[str] = typer.Argument(..., help="Schema URLs (XSD/Schematron) or local schemas to bundle"),
+        bundle: str = typer.Option(..., "--bundle", help="Bundle directory (a new version is added, older ones are kept)"),
+    ) -> None:
+        catalog = prefetch(sources, bundle)
+        size = sum((catalog.directory / e["path"]).stat().st_size for e in catalog.entries.values())
+        typer.echo(f"Bundled {len(catalog.entries)} file(s), {size / 1024:.0f} KiB, as version {catalog.version} "
+                   f"in {catalog.directory}")
+        typer.echo(f"Validate offline with --schema-catalog {bundle}")
+
+    typer.run(main)
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,245 @@
+# valmods/service.py
+"""
+Long-running validation service over HTTP (TCP or a Unix socket).
+
+Validators are compiled once per worker process and stay warm; the asyncio front
+end queues requests and hands them to the pool in batches, so bursts of small
+labels share one round trip to a worker.
+
+    python -m valmods.service --xsd schemas/minimal.xsd --json-schema schemas/sample.schema.json --port 8765
+    curl --data-binary @examples/bad_label.xml 'http://127.0.0.1:8765/validate?name=bad_label.xml'
+
+Endpoints:
+    POST /validate?name=<file name>[&kind=xml|json|jsonl|csv]   body = file bytes
+    GET  /health
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+import typer
+
+from core.models import ValidationReport
+from core.reasoner import enrich_with_suggestions
+from core.rulepack import RulePack, load_rule_pack
+from valmods.runner import build_validators
+
+MAX_BODY = 64 * 1024 * 1024
+_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+           422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+def report_json(report: ValidationReport) -> dict:
+    return {
+        **report.to_dict(),
+        "passed": report.passed,
+        "error_count": report.error_count,
+        "warning_count": report.warning_count,
+    }
+
+
+# Per-process validators (and suggestion rules) for a pool of warm workers: the
+# service's, and the Streamlit UI's (ui_streamlit_app.py)
+_validators = None
+_rule_pack: Optional[RulePack] = None
+
+def init_worker(config: dict, rule_pack: Optional[str] = None) -> None:
+    global _validators, _rule_pack
+    _validators = build_validators(config).load()  # warm before the first request
+    _rule_pack = load_rule_pack(rule_pack) if rule_pack else None
+
+def validate_batch(items: List[Tuple[str, Optional[str], bytes]], use_rules: bool) -> List[Tuple[int, dict]]:
+    """Validate a batch inside a worker; one (status, payload) per item."""
+    out = []
+    for name, kind, data in items:
+        try:
+            report = _validators.validate_bytes(data, name, kind)
+        except Exception as e:
+            out.append((422, {"error": f"{type(e).__name__}: {e}"}))
+            continue
+        if report is None:
+            out.append((400, {"error": f"No validator configured for {name!r}"}))
+            continue
+        if use_rules:
+            enrich_with_suggestions(report.issues, _rule_pack)
+        out.append((200, report_json(report)))
+    return out
+
+
+class ValidationService:
+    """Request queue + batching front end for a pool of warm validator processes."""
+
+    def __init__(self, config: dict, workers: int = 1, batch_size: int = 32, use_rules: bool = True,
+                 rule_pack: Optional[str] = None):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(config, rule_pack))
+        self.batch_size = batch_size
+        self.use_rules = use_rules
+        self._queue: Optional[asyncio.Queue] = None
+        # batches in flight; while all are busy, new requests pile up and batch together
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._max_in_flight = workers * 2
+        self._batcher_task: Optional[asyncio.Task] = None
+
+    def _ensure_started(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self._max_in_flight)
+            self._batcher_task = asyncio.get_running_loop().create_task(self._batcher())
+
+    async def validate(self, name: str, data: bytes, kind: Optional[str] = None) -> Tuple[int, dict]:
+        self._ensure_started()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((name, kind, data, fut))
+        return await fut
+
+    async def _batcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            await self._slots.acquire()
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            work = loop.run_in_executor(self.pool, validate_batch, [b[:3] for b in batch], self.use_rules)
+            work.add_done_callback(partial(self._resolve, batch))
+
+    def _resolve(self, batch: list, work: asyncio.Future) -> None:
+        self._slots.release()
+        exc = work.exception()
+        results = work.result() if exc is None else [(500, {"error": f"{type(exc).__name__}: {exc}"})] * len(batch)
+        for (_, _, _, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    async def _route(self, method: str, target: str, body: bytes) -> Tuple[int, dict]:
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, {"status": "ok"}
+        if url.path != "/validate":
+            return 404, {"error": f"Unknown endpoint {url.path}"}
+        if method != "POST":
+            return 400, {"error": "POST the file body to /validate"}
+        query = parse_qs(url.query)
+        name = (query.get("name") or [None])[0]
+        if not name:
+            return 400, {"error": "Missing ?name=<file name>"}
+        return await self.validate(name, body, (query.get("kind") or [None])[0])
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Minimal HTTP/1.1 with keep-alive; one request at a time per connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": f"Body larger than {MAX_BODY} bytes"}
+                    headers["connection"] = "close"
+                else:
+                    body = await reader.readexactly(length)
+                    status, payload = await self._route(method, target, body)
+                data = json.dumps(payload).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                head = [f"HTTP/1.1 {status} {_STATUS[status]}", "Content-Type: application/json",
+                        f"Content-Length: {len(data)}"]
+                if not keep_alive:
+                    head.append("Connection: close")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        self._ensure_started()
+        # warm-up: have the pool start its workers (and compile schemas) before traffic
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self._max_in_flight // 2)))
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle, path=unix_path)
+        return await asyncio.start_server(self.handle, host=host, port=port)
+
+    async def close(self) -> None:
+        if self._batcher_task:
+            self._batcher_task.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def request(reader, writer, host: str, name: str, body: bytes) -> Tuple[int, dict]:
+    """POST one file to /validate on an open keep-alive connection; (status, JSON reply)."""
+    head = (
+        f"POST /validate?name={quote(name)} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def serve(service: ValidationService, host: str, port: int, unix_path: Optional[str]) -> None:
+    server = await service.start(host, port, unix_path)
+    where = unix_path or "http://{}:{}".format(*server.sockets[0].getsockname()[:2])
+    typer.secho(f"Validation service listening on {where}", fg=typer.colors.GREEN, err=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(
+    xsd: str = typer.Option(None, "--xsd", help="XML XSD path or URL (for .xml files)"),
+    sch: str = typer.Option(None, "--sch", help="Schematron .sch file for XML (optional)"),
+    json_schema: str = typer.Option(None, "--json-schema", help="JSON Schema path (for .json/.jsonl/.ndjson files)"),
+    csv_schema: str = typer.Option(None, "--csv-schema", help="CSV schema YAML path (for .csv files)"),
+    schema_cache: str = typer.Option(None, "--schema-cache", envvar="AIOPS_SCHEMA_CACHE",
+                                     help="Directory for the compiled-schema cache (reused across runs)"),
+    schema_catalog: str = typer.Option(None, "--schema-catalog", envvar="AIOPS_SCHEMA_CATALOG",
+                                       help="Offline schema bundle for XSD/Schematron URLs (python -m valmods.schema_catalog)"),
+    routes: str = typer.Option(None, "--routes", help="Routes YAML picking schemas per file (valmods.routing)"),
+    host: str = typer.Option("127.0.0.1", "--host", help="TCP host to bind"),
+    port: int = typer.Option(8765, "--port", help="TCP port to bind (0 = pick a free one)"),
+    unix: str = typer.Option(None, "--unix", help="Listen on this Unix socket path instead of TCP"),
+    workers: int = typer.Option(os.cpu_count() or 1, "--workers", min=1, help="Validator worker processes"),
+    batch_size: int = typer.Option(32, "--batch-size", min=1, help="Max requests handed to a worker at once"),
+    use_rules: bool = typer.Option(True, "--rules/--no-rules", help="Attach rule-based suggestions to issues"),
+    rule_pack: str = typer.Option(None, "--rule-pack", help="Suggestion rules YAML (default: core/suggestions.yaml)"),
+) -> None:
+    config = dict(xsd_path=xsd, schematron_path=sch, json_schema_path=json_schema,
+                  csv_schema_path=csv_schema, schema_cache_dir=schema_cache, schema_catalog=schema_catalog)
+    if routes:
+        config["routes"] = routes
+    service = ValidationService(config, workers=workers, batch_size=batch_size, use_rules=use_rules,
+                                rule_pack=rule_pack)
+    try:
+        asyncio.run(serve(service, host, port, unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    typer.run(main)
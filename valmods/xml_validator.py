@@ -1,22 +1,25 @@
 from pathlib import Path
+from time import perf_counter
 from urllib.parse import urlparse
-from typing import List, Optional
+from typing import List, Optional, Set, Tuple
 from xmlschema import XMLSchema
 from lxml import etree
 from lxml.isoschematron import Schematron
 from core.models import ValidationIssue
+from valmods.fileio import InputFile, open_input
+from valmods.schema_cache import SchemaCache, private_dir, user_cache_dir
+from valmods.schema_catalog import SchemaCatalog
 
 # NEW: tiny cache helper (no extra deps)
-import hashlib, os, tempfile, urllib.request
+import hashlib, os, urllib.request
 
 def _cache_fetch(url: str, suffix: str) -> str:
     """
-    Download URL once into a temp cache and return the local filepath.
+    Download URL once into the per-user cache and return the local filepath.
     Reuses cached file on subsequent runs.
     """
     h = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + suffix
-    cache_dir = os.path.join(tempfile.gettempdir(), "aiops_xsd_cache")
-    os.makedirs(cache_dir, exist_ok=True)
+    cache_dir = private_dir(os.path.join(user_cache_dir(), "xsd"))
     dest = os.path.join(cache_dir, h)
     if not os.path.exists(dest):
         with urllib.request.urlopen(url, timeout=30) as r, open(dest, "wb") as f:
@@ -24,60 +27,228 @@ def _cache_fetch(url: str, suffix: str) -> str:
     return dest
 
 
+_SVRL_NS = "http://purl.oclc.org/dsdl/svrl"
+_XSD_NS = "http://www.w3.org/2001/XMLSchema"
+
+# Documents are untrusted: never expand entities, load a DTD or fetch anything (XXE)
+_SAFE = dict(resolve_entities=False, no_network=True, load_dtd=False)
+# xmlschema sees lxml comment/PI nodes as children ("simple content element can't have
+# child elements"), so the shared tree drops them; line numbers are unaffected.
+_PARSER = etree.XMLParser(remove_comments=True, remove_pis=True, **_SAFE)
+
+def _sourceline(doc, location: Optional[str]) -> Optional[int]:
+    """Line number of the node an SVRL location XPath points at, if it resolves."""
+    if not location:
+        return None
+    try:
+        hits = doc.xpath(location)
+    except etree.XPathError:
+        return None
+    return getattr(hits[0], "sourceline", None) if hits else None
+
+
+def _compile_schematron(sch_local: str, catalog: Optional[SchemaCatalog] = None) -> bytes:
+    """Run the ISO Schematron skeleton and return the serialized validating XSLT."""
+    doc = etree.parse(sch_local)
+    if catalog:
+        catalog.localize(doc)
+    compiled = Schematron(doc, store_xslt=True)
+    return etree.tostring(compiled.validator_xslt)
+
+
+def _split(tag: str) -> Tuple[str, str]:
+    ns, _, local = tag[1:].partition("}") if tag.startswith("{") else ("", "", tag)
+    return ns, local
+
+
 class XMLValidator:
+    """
+    Staged XML validation:
+
+    1. pre-screen: a streaming iterparse of just the prologue and root start tag
+       rejects malformed prologues, a wrong root element or a wrong/missing
+       namespace with precise XML-PARSE / XML-ROOT / XML-NAMESPACE issues;
+    2. full parse, then XSD and Schematron. With `max_errors`, both stop once the
+       file has that many issues and `last_truncated` is set.
+
+    prescreen=False skips stage 1 (schema validation still reports such files).
+
+    Each file is opened once (valmods.fileio) and both stages read the same
+    buffer; files from `mmap_threshold` bytes up are memory-mapped.
+
+    Per-stage seconds of the last file are in `last_stats`; `stage_seconds`
+    accumulates them over the validator's lifetime.
+
+    With `catalog` (a bundle from valmods.schema_catalog) schema URLs and their
+    imports are read from the verified local bundle and nothing is downloaded.
+    """
     standard = "PDS4-XML"
+    STAGES = ("prescreen", "parse", "xsd", "schematron")
+
+    def __init__(self, xsd_path: str, schematron_path: Optional[str] = None, cache_dir: Optional[str] = None,
+                 max_errors: Optional[int] = None, prescreen: bool = True, mmap_threshold: Optional[int] = None,
+                 catalog: Optional[str] = None):
+        # Compiled-schema cache (optional): warm starts skip XSD/Schematron compilation
+        cache = SchemaCache(cache_dir) if cache_dir else None
+        # Offline bundle (optional): URLs map to hash-checked local files, imports included
+        bundle = SchemaCatalog.load(catalog) if catalog else None
+        variant = f"catalog={bundle.version}" if bundle else ""
 
-    def __init__(self, xsd_path: str, schematron_path: Optional[str] = None):
         # XSD: accept local path or http(s) URL (cache URLs)
         x_parsed = urlparse(xsd_path) if xsd_path else None
-        if x_parsed and x_parsed.scheme in ("http", "https"):
+        if bundle:
+            xsd_local = bundle.local(xsd_path)
+        elif x_parsed and x_parsed.scheme in ("http", "https"):
             xsd_local = _cache_fetch(xsd_path, ".xsd")
         else:
             xsd_local = str(Path(xsd_path))
 
-        self.schema = XMLSchema(xsd_local)
+        if bundle:
+            build = lambda: XMLSchema(xsd_local, locations=bundle.locations(), allow="local")
+        else:
+            build = lambda: XMLSchema(xsd_local)
+        self.schema = cache.get_or_build("xsd", [xsd_local], build, extra=variant) if cache else build()
 
-        # Schematron (optional): also allow URL + cache
+        # Schematron (optional): also allow URL + cache. Kept as the compiled
+        # validating XSLT, whose SVRL output check_tree reads directly.
         self.schematron = None
         if schematron_path:
             s_parsed = urlparse(schematron_path)
-            sch_local = (
-                _cache_fetch(schematron_path, ".sch")
-                if s_parsed and s_parsed.scheme in ("http", "https")
-                else str(Path(schematron_path))
-            )
-            sch_doc = etree.parse(sch_local)
-            self.schematron = Schematron(sch_doc)
+            if bundle:
+                sch_local = bundle.local(schematron_path)
+            else:
+                sch_local = (
+                    _cache_fetch(schematron_path, ".sch")
+                    if s_parsed and s_parsed.scheme in ("http", "https")
+                    else str(Path(schematron_path))
+                )
+            if cache:
+                xslt_bytes = cache.get_or_build("sch", [sch_local], lambda: _compile_schematron(sch_local, bundle),
+                                                extra=variant)
+            else:
+                xslt_bytes = _compile_schematron(sch_local, bundle)
+            self.schematron = etree.XSLT(etree.fromstring(xslt_bytes))
+
+        # Global elements a document may start with (the XSD meta-schema aside)
+        self.max_errors = max_errors
+        self.use_prescreen = prescreen
+        self.mmap_threshold = mmap_threshold
+        self.roots: Set[str] = {k for k in self.schema.maps.elements if not k.startswith(f"{{{_XSD_NS}}}")}
+        self.namespaces: Set[str] = {_split(k)[0] for k in self.roots}
+        self.last_stats: dict = {}
+        self.last_truncated = False
+        self.stage_seconds = dict.fromkeys(self.STAGES, 0.0)
+        self.rejected = 0
+
+    def _stage(self, name: str, started: float) -> float:
+        now = perf_counter()
+        self.last_stats[name] = now - started
+        self.stage_seconds[name] += now - started
+        return now
+
+    def prescreen(self, source) -> List[ValidationIssue]:
+        """Check the prologue and root element only (source: path or binary file object)."""
+        try:
+            for _, root in etree.iterparse(source, events=("start",), remove_comments=True, remove_pis=True, **_SAFE):
+                break
+            else:
+                return [ValidationIssue("XML-PARSE", "error", "$", "Document has no root element")]
+        except etree.XMLSyntaxError as e:
+            return [ValidationIssue("XML-PARSE", "error", "$", str(e), line=e.lineno or None)]
+        if not self.roots:
+            return []
+        ns, local = _split(root.tag)
+        if ns not in self.namespaces:
+            expected = " or ".join(f'xmlns="{n}"' if n else "no namespace" for n in sorted(self.namespaces))
+            found = f'xmlns="{ns}"' if ns else "no namespace"
+            return [ValidationIssue(
+                "XML-NAMESPACE", "error", f"/{local}",
+                f"Namespace mismatch on root element <{local}>: expected {expected}, found {found}",
+                line=root.sourceline,
+            )]
+        if root.tag not in self.roots:
+            allowed = ", ".join(sorted(_split(k)[1] for k in self.roots if _split(k)[0] == ns))
+            return [ValidationIssue(
+                "XML-ROOT", "error", f"/{local}",
+                f"Unexpected root element <{local}>; the schema allows: {allowed}",
+                line=root.sourceline,
+            )]
+        return []
 
     def validate(self, path: str) -> List[ValidationIssue]:
-        issues: List[ValidationIssue] = []
+        with open_input(path, self.mmap_threshold) as src:
+            return self._validate_source(src)
 
-        # Parse once so we can reuse for Schematron and get useful error locations
+    def validate_bytes(self, data: bytes, name: str = "<bytes>") -> List[ValidationIssue]:
+        """Validate an in-memory document (e.g. an upload or a service request body)."""
+        return self._validate_source(InputFile(data, name))
+
+    def _validate_source(self, src: InputFile) -> List[ValidationIssue]:
+        self.last_stats = {}
+        self.last_truncated = False
+        started = perf_counter()
+        if self.use_prescreen:
+            issues = self.prescreen(src.stream())
+            started = self._stage("prescreen", started)
+            if issues:
+                self.rejected += 1
+                return issues
+        # Parse once; the same tree feeds XSD, Schematron and path/line extraction
         try:
-            doc = etree.parse(str(path))
+            if src.mapped:  # lxml pulls the mapped pages through read(); no whole-file copy
+                doc = etree.parse(src.stream(), _PARSER, base_url=src.name)
+            else:
+                doc = etree.fromstring(src.data, _PARSER, base_url=src.name).getroottree()
         except Exception as e:
-            return [ValidationIssue(issue_type="XML-PARSE", severity="error", path="$", message=str(e))]
+            return [ValidationIssue(issue_type="XML-PARSE", severity="error", path="$", message=str(e),
+                                    line=getattr(e, "lineno", None))]
+        self._stage("parse", started)
+        return self.check_tree(doc)
+
+    def check_tree(self, doc) -> List[ValidationIssue]:
+        """Run XSD and Schematron checks against an already-parsed lxml tree."""
+        issues: List[ValidationIssue] = []
+        started = perf_counter()
+        self.last_truncated = False
+        full = lambda: self.max_errors is not None and len(issues) >= self.max_errors
 
-        # XSD
-        for err in self.schema.iter_errors(str(path)):
+        # XSD (xmlschema walks the lxml tree directly, no second read of the file)
+        for err in self.schema.iter_errors(doc):
+            if full():
+                self.last_truncated = True
+                break
             issues.append(
                 ValidationIssue(
                     issue_type="XSD-VALIDATION",
                     severity="error",
                     path=str(err.path) or "(unknown)",
                     message=str(err),
+                    line=getattr(err, "sourceline", None),
                 )
             )
+        started = self._stage("xsd", started)
+        if full():
+            self.last_truncated |= self.schematron is not None  # Schematron skipped
+            return issues
 
-        # Schematron (if provided)
-        if self.schematron and not self.schematron.validate(doc):
-            for e in self.schematron.error_log:
+        # Schematron (if provided): read failed asserts from the SVRL report
+        if self.schematron is not None:
+            report = self.schematron(doc)
+            for fa in report.iter(f"{{{_SVRL_NS}}}failed-assert"):
+                if full():
+                    self.last_truncated = True
+                    break
+                location = fa.get("location")
+                text = fa.findtext(f"{{{_SVRL_NS}}}text")
                 issues.append(
                     ValidationIssue(
                         issue_type="SCHEMATRON",
                         severity="error",
-                        path=e.path or "(unknown)",
-                        message=e.message,
+                        path=location or "(unknown)",
+                        message=(text or "").strip() or fa.get("test", ""),
+                        rule=fa.get("test"),
+                        line=_sourceline(doc, location),
                     )
                 )
+            self._stage("schematron", started)
         return issues